@@ -0,0 +1,348 @@
+import sys
+import os
+from os import path
+import time
+import json
+import zlib
+import struct
+import threading
+import hashlib
+
+#Binary cache file layout:
+#   [magic (8 bytes)][directory length (4 bytes)][directory (JSON)][section data...]
+#The directory holds the offset, length and checksum of every section, so each section
+#(e.g. 'LIVE' or 'Movies categories') can be loaded on its own without parsing the rest.
+CACHE_MAGIC         = b"IPTVCC01"
+CACHE_VERSION       = 2
+DIRECTORY_LEN_FMT   = "<I"
+
+#JSON file layout, e.g. of the favorites:
+#   [magic (8 bytes)][data length (4 bytes)][data checksum (4 bytes)][data (JSON)]
+#Files written before the header was added hold only the JSON data and are still loaded.
+JSON_MAGIC          = b"IPTVJS01"
+JSON_HEADER_FMT     = "<II"
+
+#Files are written to a temporary file first and the previous file is kept as last good snapshot
+TEMP_SUFFIX         = ".tmp"
+BACKUP_SUFFIX       = ".bak"
+
+#Fast compression keeps writing and loading quick while still shrinking the file a lot
+COMPRESSION_LEVEL   = 1
+
+#Every account has its own cache files in the cache folder
+CACHE_DIR               = "cache"
+DEFAULT_CACHE_SIZE_MB   = 500
+
+def write_file_atomic(file_path, chunks):
+    temp_file_path = file_path + TEMP_SUFFIX
+
+    #Write complete file to a temporary file and make sure it is on disk
+    with open(temp_file_path, 'wb') as temp_file:
+        for chunk in chunks:
+            temp_file.write(chunk)
+
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+
+    #Keep previous file as last good snapshot
+    if path.isfile(file_path):
+        os.replace(file_path, file_path + BACKUP_SUFFIX)
+
+    #Renaming is atomic, so the file is either the old or the new version, never a half written one
+    os.replace(temp_file_path, file_path)
+
+def write_json_file(file_path, data):
+    json_data = json.dumps(data, indent=4).encode('utf-8')
+    write_file_atomic(file_path, [JSON_MAGIC, struct.pack(JSON_HEADER_FMT, len(json_data), zlib.crc32(json_data)), json_data])
+
+def read_json_file(file_path):
+    with open(file_path, 'rb') as json_file:
+        file_data = json_file.read()
+
+    #Old file without header
+    if not file_data.startswith(JSON_MAGIC):
+        return json.loads(file_data.decode('utf-8'))
+
+    header_len = len(JSON_MAGIC) + struct.calcsize(JSON_HEADER_FMT)
+    if len(file_data) < header_len:
+        raise ValueError(f"File is incomplete: {file_path}")
+
+    data_len, crc = struct.unpack(JSON_HEADER_FMT, file_data[len(JSON_MAGIC):header_len])
+    json_data = file_data[header_len:]
+
+    #Check if file is complete and not damaged, e.g. cut off by a crash while writing
+    if len(json_data) != data_len:
+        raise ValueError(f"File is incomplete: {file_path}")
+
+    if zlib.crc32(json_data) != crc:
+        raise ValueError(f"Checksum doesn't match: {file_path}")
+
+    return json.loads(json_data.decode('utf-8'))
+
+def load_json_file(file_path, default=None):
+    #Load file, or the last good snapshot if the file is damaged or missing
+    for candidate_path in (file_path, file_path + BACKUP_SUFFIX):
+        if not path.isfile(candidate_path):
+            continue
+
+        try:
+            return read_json_file(candidate_path)
+        except Exception as e:
+            print(f"Failed loading {candidate_path}: {e}")
+
+    return default
+
+def encode_section(value):
+    #Serialize section as compact JSON and compress it
+    raw_data = json.dumps(value, separators=(',', ':')).encode('utf-8')
+    return zlib.compress(raw_data, COMPRESSION_LEVEL), len(raw_data)
+
+def write_catalog_cache(file_path, sections, reuse_cache=None, reuse_keys=()):
+    directory = {
+        'version': CACHE_VERSION,
+        'sections': {}
+    }
+    blobs   = []
+    offset  = 0
+
+    #Encode every section and note where it is stored
+    for key, value in sections.items():
+        blob = None
+
+        #Copy unchanged sections from the old cache file as they are
+        if key in reuse_keys and isinstance(reuse_cache, CatalogCache):
+            try:
+                blob, section = reuse_cache.readBlob(key)
+                raw_size = section['size']
+            except Exception as e:
+                print(f"Failed copying cached section '{key}': {e}")
+                blob = None
+
+        if blob is None:
+            blob, raw_size = encode_section(value)
+
+        directory['sections'][key] = {
+            'offset': offset,
+            'length': len(blob),
+            'crc': zlib.crc32(blob),
+            'size': raw_size,
+            'count': len(value) if isinstance(value, (list, dict)) else 0
+        }
+
+        blobs.append(blob)
+        offset += len(blob)
+
+    directory_data = json.dumps(directory, separators=(',', ':')).encode('utf-8')
+
+    write_file_atomic(file_path, [CACHE_MAGIC, struct.pack(DIRECTORY_LEN_FMT, len(directory_data)), directory_data] + blobs)
+
+def open_catalog_cache(file_path):
+    #Open cache file, or the last good snapshot if the cache file is damaged or missing
+    for candidate_path in (file_path, file_path + BACKUP_SUFFIX):
+        if not path.isfile(candidate_path):
+            continue
+
+        try:
+            return CatalogCache(candidate_path)
+        except Exception as e:
+            print(f"Failed loading cache file {candidate_path}: {e}")
+
+    #No usable cache file, return an empty cache so callers don't need to check for it
+    return CatalogCache()
+
+def get_account_cache_name(server, username):
+    #Cache files are named after the account, so switching accounts doesn't overwrite the cache of another account
+    return hashlib.sha1(f"{server}|{username}".encode('utf-8')).hexdigest()[:16]
+
+def get_account_caches(cache_dir):
+    #Group the cache files per account, e.g. the catalog cache and catalog store of an account
+    account_caches = {}
+
+    if not path.isdir(cache_dir):
+        return account_caches
+
+    for file_name in os.listdir(cache_dir):
+        file_path = path.join(cache_dir, file_name)
+        if not path.isfile(file_path):
+            continue
+
+        account_name    = file_name.split('.')[0]
+        file_stat       = os.stat(file_path)
+
+        account_cache = account_caches.setdefault(account_name, {'size': 0, 'last_used': 0, 'files': []})
+        account_cache['size']       += file_stat.st_size
+        account_cache['last_used']  = max(account_cache['last_used'], file_stat.st_mtime)
+        account_cache['files'].append(file_path)
+
+    return account_caches
+
+def touch_account_cache(cache_dir, account_name):
+    #Mark cache of account as recently used
+    for file_path in get_account_caches(cache_dir).get(account_name, {}).get('files', []):
+        try:
+            os.utime(file_path)
+        except OSError as e:
+            print(f"Failed updating cache file time: {e}")
+
+def evict_account_caches(cache_dir, max_size, keep_account_name):
+    account_caches = get_account_caches(cache_dir)
+    total_size = sum(account_cache['size'] for account_cache in account_caches.values())
+
+    #Remove the caches of the least recently used accounts until the cache fits in the disk budget
+    for account_name, account_cache in sorted(account_caches.items(), key=lambda item: item[1]['last_used']):
+        if total_size <= max_size:
+            break
+
+        #Never remove the cache of the current account
+        if account_name == keep_account_name:
+            continue
+
+        print(f"Removing cache of least recently used account: {account_name}")
+
+        for file_path in account_cache['files']:
+            try:
+                file_size = path.getsize(file_path)
+                os.remove(file_path)
+                total_size -= file_size
+            except OSError as e:
+                print(f"Failed removing cache file: {e}")
+
+class CatalogCache:
+    def __init__(self, file_path=None):
+        self.file_path      = file_path
+        self.loaded         = {}
+        self.lock           = threading.Lock()
+
+        #Empty cache without file, e.g. on first start or when the cache file and its snapshot are damaged
+        self.sections       = {}
+        self.data_offset    = 0
+        if self.file_path is None:
+            return
+
+        #Only read the directory, sections are loaded when they are needed
+        with open(self.file_path, 'rb') as cache_file:
+            magic = cache_file.read(len(CACHE_MAGIC))
+            if magic != CACHE_MAGIC:
+                raise ValueError(f"Not a catalog cache file: {self.file_path}")
+
+            directory_len   = struct.unpack(DIRECTORY_LEN_FMT, cache_file.read(struct.calcsize(DIRECTORY_LEN_FMT)))[0]
+            directory       = json.loads(cache_file.read(directory_len).decode('utf-8'))
+
+        if directory.get('version') != CACHE_VERSION:
+            raise ValueError(f"Unsupported catalog cache version: {directory.get('version')}")
+
+        self.sections       = directory['sections']
+        self.data_offset    = len(CACHE_MAGIC) + struct.calcsize(DIRECTORY_LEN_FMT) + directory_len
+
+        #Check if file is complete, e.g. not cut off by a crash while writing
+        data_size = sum(section['length'] for section in self.sections.values())
+        if path.getsize(self.file_path) < self.data_offset + data_size:
+            raise ValueError(f"Catalog cache file is incomplete: {self.file_path}")
+
+    def keys(self):
+        return self.sections.keys()
+
+    def count(self, key):
+        #Number of entries in a section, known without loading it
+        return self.sections[key]['count']
+
+    def load(self, key):
+        with self.lock:
+            if key in self.loaded:
+                return self.loaded[key]
+
+        #Read and decode only this section
+        blob, section = self.readBlob(key)
+        value = json.loads(zlib.decompress(blob).decode('utf-8'))
+
+        with self.lock:
+            self.loaded[key] = value
+
+        return value
+
+    def readBlob(self, key):
+        section = self.sections[key]
+
+        #Read compressed data of this section
+        with open(self.file_path, 'rb') as cache_file:
+            cache_file.seek(self.data_offset + section['offset'])
+            blob = cache_file.read(section['length'])
+
+        if zlib.crc32(blob) != section['crc']:
+            raise ValueError(f"Checksum of section '{key}' doesn't match: {self.file_path}")
+
+        return blob, section
+
+    def get(self, key, default=None):
+        if key not in self.sections:
+            return default
+
+        try:
+            return self.load(key)
+        except Exception as e:
+            print(f"Failed loading cached section: {e}")
+            return default
+
+    def __getitem__(self, key):
+        return self.load(key)
+
+    def __contains__(self, key):
+        return key in self.sections
+
+def convert_json_cache(json_path, cache_path, account_key=None):
+    #Convert the old all_cached_data.json cache to the binary cache format
+    cached_data = load_json_file(json_path)
+    if cached_data is None:
+        raise ValueError(f"Failed loading old cache file: {json_path}")
+
+    #Old cache files don't know their account, they were written by the account that is converting them
+    if account_key is not None:
+        cached_data['Account'] = account_key
+
+    write_catalog_cache(cache_path, cached_data)
+
+    return cached_data.keys()
+
+def benchmark_cache(json_path, cache_path):
+    results = {}
+
+    #Time loading the complete JSON cache
+    if path.isfile(json_path):
+        start_time = time.perf_counter()
+        with open(json_path, 'r') as json_file:
+            json.load(json_file)
+        results['JSON (all sections)'] = time.perf_counter() - start_time
+
+    #Time loading the complete binary cache
+    start_time = time.perf_counter()
+    cache = CatalogCache(cache_path)
+    for key in cache.keys():
+        cache.load(key)
+    results['Binary (all sections)'] = time.perf_counter() - start_time
+
+    #Time loading each section of the binary cache on its own
+    for key in CatalogCache(cache_path).keys():
+        start_time = time.perf_counter()
+        CatalogCache(cache_path).load(key)
+        results[f"Binary ({key})"] = time.perf_counter() - start_time
+
+    for name, duration in results.items():
+        print(f"{name:<40} {duration * 1000:10.1f} ms")
+
+    if path.isfile(json_path):
+        print(f"{'JSON file size':<40} {path.getsize(json_path) / 1e6:10.1f} MB")
+    print(f"{'Binary file size':<40} {path.getsize(cache_path) / 1e6:10.1f} MB")
+
+    return results
+
+if __name__ == "__main__":
+    #Usage: python CatalogCache.py convert|benchmark <all_cached_data.json> <all_cached_data.cache>
+    if len(sys.argv) != 4 or sys.argv[1] not in ('convert', 'benchmark'):
+        print("Usage: python CatalogCache.py convert|benchmark <json cache file> <binary cache file>")
+        sys.exit(1)
+
+    if sys.argv[1] == 'convert':
+        keys = convert_json_cache(sys.argv[2], sys.argv[3])
+        print(f"Converted sections: {', '.join(keys)}")
+    else:
+        benchmark_cache(sys.argv[2], sys.argv[3])
@@ -0,0 +1,49 @@
+from CatalogStore import get_id_key
+
+class CatalogIndex:
+    def __init__(self, stream_type, entries):
+        self.stream_type            = stream_type
+        self.num_of_entries         = len(entries)
+
+        #Positions of the entries per category, per id and of the favorites.
+        #Built once when the data is loaded, so showing a category doesn't have to go through all entries.
+        self.positions_per_category = {}
+        self.positions_per_id       = {}
+        self.favorite_positions     = set()
+
+        id_key = get_id_key(stream_type)
+
+        for position, entry in enumerate(entries):
+            self.positions_per_category.setdefault(entry.get('category_id'), []).append(position)
+            self.positions_per_id.setdefault(entry.get(id_key), []).append(position)
+
+            if entry.get('favorite', False):
+                self.favorite_positions.add(position)
+
+    def getAllPositions(self):
+        return list(range(self.num_of_entries))
+
+    def getCategoryPositions(self, category_id):
+        return list(self.positions_per_category.get(category_id, []))
+
+    def getFavoritePositions(self):
+        return sorted(self.favorite_positions)
+
+    def getItemPositions(self, item_id):
+        return list(self.positions_per_id.get(item_id, []))
+
+    def setFavorite(self, item_id, is_fav):
+        for position in self.positions_per_id.get(item_id, []):
+            if is_fav:
+                self.favorite_positions.add(position)
+            else:
+                self.favorite_positions.discard(position)
+
+    def countAll(self):
+        return self.num_of_entries
+
+    def countCategory(self, category_id):
+        return len(self.positions_per_category.get(category_id, []))
+
+    def countFavorites(self):
+        return len(self.favorite_positions)
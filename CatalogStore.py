@@ -0,0 +1,222 @@
+import sqlite3
+import threading
+
+from SortIndex import SORT_A_Z, SORT_Z_A, collation_key
+from SearchIndex import fold_text
+
+#Tables are created again when the schema changes, the catalog is then filled again by the next refresh
+SCHEMA_VERSION = 4
+
+#Time to wait for the database when another thread is writing to it
+DB_BUSY_TIMEOUT = 10
+
+#Names are searched with a trigram full text index, which needs search texts of at least 3 characters
+SEARCH_MIN_LENGTH = 3
+
+DROP_SCHEMA = [
+    "DROP TABLE IF EXISTS meta",
+    "DROP TABLE IF EXISTS categories",
+    "DROP TABLE IF EXISTS streams",
+    "DROP TABLE IF EXISTS names_search"
+]
+
+#Full text index of the category and stream names. Kind is 'category' or 'stream'.
+SEARCH_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS names_search USING fts5(kind UNINDEXED, stream_type UNINDEXED, position UNINDEXED, name_norm, tokenize='trigram')"
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS meta (
+        key     TEXT PRIMARY KEY,
+        value   TEXT
+    )""",
+    #Position is the index of the category or stream in the loaded lists
+    """CREATE TABLE IF NOT EXISTS categories (
+        stream_type     TEXT,
+        position        INTEGER,
+        category_id,
+        name_norm       TEXT,
+        sort_key        TEXT,
+        PRIMARY KEY (stream_type, position)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS streams (
+        stream_type     TEXT,
+        position        INTEGER,
+        item_id,
+        category_id,
+        name_norm       TEXT,
+        sort_key        TEXT,
+        added           INTEGER,
+        favorite        INTEGER,
+        PRIMARY KEY (stream_type, position)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS categories_sort ON categories (stream_type, sort_key)",
+    "CREATE INDEX IF NOT EXISTS streams_category ON streams (stream_type, category_id, position)",
+    "CREATE INDEX IF NOT EXISTS streams_item ON streams (stream_type, item_id)",
+    "CREATE INDEX IF NOT EXISTS streams_sort ON streams (stream_type, sort_key)",
+    "CREATE INDEX IF NOT EXISTS streams_added ON streams (stream_type, added)",
+    "CREATE INDEX IF NOT EXISTS streams_favorite ON streams (stream_type, favorite, position)"
+]
+
+def normalize_name(name):
+    #Names are searched case insensitive and without diacritics, the same as the search index of the lists
+    return fold_text(name)
+
+def get_match_text(name_text):
+    #Normalized search text as FTS5 phrase, which matches the names that contain it
+    return '"' + name_text.replace('"', '""') + '"'
+
+def to_timestamp(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def get_id_key(stream_type):
+    return 'series_id' if stream_type == 'Series' else 'stream_id'
+
+class CatalogStore:
+    def __init__(self, file_path):
+        self.file_path      = file_path
+
+        #SQLite connections can only be used in the thread they are created in
+        self.thread_data    = threading.local()
+
+        connection = self.getConnection()
+        with connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for statement in DROP_SCHEMA:
+                    connection.execute(statement)
+
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        #Without FTS5 or its trigram tokenizer, e.g. in old SQLite versions, names are searched without index
+        try:
+            with connection:
+                connection.execute(SEARCH_SCHEMA)
+            self.search_indexed = True
+        except sqlite3.OperationalError as e:
+            print(f"Catalog store names can't be indexed for searching: {e}")
+            self.search_indexed = False
+
+    def getConnection(self):
+        connection = getattr(self.thread_data, 'connection', None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.file_path, timeout=DB_BUSY_TIMEOUT)
+
+            #WAL lets the GUI read the old catalog while the fetch worker writes the new one
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            self.thread_data.connection = connection
+
+        return connection
+
+    def replaceCatalog(self, account_key, categories_per_stream_type, entries_per_stream_type):
+        connection = self.getConnection()
+
+        #Replace everything in one transaction, so readers never see a half written catalog
+        with connection:
+            connection.execute("DELETE FROM categories")
+            connection.execute("DELETE FROM streams")
+            if self.search_indexed:
+                connection.execute("DELETE FROM names_search")
+
+            for stream_type, categories in categories_per_stream_type.items():
+                connection.executemany(
+                    "INSERT INTO categories VALUES (?, ?, ?, ?, ?)",
+                    ((stream_type, position, category.get('category_id'), normalize_name(category.get('category_name')), collation_key(category.get('category_name')))
+                        for position, category in enumerate(categories))
+                )
+
+            for stream_type, entries in entries_per_stream_type.items():
+                id_key = get_id_key(stream_type)
+
+                connection.executemany(
+                    "INSERT INTO streams VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    ((stream_type, position, entry.get(id_key), entry.get('category_id'), normalize_name(entry.get('name')), collation_key(entry.get('name')),
+                        to_timestamp(entry.get('added', entry.get('last_modified'))), int(bool(entry.get('favorite', False))))
+                        for position, entry in enumerate(entries))
+                )
+
+            if self.search_indexed:
+                connection.execute("INSERT INTO names_search SELECT 'category', stream_type, position, name_norm FROM categories")
+                connection.execute("INSERT INTO names_search SELECT 'stream', stream_type, position, name_norm FROM streams")
+
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('account', ?)", (account_key,))
+
+    def getAccount(self):
+        row = self.getConnection().execute("SELECT value FROM meta WHERE key = 'account'").fetchone()
+        return row[0] if row else None
+
+    def countCategories(self, stream_type):
+        return self.getConnection().execute("SELECT COUNT(*) FROM categories WHERE stream_type = ?", (stream_type,)).fetchone()[0]
+
+    def countStreams(self, stream_type):
+        return self.getConnection().execute("SELECT COUNT(*) FROM streams WHERE stream_type = ?", (stream_type,)).fetchone()[0]
+
+    def getOrderBy(self, sort_order):
+        #Same order as the sort indexes of the lists
+        if sort_order == SORT_A_Z:
+            return " ORDER BY sort_key, position"
+        elif sort_order == SORT_Z_A:
+            return " ORDER BY sort_key DESC, position DESC"
+
+        #Keep order of the IPTV provider
+        return " ORDER BY position"
+
+    def getNameFilter(self, kind, stream_type, text):
+        #Search in the full text index, or check every name for short search texts
+        name_text = normalize_name(text)
+
+        if self.search_indexed and len(name_text) >= SEARCH_MIN_LENGTH:
+            return (" AND position IN (SELECT position FROM names_search WHERE names_search MATCH ? AND kind = ? AND stream_type = ?)",
+                [get_match_text(name_text), kind, stream_type])
+
+        return " AND instr(name_norm, ?) > 0", [name_text]
+
+    def queryCategories(self, stream_type, text=None, sort_order=None):
+        query   = "SELECT position, category_id FROM categories WHERE stream_type = ?"
+        params  = [stream_type]
+
+        if text:
+            name_filter, name_params = self.getNameFilter('category', stream_type, text)
+            query += name_filter
+            params += name_params
+
+        query += self.getOrderBy(sort_order)
+
+        return self.getConnection().execute(query, params).fetchall()
+
+    def queryStreams(self, stream_type, category_id=None, favorites=False, item_id=None, text=None, sort_order=None):
+        #Returns the position and id of all matching streams
+        query   = "SELECT position, item_id FROM streams WHERE stream_type = ?"
+        params  = [stream_type]
+
+        if category_id is not None:
+            query += " AND category_id = ?"
+            params.append(category_id)
+
+        if favorites:
+            query += " AND favorite = 1"
+
+        if item_id is not None:
+            query += " AND item_id = ?"
+            params.append(item_id)
+
+        if text:
+            name_filter, name_params = self.getNameFilter('stream', stream_type, text)
+            query += name_filter
+            params += name_params
+
+        query += self.getOrderBy(sort_order)
+
+        return self.getConnection().execute(query, params).fetchall()
+
+    def setFavorite(self, stream_type, item_id, is_fav):
+        connection = self.getConnection()
+
+        with connection:
+            connection.execute("UPDATE streams SET favorite = ? WHERE stream_type = ? AND item_id = ?", (int(is_fav), stream_type, item_id))
@@ -1,7 +1,8 @@
-from PyQt5.QtGui import QIcon, QFont, QImage, QPixmap, QColor, QDesktopServices
+from PyQt5.QtGui import QIcon, QFont, QImage, QPixmap, QColor, QDesktopServices, QPalette
 from PyQt5.QtCore import (
     Qt, QTimer, QPropertyAnimation, QEasingCurve, QSize, QObject, pyqtSignal, 
-    QRunnable, pyqtSlot, QThreadPool, QModelIndex, QAbstractItemModel, QVariant, QUrl
+    QRunnable, pyqtSlot, QThreadPool, QModelIndex, QAbstractItemModel, QVariant, QUrl,
+    QAbstractListModel
 )
 from PyQt5 import QtWidgets
 from PyQt5.QtWidgets import (
@@ -9,12 +10,29 @@ from PyQt5.QtWidgets import (
     QListWidget, QWidget, QFileDialog, QCheckBox, QSizePolicy, QHBoxLayout,
     QDialog, QFormLayout, QDialogButtonBox, QTabWidget, QListWidgetItem,
     QSpinBox, QMenu, QAction, QTextEdit, QGridLayout, QMessageBox, QListView,
-    QTreeWidget, QTreeWidgetItem, QTreeView, QScrollArea
+    QTreeWidget, QTreeWidgetItem, QTreeView, QScrollArea, QStyledItemDelegate, QStyleOptionViewItem, QStyle
 )
 
 from os import path
 import configparser
 import json
+import heapq
+
+from SortIndex import SORT_Z_A, collation_key
+
+#Role of the text shown in a column next to the name of a row, e.g. the current programme of a channel
+DETAIL_ROLE = Qt.UserRole + 1
+
+#Part of the row width used for the detail column
+DETAIL_COLUMN_RATIO = 0.45
+
+#Size of the posters and of the cells in the poster grid
+POSTER_THUMBNAIL_SIZE   = QSize(120, 180)
+POSTER_GRID_SIZE        = QSize(140, 225)
+POSTER_GRID_SPACING     = 8
+
+#Time to wait after scrolling before the visible rows are reported, so thumbnails are only loaded where the user stops
+VISIBLE_ROWS_DELAY_MS   = 60
 
 class LiveInfoBox(QWidget):
     def __init__(self, parent=None):
@@ -341,3 +359,472 @@ class SeriesInfoBox(QScrollArea):
             self.fav_button.setIcon(self.parent.favorites_icon)
 
 
+
+class CatalogListItem:
+    #Light-weight handle to a row of a CatalogListModel. Items are only created when they are accessed.
+    def __init__(self, model, row):
+        self.model      = model
+        self.row_idx    = row
+        self.generation = model.generation
+
+        #Keep text and data, so the item still works after the list contents changed
+        self.item_text  = model.rowText(row)
+        self.item_data  = model.rowData(row)
+
+    def isCurrent(self):
+        return self.generation == self.model.generation
+
+    def row(self):
+        return self.row_idx
+
+    def text(self):
+        return self.item_text
+
+    def setText(self, text):
+        self.item_text = text
+
+        if self.isCurrent():
+            self.model.setRowText(self.row_idx, text)
+
+    def data(self, role):
+        if role == Qt.UserRole:
+            return self.item_data
+
+        if role == Qt.DisplayRole:
+            return self.item_text
+
+        return self.model.data(self.model.index(self.row_idx), role) if self.isCurrent() else None
+
+    def setData(self, role, value):
+        if role != Qt.UserRole:
+            return
+
+        self.item_data = value
+
+        if self.isCurrent():
+            self.model.setRowData(self.row_idx, value)
+
+    def __eq__(self, other):
+        #Items are the same if they point to the same row of the same list contents
+        if not isinstance(other, CatalogListItem):
+            return False
+
+        return self.model is other.model and self.generation == other.generation and self.row_idx == other.row_idx
+
+    def __hash__(self):
+        return hash((id(self.model), self.generation, self.row_idx))
+
+class CatalogListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        #Rows show the entries of the source list at the positions in the index array
+        self.source         = []
+        self.indices        = []
+        self.text_func      = lambda entry: entry.get('name', '')
+        self.data_func      = lambda entry: entry
+
+        #Optional function that returns the number of items of a row, shown behind the text
+        self.count_func     = None
+
+        #Optional function that returns the text of the detail column of an entry. Kept when the rows change.
+        self.detail_func    = None
+
+        #Optional function that returns the icon of an entry, e.g. its poster. Kept when the rows change.
+        self.decoration_func = None
+
+        #Rows shown above the entries, e.g. 'All' and 'Favorites' categories or 'Go back'. Each row is (text, data, icon).
+        self.header_rows    = []
+
+        #Text shown when there are no entries, e.g. 'No items in list...'
+        self.placeholder    = None
+
+        #Entries after the top entries of a sort by key, sorted and added when the view scrolls to the end
+        self.pending_indices = []
+        self.pending_key    = None
+
+        #Increased each time the list contents change, so old items are not mixed up with new rows
+        self.generation     = 0
+
+    def setRows(self, source, indices=None, text_func=None, data_func=None, header_rows=None, placeholder=None, count_func=None):
+        self.beginResetModel()
+
+        self.source         = source
+        self.indices        = list(range(len(source))) if indices is None else list(indices)
+        self.pending_indices = []
+        self.pending_key    = None
+        self.text_func      = text_func or (lambda entry: entry.get('name', ''))
+        self.data_func      = data_func or (lambda entry: entry)
+        self.count_func     = count_func
+        self.header_rows    = list(header_rows or [])
+        self.placeholder    = placeholder
+        self.generation     += 1
+
+        self.endResetModel()
+
+    def setIndices(self, indices):
+        #Show other entries of the same source, e.g. search results or sorted entries
+        self.beginResetModel()
+
+        self.indices        = list(indices)
+        self.pending_indices = []
+        self.pending_key    = None
+        self.generation     += 1
+
+        self.endResetModel()
+
+    def allIndices(self):
+        return self.indices + self.pending_indices
+
+    def sortRows(self, sort_order, sort_index=None):
+        #Sort order 0: A-Z, 1: Z-A. Header rows stay on top.
+        if sort_index is not None:
+            #Precomputed order of the source list
+            self.setIndices(sort_index.sortPositions(self.allIndices(), sort_order))
+        else:
+            self.setIndices(sorted(self.allIndices(), key=lambda idx: collation_key(self.text_func(self.source[idx])), reverse=(sort_order == SORT_Z_A)))
+
+    def sortRowsByKey(self, key_func, count):
+        #Highest key first, e.g. most recently added. Ties keep their current order.
+        #Only the top entries are selected right away, the other entries are sorted when the view scrolls to them.
+        indices = self.allIndices()
+        if len(indices) <= count:
+            self.setIndices(sorted(indices, key=key_func, reverse=True))
+            return
+
+        top_indices = heapq.nlargest(count, indices, key=key_func)
+        top_set     = set(top_indices)
+
+        self.beginResetModel()
+
+        self.indices         = top_indices
+        self.pending_indices = [idx for idx in indices if idx not in top_set]
+        self.pending_key     = key_func
+        self.generation      += 1
+
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and bool(self.pending_indices)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        pending_indices = sorted(self.pending_indices, key=self.pending_key, reverse=True)
+        first_row = len(self.header_rows) + len(self.indices)
+
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(pending_indices) - 1)
+
+        self.indices.extend(pending_indices)
+        self.pending_indices = []
+        self.pending_key     = None
+
+        self.endInsertRows()
+
+    def restoreOrder(self):
+        #Show entries in the order of the source list
+        self.setIndices(sorted(self.allIndices()))
+
+    def clear(self):
+        self.setRows([])
+
+    def setDetailFunc(self, detail_func):
+        #Repaint all rows with the new details, e.g. when the current programmes change
+        self.detail_func = detail_func
+
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [DETAIL_ROLE])
+
+    def setDecorationFunc(self, decoration_func):
+        self.decoration_func = decoration_func
+        self.refreshDecorations()
+
+    def refreshDecorations(self, first_row=0, last_row=None):
+        #Repaint icons of rows, e.g. when their posters are loaded
+        if last_row is None:
+            last_row = self.rowCount() - 1
+
+        if 0 <= first_row <= last_row:
+            self.dataChanged.emit(self.index(first_row), self.index(last_row), [Qt.DecorationRole])
+
+    def refreshCounts(self):
+        #Repaint rows after the number of items changed, e.g. when adding a favorite
+        if self.count_func and self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [Qt.DisplayRole])
+
+    def showPlaceholder(self):
+        return bool(self.placeholder) and not self.indices and not self.pending_indices
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.header_rows) + len(self.indices) + int(self.showPlaceholder())
+
+    def sourcePosition(self, row):
+        #Position in the source list of a row, or None for header and placeholder rows
+        row -= len(self.header_rows)
+
+        if 0 <= row < len(self.indices):
+            return self.indices[row]
+
+        return None
+
+    def findRow(self, match_func):
+        #Row of the first entry for which match_func(entry data) is True
+        for row, idx in enumerate(self.indices):
+            if match_func(self.data_func(self.source[idx])):
+                return row + len(self.header_rows)
+
+        #Entry can be in the entries that are not added yet
+        if any(match_func(self.data_func(self.source[idx])) for idx in self.pending_indices):
+            first_row = len(self.indices)
+            self.fetchMore()
+
+            for row in range(first_row, len(self.indices)):
+                if match_func(self.data_func(self.source[self.indices[row]])):
+                    return row + len(self.header_rows)
+
+        return -1
+
+    def rowText(self, row):
+        if row < len(self.header_rows):
+            return self.header_rows[row][0]
+
+        position = self.sourcePosition(row)
+        if position is None:
+            return self.placeholder
+
+        return self.text_func(self.source[position])
+
+    def rowData(self, row):
+        if row < len(self.header_rows):
+            return self.header_rows[row][1]
+
+        position = self.sourcePosition(row)
+        if position is None:
+            return None
+
+        return self.data_func(self.source[position])
+
+    def setRowText(self, row, text):
+        #Row texts come from the entries, so only header rows can be renamed
+        if row < len(self.header_rows):
+            self.header_rows[row] = (text,) + tuple(self.header_rows[row][1:])
+            self.dataChanged.emit(self.index(row), self.index(row))
+
+    def setRowData(self, row, value):
+        if row < len(self.header_rows):
+            self.header_rows[row] = (self.header_rows[row][0], value) + tuple(self.header_rows[row][2:])
+
+        else:
+            position = self.sourcePosition(row)
+            if position is None or self.data_func(self.source[position]) is value:
+                return
+
+            self.source[position] = value
+
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+
+        row = index.row()
+
+        if role == Qt.DisplayRole:
+            text = self.rowText(row)
+
+            if self.count_func:
+                count = self.count_func(self.rowData(row))
+                if count is not None:
+                    return f"{text} ({count})"
+
+            return text
+
+        elif role == Qt.UserRole:
+            return self.rowData(row)
+
+        elif role == DETAIL_ROLE:
+            position = self.sourcePosition(row)
+            if self.detail_func and position is not None:
+                return self.detail_func(self.source[position])
+
+        elif role == Qt.DecorationRole and row < len(self.header_rows) and len(self.header_rows[row]) > 2:
+            return self.header_rows[row][2]
+
+        elif role == Qt.DecorationRole and self.decoration_func:
+            position = self.sourcePosition(row)
+            if position is not None:
+                decoration = self.decoration_func(self.source[position])
+                if decoration is not None:
+                    return decoration
+
+        return QVariant()
+
+class CatalogItemDelegate(QStyledItemDelegate):
+    def sizeHint(self, option, index):
+        #Cells of the poster grid have room for the poster and two lines of the name below it
+        if getattr(self.parent(), 'poster_mode', False):
+            return POSTER_GRID_SIZE - QSize(POSTER_GRID_SPACING, POSTER_GRID_SPACING)
+
+        return super().sizeHint(option, index)
+
+    def paint(self, painter, option, index):
+        detail = index.data(DETAIL_ROLE)
+        if not detail:
+            super().paint(painter, option, index)
+            return
+
+        #Name on the left and the details in a column on the right
+        detail_width    = int(option.rect.width() * DETAIL_COLUMN_RATIO)
+        widget          = option.widget
+        style           = widget.style() if widget else QApplication.style()
+
+        #Draw background and selection of the whole row
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        name_option = QStyleOptionViewItem(option)
+        name_option.rect = option.rect.adjusted(0, 0, -detail_width, 0)
+        super().paint(painter, name_option, index)
+
+        detail_rect = option.rect.adjusted(option.rect.width() - detail_width, 0, -4, 0)
+
+        if option.state & QStyle.State_Selected:
+            color = option.palette.color(QPalette.HighlightedText)
+        else:
+            color = option.palette.color(QPalette.Disabled, QPalette.Text)
+
+        painter.save()
+        painter.setPen(color)
+        painter.drawText(detail_rect, Qt.AlignVCenter | Qt.AlignLeft, option.fontMetrics.elidedText(str(detail), Qt.ElideRight, detail_rect.width()))
+        painter.restore()
+
+class CatalogListView(QListView):
+    #Same signals as QListWidget, so the list can be used the same way
+    itemClicked         = pyqtSignal(object)
+    itemDoubleClicked   = pyqtSignal(object)
+
+    #First and last row shown after scrolling, resizing or changing the rows
+    visibleRowsChanged  = pyqtSignal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.setModel(CatalogListModel(self))
+
+        #All rows have the same height, so the view doesn't have to measure each row
+        self.setUniformItemSizes(True)
+
+        #Draws the detail column of rows that have one
+        self.setItemDelegate(CatalogItemDelegate(self))
+
+        #Rows are shown as a grid of posters
+        self.poster_mode = False
+
+        self.visible_rows_timer = QTimer(self)
+        self.visible_rows_timer.setSingleShot(True)
+        self.visible_rows_timer.setInterval(VISIBLE_ROWS_DELAY_MS)
+        self.visible_rows_timer.timeout.connect(self.emitVisibleRows)
+
+        #Signal arguments are not passed on, the timer would take them as interval
+        self.verticalScrollBar().valueChanged.connect(lambda value: self.visible_rows_timer.start())
+        self.verticalScrollBar().rangeChanged.connect(lambda minimum, maximum: self.visible_rows_timer.start())
+        self.model().modelReset.connect(lambda: self.visible_rows_timer.start())
+
+        self.clicked.connect(lambda index: self.itemClicked.emit(self.itemFromIndex(index)))
+        self.doubleClicked.connect(lambda index: self.itemDoubleClicked.emit(self.itemFromIndex(index)))
+
+    def setPosterMode(self, enabled):
+        if enabled == self.poster_mode:
+            return
+
+        self.poster_mode = enabled
+
+        if enabled:
+            #Posters with their name below in cells of the same size, so only the visible cells are laid out
+            self.setViewMode(QListView.IconMode)
+            self.setMovement(QListView.Static)
+            self.setResizeMode(QListView.Adjust)
+            self.setWordWrap(True)
+            self.setIconSize(POSTER_THUMBNAIL_SIZE)
+            self.setGridSize(POSTER_GRID_SIZE)
+        else:
+            #List mode also resets the movement and wrapping
+            self.setViewMode(QListView.ListMode)
+            self.setResizeMode(QListView.Fixed)
+            self.setWordWrap(False)
+            self.setIconSize(QSize())
+            self.setGridSize(QSize())
+
+        self.visible_rows_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.visible_rows_timer.start()
+
+    def findFirstRow(self, is_after):
+        #Rows are laid out from top to bottom, so the first row for which is_after is True is found with a binary search
+        low, high = 0, self.count()
+        while low < high:
+            middle = (low + high) // 2
+            if is_after(self.visualRect(self.model().index(middle))):
+                high = middle
+            else:
+                low = middle + 1
+
+        return low
+
+    def visibleRows(self):
+        #Returns the first and last visible row, or (-1, -1) when no row is visible
+        if not self.count():
+            return -1, -1
+
+        viewport_height = self.viewport().height()
+
+        first_row   = self.findFirstRow(lambda rect: rect.bottom() >= 0)
+        last_row    = self.findFirstRow(lambda rect: rect.top() > viewport_height) - 1
+
+        if first_row > last_row:
+            return -1, -1
+
+        return first_row, last_row
+
+    def emitVisibleRows(self):
+        first_row, last_row = self.visibleRows()
+        if first_row >= 0:
+            self.visibleRowsChanged.emit(first_row, last_row)
+
+    def itemFromIndex(self, index):
+        if not index.isValid():
+            return None
+
+        return CatalogListItem(self.model(), index.row())
+
+    def item(self, row):
+        if not (0 <= row < self.count()):
+            return None
+
+        return CatalogListItem(self.model(), row)
+
+    def count(self):
+        return self.model().rowCount()
+
+    def clear(self):
+        self.model().clear()
+
+    def currentItem(self):
+        return self.itemFromIndex(self.currentIndex())
+
+    def currentRow(self):
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row):
+        self.setCurrentIndex(self.model().index(row))
+
+    def setCurrentItem(self, item):
+        self.setCurrentRow(item.row())
+
+    def findItems(self, text, flags=Qt.MatchExactly):
+        return [CatalogListItem(self.model(), row) for row in range(self.count()) if self.model().rowText(row) == text]
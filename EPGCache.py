@@ -0,0 +1,135 @@
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+#Number of channels kept in memory and on disk. Zapping mostly goes between the same few channels.
+MEMORY_CACHE_SIZE   = 32
+DISK_CACHE_SIZE     = 200
+
+#Time to wait for the database when another thread is writing to it
+DB_BUSY_TIMEOUT     = 10
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS channel_epg (
+        stream_id       TEXT PRIMARY KEY,
+        expires         INTEGER,
+        last_used       REAL,
+        programmes      TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS channel_epg_used ON channel_epg (last_used)"
+]
+
+def get_expire_time(programmes, current_time):
+    #Listing is outdated when the first programme that hasn't ended yet ends, as another programme is on then
+    stop_times = [stop for _, stop, _, _ in programmes if stop > current_time]
+    return min(stop_times) if stop_times else current_time
+
+class EPGCache:
+    def __init__(self, file_path=None):
+        self.file_path      = file_path
+
+        #Programmes per stream id as (start, stop, title, description), with the time the listing expires
+        self.memory         = OrderedDict()
+        self.lock           = threading.Lock()
+
+        #SQLite connections can only be used in the thread they are created in
+        self.thread_data    = threading.local()
+
+        if self.file_path:
+            connection = self.getConnection()
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+
+    def getConnection(self):
+        connection = getattr(self.thread_data, 'connection', None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.file_path, timeout=DB_BUSY_TIMEOUT)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            self.thread_data.connection = connection
+
+        return connection
+
+    def get(self, stream_id):
+        #Returns the cached programmes and whether they are still up to date, or None if the channel is not cached
+        key = str(stream_id)
+        current_time = time.time()
+
+        with self.lock:
+            cached = self.memory.get(key)
+            if cached:
+                self.memory.move_to_end(key)
+
+        if not cached:
+            cached = self.loadFromDisk(key)
+            if not cached:
+                return None
+
+            self.putInMemory(key, cached)
+
+        expires, programmes = cached
+        return programmes, current_time < expires
+
+    def put(self, stream_id, programmes):
+        key = str(stream_id)
+        current_time = time.time()
+
+        #Programmes that have ended are never shown again
+        programmes  = [tuple(programme) for programme in programmes if programme[1] > current_time]
+        cached      = (get_expire_time(programmes, current_time), programmes)
+
+        self.putInMemory(key, cached)
+        self.saveToDisk(key, cached)
+
+    def putInMemory(self, key, cached):
+        with self.lock:
+            self.memory[key] = cached
+            self.memory.move_to_end(key)
+
+            #Remove least recently used channels
+            while len(self.memory) > MEMORY_CACHE_SIZE:
+                self.memory.popitem(last=False)
+
+    def loadFromDisk(self, key):
+        if not self.file_path:
+            return None
+
+        try:
+            connection = self.getConnection()
+            row = connection.execute("SELECT expires, programmes FROM channel_epg WHERE stream_id = ?", (key,)).fetchone()
+            if not row:
+                return None
+
+            with connection:
+                connection.execute("UPDATE channel_epg SET last_used = ? WHERE stream_id = ?", (time.time(), key))
+
+            return row[0], [tuple(programme) for programme in json.loads(row[1])]
+
+        except Exception as e:
+            print(f"Failed reading EPG cache: {e}")
+            return None
+
+    def saveToDisk(self, key, cached):
+        if not self.file_path:
+            return
+
+        try:
+            connection = self.getConnection()
+            expires, programmes = cached
+
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO channel_epg VALUES (?, ?, ?, ?)", (key, expires, time.time(), json.dumps(programmes)))
+
+                #Remove least recently used channels
+                connection.execute(
+                    "DELETE FROM channel_epg WHERE stream_id NOT IN (SELECT stream_id FROM channel_epg ORDER BY last_used DESC LIMIT ?)",
+                    (DISK_CACHE_SIZE,)
+                )
+
+        except Exception as e:
+            print(f"Failed writing EPG cache: {e}")
@@ -0,0 +1,243 @@
+import time
+import bisect
+import sqlite3
+import calendar
+import threading
+from array import array
+from datetime import datetime
+from functools import lru_cache
+
+from lxml import etree
+
+#Tables are created again when the schema changes, the guide is then downloaded again
+SCHEMA_VERSION = 1
+
+#Time to wait for the database when another thread is writing to it
+DB_BUSY_TIMEOUT = 10
+
+#Programmes are written in batches while the guide is parsed, so the whole guide is never kept in memory
+INSERT_BATCH_SIZE = 5000
+
+#Programmes of many channels start at the same times, so parsed times are cached
+TIME_CACHE_SIZE = 4096
+
+#Programmes loaded for the now and next overlay of the live channels
+NOW_NEXT_WINDOW_SECONDS = 24 * 3600
+
+DROP_SCHEMA = [
+    "DROP TABLE IF EXISTS meta",
+    "DROP TABLE IF EXISTS programmes"
+]
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS meta (
+        key     TEXT PRIMARY KEY,
+        value   TEXT
+    )""",
+    #Programmes are looked up per channel and time, which is the primary key
+    """CREATE TABLE IF NOT EXISTS programmes (
+        channel         TEXT,
+        start           INTEGER,
+        stop            INTEGER,
+        title           TEXT,
+        description     TEXT,
+        PRIMARY KEY (channel, start)
+    ) WITHOUT ROWID"""
+]
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def parse_xmltv_time(value):
+    #XMLTV times look like '20250101210000 +0100'. Times without offset are UTC.
+    #Parsed by hand, as strptime is slow for the millions of times in a large guide.
+    parts = (value or '').split()
+    if not parts or len(parts[0]) < 14 or not parts[0][:14].isdigit():
+        return None
+
+    stamp = parts[0]
+
+    try:
+        timestamp = calendar.timegm((int(stamp[0:4]), int(stamp[4:6]), int(stamp[6:8]), int(stamp[8:10]), int(stamp[10:12]), int(stamp[12:14])))
+    except ValueError:
+        return None
+
+    #Offset to UTC, e.g. '+0100' or '-0530'
+    if len(parts) > 1:
+        offset = parts[1]
+        if len(offset) != 5 or offset[0] not in '+-' or not offset[1:].isdigit():
+            return None
+
+        offset_seconds = int(offset[1:3]) * 3600 + int(offset[3:5]) * 60
+        timestamp -= offset_seconds if offset[0] == '+' else -offset_seconds
+
+    return timestamp
+
+def iter_xmltv_programmes(source):
+    #Parse the programmes of an XMLTV guide one by one while the data comes in
+    for _, element in etree.iterparse(source, events=('end',), tag='programme', recover=True, huge_tree=True):
+        channel = element.get('channel')
+        start   = parse_xmltv_time(element.get('start'))
+        stop    = parse_xmltv_time(element.get('stop'))
+
+        if channel and start is not None and stop is not None:
+            yield (channel, start, stop, element.findtext('title') or '', element.findtext('desc') or '')
+
+        #Free the parsed programmes, otherwise the whole guide is built up in memory
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+def make_epg_entries(programmes):
+    #EPG entries shown in the live info box from (start, stop, title, description) programmes
+    epg_data = []
+
+    for start, stop, title, description in programmes:
+        start_timestamp = datetime.fromtimestamp(start)
+        stop_timestamp  = datetime.fromtimestamp(stop)
+
+        epg_data.append({
+            'start_time': start_timestamp,
+            'stop_time': stop_timestamp,
+            'program_name': title,
+            'description': description,
+            'date': f"{start_timestamp.day:02}-{start_timestamp.month:02}-{start_timestamp.year}"
+        })
+
+    return epg_data
+
+class EPGStore:
+    def __init__(self, file_path):
+        self.file_path      = file_path
+
+        #SQLite connections can only be used in the thread they are created in
+        self.thread_data    = threading.local()
+
+        connection = self.getConnection()
+        with connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for statement in DROP_SCHEMA:
+                    connection.execute(statement)
+
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def getConnection(self):
+        connection = getattr(self.thread_data, 'connection', None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.file_path, timeout=DB_BUSY_TIMEOUT)
+
+            #WAL lets the GUI read the old guide while the guide worker writes the new one
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            self.thread_data.connection = connection
+
+        return connection
+
+    def replaceGuide(self, account_key, programmes):
+        #Returns the number of programmes written
+        connection  = self.getConnection()
+        num_written = 0
+
+        #Replace everything in one transaction, so a failed download keeps the old guide
+        with connection:
+            connection.execute("DELETE FROM programmes")
+
+            batch = []
+            for programme in programmes:
+                batch.append(programme)
+
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    connection.executemany("INSERT OR REPLACE INTO programmes VALUES (?, ?, ?, ?, ?)", batch)
+                    num_written += len(batch)
+                    batch = []
+
+            if batch:
+                connection.executemany("INSERT OR REPLACE INTO programmes VALUES (?, ?, ?, ?, ?)", batch)
+                num_written += len(batch)
+
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('account', ?)", (account_key,))
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('updated', ?)", (str(int(time.time())),))
+
+        return num_written
+
+    def getMeta(self, key):
+        row = self.getConnection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def getAccount(self):
+        return self.getMeta('account')
+
+    def getUpdated(self):
+        #Time of the last guide download, 0 if never downloaded
+        try:
+            return int(self.getMeta('updated') or 0)
+        except ValueError:
+            return 0
+
+    def getProgrammesBetween(self, from_time, to_time):
+        #Returns the channel, start, stop and title of all programmes running between the given times, sorted per channel
+        return self.getConnection().execute(
+            "SELECT channel, start, stop, title FROM programmes WHERE stop > ? AND start < ? ORDER BY channel, start",
+            (from_time, to_time)
+        ).fetchall()
+
+    def getChannelEPG(self, channel, from_time=None):
+        #Returns the programmes of a channel that haven't ended yet, in the same format as the EPG worker
+        if from_time is None:
+            from_time = int(time.time())
+
+        rows = self.getConnection().execute(
+            "SELECT start, stop, title, description FROM programmes WHERE channel = ? AND stop > ? ORDER BY start",
+            (channel, from_time)
+        ).fetchall()
+
+        return make_epg_entries(rows)
+
+class NowNextIndex:
+    def __init__(self, programmes, valid_until):
+        #Start times, stop times and titles per channel, sorted by start time, so the current programme is found with a binary search
+        self.channels = {}
+
+        for channel, start, stop, title in programmes:
+            starts, stops, titles = self.channels.setdefault(channel, (array('q'), array('q'), []))
+            starts.append(start)
+            stops.append(stop)
+            titles.append(title)
+
+        #All times at which a programme starts or stops, so it is known when the now and next programmes change
+        change_times = set()
+        for starts, stops, _ in self.channels.values():
+            change_times.update(starts)
+            change_times.update(stops)
+
+        self.change_times   = array('q', sorted(change_times))
+
+        #Programmes after this time are not in the index
+        self.valid_until    = valid_until
+
+    def getNowNext(self, channel, timestamp):
+        #Returns the titles of the programme on at the given time and of the programme after it
+        programmes = self.channels.get(channel)
+        if not programmes:
+            return None, None
+
+        starts, stops, titles = programmes
+
+        idx = bisect.bisect_right(starts, timestamp) - 1
+
+        now_title   = titles[idx] if idx >= 0 and stops[idx] > timestamp else None
+        next_title  = titles[idx + 1] if idx + 1 < len(titles) else None
+
+        return now_title, next_title
+
+    def getAllNowNext(self, timestamp):
+        #Now and next programmes of all channels in one pass
+        return {channel: self.getNowNext(channel, timestamp) for channel in self.channels}
+
+    def getNextChange(self, timestamp):
+        #First time after timestamp at which a programme starts or stops, None if there is none in the index
+        idx = bisect.bisect_right(self.change_times, timestamp)
+        return self.change_times[idx] if idx < len(self.change_times) else None
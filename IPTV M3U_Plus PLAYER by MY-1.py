@@ -7,6 +7,8 @@ import subprocess
 import configparser
 import re
 import json
+import bisect
+import locale
 import html
 from lxml import etree, html
 from datetime import datetime
@@ -27,9 +29,19 @@ from PyQt5.QtWidgets import (
 )
 
 from AccountManager import AccountManager
-from CustomPyQtWidgets import LiveInfoBox, MovieInfoBox, SeriesInfoBox
+from CatalogStore import CatalogStore
+from CatalogIndex import CatalogIndex
+from EPGStore import EPGStore, make_epg_entries
+from EPGCache import EPGCache
+from InfoCache import InfoCache
+from ImageCache import ImageCache
+from ThumbnailLoader import ThumbnailLoader
+from SearchIndex import SearchIndex, query_extends
+from SortIndex import SORT_A_Z, SORT_ADDED, SORT_RATING, SORT_RELEASE, FIELD_SORT_ORDERS, FIELD_SORT_TOP_ITEMS, get_field_value
+from CatalogCache import CACHE_DIR, DEFAULT_CACHE_SIZE_MB, get_account_cache_name, touch_account_cache, evict_account_caches, load_json_file, write_json_file
+from CustomPyQtWidgets import LiveInfoBox, MovieInfoBox, SeriesInfoBox, CatalogListView
 import Threadpools
-from Threadpools import FetchDataWorker, SearchWorker, OnlineWorker, EPGWorker, MovieInfoFetcher, SeriesInfoFetcher, ImageFetcher
+from Threadpools import FetchDataWorker, SearchWorker, ListIndexWorker, OnlineWorker, EPGWorker, MovieInfoFetcher, SeriesInfoFetcher, ImageFetcher, EPGGuideWorker, NowNextWorker
 
 CURRENT_VERSION = "V1.04.00"
 
@@ -39,6 +51,25 @@ is_linux    = sys.platform.startswith('linux')
 
 GITHUB_REPO = "Youri666/Xtream-m3u_plus-IPTV-Player"
 
+#Time to wait after the last key press before searching
+SEARCH_DELAY_MS = 250
+
+#Number of programmes requested with the short EPG
+DEFAULT_SHORT_EPG_LIMIT = 20
+
+#The downloaded EPG guide is checked regularly and downloaded again when it is older than the refresh interval
+EPG_GUIDE_CHECK_INTERVAL_MS = 15 * 60 * 1000
+DEFAULT_EPG_REFRESH_HOURS   = 12
+
+#The now and next programmes are indexed again this long before the end of the indexed programmes
+NOW_NEXT_REBUILD_MARGIN     = 2 * 3600
+
+#Hit rates of the image cache are printed after this many images are shown
+IMAGE_CACHE_STATS_INTERVAL  = 50
+
+def get_category_name(category):
+    return category.get('category_name', '')
+
 class IPTVPlayerApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -65,7 +96,16 @@ class IPTVPlayerApp(QMainWindow):
 
         self.user_data_file = "userdata.ini"
         self.favorites_file = "favorites.json"
-        self.cache_file     = "all_cached_data.json"
+        self.legacy_cache_file = "all_cached_data.json"
+
+        #Cache files of the logged in account, set at login
+        self.cache_dir          = CACHE_DIR
+        self.cache_name         = ""
+        self.cache_file         = ""
+        self.catalog_store_file = ""
+
+        #Disk budget for the cache files of all accounts
+        self.cache_max_size_mb  = DEFAULT_CACHE_SIZE_MB
         # Default values for URL formats
         self.default_url_formats = {
             'live': "{server}/live/{username}/{password}/{stream_id}.{container_extension}",
@@ -141,12 +181,8 @@ class IPTVPlayerApp(QMainWindow):
             'Series': []
         }
 
-        #Loaded data used for search algorithm
-        self.currently_loaded_categories = {
-            'LIVE': [],
-            'Movies': [],
-            'Series': []
-        }
+        #Loaded data used for search algorithm. For LIVE, Movies and Series these are the positions of the entries
+        #in the category that is shown, so the lists only have to swap these positions when filtering or sorting.
         self.currently_loaded_streams = {
             'LIVE': [],
             'Movies': [],
@@ -158,6 +194,93 @@ class IPTVPlayerApp(QMainWindow):
         # Whether to request the VODs or not
         self.vods_enabled = True
 
+        # Whether to request the IPTV data sections in parallel or not
+        self.parallel_fetch_enabled = True
+
+        # Whether to show the cached IPTV data at startup while refreshing it in the background
+        self.startup_with_cache     = True
+        self.showing_cached_data    = False
+        self.data_worker_signals    = None
+
+        # Whether to keep the catalog in an indexed database for fast category, search and sort queries. Off unless opted in.
+        self.catalog_store_enabled  = False
+        self.catalog_store          = None
+
+        # Whether to download the EPG guide of all channels, so showing the EPG of a channel doesn't need a request
+        self.bulk_epg_enabled   = False
+        self.epg_refresh_hours  = DEFAULT_EPG_REFRESH_HOURS
+        self.epg_store_file     = ""
+        self.epg_store          = None
+        self.epg_guide_loading  = False
+
+        # Whether to request only the next programmes of a channel instead of its full EPG table
+        self.short_epg_enabled  = True
+        self.short_epg_limit    = DEFAULT_SHORT_EPG_LIMIT
+
+        #EPG data of recently shown channels, in memory and on disk per account after login
+        self.epg_cache          = EPGCache()
+        self.epg_stream_id      = None
+
+        #Posters and logos of recently shown streams, shared by all accounts as they are looked up by url
+        self.image_cache        = ImageCache(self.cache_dir)
+
+        #Loading and not found images scaled to the size of the info boxes
+        self.placeholder_images = {}
+
+        #Generations of the info requests of the selected items, so requests of previously selected items are dropped
+        self.detail_requests    = Threadpools.DETAIL_REQUESTS
+
+        #Movie and series info, in memory and on disk per account after login
+        self.info_cache         = InfoCache()
+
+        #Requests waiting for info that is being fetched per (info type, item id), so the same info is fetched only once
+        self.info_requests      = {}
+
+        #Whether movies and series are shown as a grid of posters, of which only the visible posters are loaded
+        self.poster_grid_enabled    = False
+        self.thumbnail_loader       = ThumbnailLoader(self.image_cache, self)
+
+        #Now and next programmes of all channels from the downloaded guide, shown next to the live channels
+        self.now_next_index     = None
+        self.now_next_loading   = False
+
+        #Whether the catalog store matches the loaded data of a stream type
+        self.catalog_store_valid = {
+            'LIVE': False,
+            'Movies': False,
+            'Series': False
+        }
+
+        #Positions of the entries per category and of the favorites, built when the data is loaded
+        self.catalog_indexes = {}
+
+        #Search indexes of the category and streaming names, built in the background after loading the data
+        self.search_indexes = {}
+
+        #Sort orders of the category and streaming names, built together with the search indexes
+        self.sort_indexes = {}
+
+        #Added time, rating and release date of the streams as typed columns, used to sort streams by these fields
+        self.field_columns = {}
+
+        #Search as you type. Each new search increases the generation of the list, so older searches are dropped.
+        self.search_timers          = {}
+        self.search_generations     = {}
+        self.last_search_results    = {}
+
+        #Category filter of the currently loaded streams, used for catalog store queries
+        self.currently_loaded_filters = {
+            'LIVE': {},
+            'Movies': {},
+            'Series': {}
+        }
+
+        #Search text of the search results shown in the lists
+        self.currently_applied_search = {
+            'category': {'LIVE': '', 'Movies': '', 'Series': ''},
+            'streaming': {'LIVE': '', 'Movies': '', 'Series': ''}
+        }
+
         #Create search bar dicts
         self.category_search_bars   = {}
         self.streaming_search_bars  = {}
@@ -178,6 +301,33 @@ class IPTVPlayerApp(QMainWindow):
         self.threadpool = QThreadPool()
         self.threadpool.setMaxThreadCount(1)
 
+        #Create threadpool for long running background work, so it doesn't block loading item info
+        self.background_threadpool = QThreadPool()
+        self.background_threadpool.setMaxThreadCount(1)
+
+        #Create threadpool for downloading the EPG guide, so it doesn't block refreshing the IPTV data
+        self.epg_threadpool = QThreadPool()
+        self.epg_threadpool.setMaxThreadCount(1)
+
+        #Create threadpool for searching while typing, so searches never wait for item info requests
+        self.search_threadpool = QThreadPool()
+        self.search_threadpool.setMaxThreadCount(1)
+
+        #Create threadpool for building the search and sort indexes, so it doesn't delay item info or searches
+        self.index_threadpool = QThreadPool()
+        self.index_threadpool.setMaxThreadCount(1)
+
+        #Check regularly if the EPG guide has to be downloaded again
+        self.epg_guide_timer = QTimer(self)
+        self.epg_guide_timer.setInterval(EPG_GUIDE_CHECK_INTERVAL_MS)
+        self.epg_guide_timer.timeout.connect(self.check_epg_guide)
+        self.epg_guide_timer.start()
+
+        #Update the now and next programmes when a programme starts or stops
+        self.now_next_timer = QTimer(self)
+        self.now_next_timer.setSingleShot(True)
+        self.now_next_timer.timeout.connect(self.refresh_now_next)
+
         self.initIcons()
 
         self.initTabWidget()
@@ -473,6 +623,11 @@ class IPTVPlayerApp(QMainWindow):
         sort_z_a        = QAction("Z-A", self)
         sort_disabled   = QAction("Sorting disabled", self)
 
+        #Streams can also be sorted by their fields, categories only by name
+        sort_added      = QAction("Recently added", self)
+        sort_rating     = QAction("Top rated", self)
+        sort_release    = QAction("Newest release", self)
+
         #Add search icon
         search_bar.addAction(self.search_icon, QLineEdit.LeadingPosition)
 
@@ -481,6 +636,10 @@ class IPTVPlayerApp(QMainWindow):
         sorting_menu.setTitle("Set sorting order:")
         sorting_menu.addActions([sort_a_z, sort_z_a, sort_disabled])
 
+        if list_content_type == 'streaming':
+            sorting_menu.addSeparator()
+            sorting_menu.addActions([sort_added, sort_rating, sort_release])
+
         #Create sorting button
         sort_action = QAction(self.sorting_icon, "sort", self)
         sort_action.setMenu(sorting_menu)
@@ -490,6 +649,9 @@ class IPTVPlayerApp(QMainWindow):
         sort_a_z.triggered.connect(lambda: self.sortList(search_bar, list_content_type, stream_type, list_widgets, True, 0))
         sort_z_a.triggered.connect(lambda: self.sortList(search_bar, list_content_type, stream_type, list_widgets, True, 1))
         sort_disabled.triggered.connect(lambda: self.sortList(search_bar, list_content_type, stream_type, list_widgets, False, 0))
+        sort_added.triggered.connect(lambda: self.sortList(search_bar, list_content_type, stream_type, list_widgets, True, SORT_ADDED))
+        sort_rating.triggered.connect(lambda: self.sortList(search_bar, list_content_type, stream_type, list_widgets, True, SORT_RATING))
+        sort_release.triggered.connect(lambda: self.sortList(search_bar, list_content_type, stream_type, list_widgets, True, SORT_RELEASE))
 
         #Create clear search button
         clear_action = QAction(self.clear_btn_icon, "clear", self)
@@ -502,6 +664,14 @@ class IPTVPlayerApp(QMainWindow):
         search_bar.keyPressEvent = lambda e: self.SearchBarKeyPressed(e, 
             search_bar, list_content_type, stream_type, list_widgets, search_history_list, search_history_list_idx)
 
+        #Search while typing, after the user stopped typing for a moment
+        search_timer = QTimer(self)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(SEARCH_DELAY_MS)
+        search_timer.timeout.connect(lambda: self.start_search(list_content_type, stream_type, search_bar.text()))
+        search_bar.textEdited.connect(lambda text: search_timer.start())
+        self.search_timers[(list_content_type, stream_type)] = search_timer
+
     def clearSearch(self, search_bar, list_content_type, stream_type, list_widgets, history_list_idx):
         #Clear search bar
         search_bar.clear()
@@ -515,60 +685,65 @@ class IPTVPlayerApp(QMainWindow):
     def sortList(self, search_bar, list_content_type, stream_type, list_widgets, sorting_enabled, sort_order):
         self.set_progress_bar(0, f"Sorting {stream_type} {list_content_type}")
 
-        #Get list
-        list_widget = list_widgets[stream_type]
+        #Get list model. 'All', 'Favorites' and 'Go back' items stay on top of the list.
+        list_model = list_widgets[stream_type].model()
 
-        #Enable or disable sorting
-        list_widget.setSortingEnabled(sorting_enabled)
+        #Seasons and episodes have no sort index and are not in the catalog store
+        is_series_content = list_content_type == 'streaming' and stream_type == 'Series' and self.series_navigation_level != 0
+        sort_index = None if is_series_content else self.get_sort_index(stream_type, list_content_type)
 
-        #Remove 'All' and 'Favorites' category items
-        if list_content_type == 'category':
-            matches = []
-            for text in [self.all_categories_text, self.fav_categories_text]:
-                matches.extend(list_widget.findItems(text, Qt.MatchExactly))
+        #Categories have no added time, rating or release date, they are sorted by name
+        if sort_order in FIELD_SORT_ORDERS and list_content_type != 'streaming':
+            sort_order = SORT_A_Z
 
-            for item in matches:
-                idx = list_widget.row(item)
-                list_widget.takeItem(idx)
+        if sorting_enabled and sort_order in FIELD_SORT_ORDERS:
+            #The top streams are selected by the parsed field values, highest first. The other streams follow when scrolling down.
+            field_columns = None if is_series_content else self.field_columns.get(stream_type)
+            if field_columns:
+                key_func = field_columns.keyFunc(sort_order)
+            else:
+                key_func = lambda position: get_field_value(list_model.source[position], sort_order)
 
-        if sorting_enabled:
-            #When sorting is enabled, set sort order, 0: A-Z, 1: Z-A
-            list_widget.sortItems(sort_order)
+            list_model.sortRowsByKey(key_func, FIELD_SORT_TOP_ITEMS)
 
-        else:
-            #When sorting is disabled, reload list manually
-            if list_content_type == 'category':
-                self.category_list_widgets[stream_type].clear()
+            #Show the top streams, the other streams are only sorted when scrolling to the end of the list
+            list_widgets[stream_type].scrollToTop()
 
-                for entry in self.currently_loaded_categories[stream_type]:
-                    item = QListWidgetItem(entry['category_name'])
-                    item.setData(Qt.UserRole, entry)
+            self.animate_progress(0, 100, f"Finished sorting {stream_type} {list_content_type}")
+            return
 
-                    self.category_list_widgets[stream_type].addItem(item)
+        #Get sorted positions from the catalog store while the sort index is built
+        sorted_positions = None
+        if sorting_enabled and sort_index is None and not is_series_content:
+            filters = self.currently_loaded_filters[stream_type] if list_content_type == 'streaming' else {}
+            sorted_positions = self.query_catalog_store(stream_type, list_content_type, text=self.currently_applied_search[list_content_type][stream_type], sort_order=sort_order, **filters)
 
-            elif list_content_type == 'streaming':
-                self.streaming_list_widgets[stream_type].clear()
+        if sorted_positions is not None:
+            list_model.setIndices(sorted_positions)
 
-                for entry in self.currently_loaded_streams[stream_type]:
-                    item = QListWidgetItem(entry['name'])
-                    item.setData(Qt.UserRole, entry)
+        elif sorting_enabled and sort_index is not None:
+            #Order the shown positions with the precomputed sort order
+            list_model.sortRows(sort_order, sort_index)
 
-                    self.streaming_list_widgets[stream_type].addItem(item)
+        elif sorting_enabled:
+            #When sorting is enabled, set sort order, 0: A-Z, 1: Z-A
+            list_model.sortRows(sort_order)
 
-        #Disable sorting
-        list_widget.setSortingEnabled(False)
+        else:
+            #When sorting is disabled, show items in the order of the IPTV provider
+            list_model.restoreOrder()
 
-        if list_content_type == 'category':
-            #Add 'All' and 'Favorites' categories to top
-            itemAll = QListWidgetItem(self.all_categories_text)
-            itemAll.setData(Qt.UserRole, {'category_name': self.all_categories_text})
-            self.category_list_widgets[stream_type].insertItem(0, itemAll)
+        self.animate_progress(0, 100, f"Finished sorting {stream_type} {list_content_type}")
 
-            itemFav = QListWidgetItem(self.fav_categories_text)
-            itemFav.setData(Qt.UserRole, {'category_name': self.fav_categories_text})
-            self.category_list_widgets[stream_type].insertItem(1, itemFav)
+    def getSpecialCategoryRows(self):
+        #'All' and 'Favorites' categories on top of the category list
+        return [
+            (self.all_categories_text, {'category_name': self.all_categories_text}),
+            (self.fav_categories_text, {'category_name': self.fav_categories_text})
+        ]
 
-        self.animate_progress(0, 100, f"Finished sorting {stream_type} {list_content_type}")
+    def getGoBackRow(self):
+        return (self.go_back_text, None, self.go_back_icon)
 
     def initIPTVinfo(self):
         self.iptv_info_text = QTextEdit()
@@ -581,9 +756,9 @@ class IPTVPlayerApp(QMainWindow):
 
     def initCategoryListWidgets(self):
         #Create lists for categories
-        self.category_list_live     = QListWidget()
-        self.category_list_movies   = QListWidget()
-        self.category_list_series   = QListWidget()
+        self.category_list_live     = CatalogListView()
+        self.category_list_movies   = CatalogListView()
+        self.category_list_series   = CatalogListView()
 
         #Enable sorting
         # self.category_list_live.setSortingEnabled(True)
@@ -608,7 +783,7 @@ class IPTVPlayerApp(QMainWindow):
             list_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
             list_widget.setIconSize(standard_icon_size)
             list_widget.setStyleSheet("""
-                QListWidget::item {
+                QListView::item {
                     padding-top: 5px;
                     padding-bottom: 5px;
                 }
@@ -616,16 +791,16 @@ class IPTVPlayerApp(QMainWindow):
 
     def initEntryListWidgets(self):
         #Create lists for channels
-        self.streaming_list_live      = QListWidget()
-        self.streaming_list_movies    = QListWidget()
-        self.streaming_list_series    = QListWidget()
+        self.streaming_list_live      = CatalogListView()
+        self.streaming_list_movies    = CatalogListView()
+        self.streaming_list_series    = CatalogListView()
 
         #Enable sorting
         # self.streaming_list_live.setSortingEnabled(True)
         # self.streaming_list_movies.setSortingEnabled(True)
         # self.streaming_list_series.setSortingEnabled(True)
 
-        #Set that lists load items in batches to prevent screen freezing
+        #Lists only create the rows that are visible. Also lay out items in batches to prevent screen freezing.
         self.streaming_list_live.setLayoutMode(QListView.Batched)
         self.streaming_list_movies.setLayoutMode(QListView.Batched)
         self.streaming_list_series.setLayoutMode(QListView.Batched)
@@ -643,6 +818,10 @@ class IPTVPlayerApp(QMainWindow):
         self.streaming_list_movies.itemClicked.connect(self.streaming_item_clicked)
         self.streaming_list_series.itemClicked.connect(self.streaming_item_clicked)
 
+        #Load posters of the visible movies and series in the poster grid
+        self.streaming_list_movies.visibleRowsChanged.connect(lambda first_row, last_row: self.load_visible_thumbnails('Movies', first_row, last_row))
+        self.streaming_list_series.visibleRowsChanged.connect(lambda first_row, last_row: self.load_visible_thumbnails('Series', first_row, last_row))
+
         #Put entry lists in list
         self.streaming_list_widgets = {
             'LIVE': self.streaming_list_live,
@@ -656,7 +835,7 @@ class IPTVPlayerApp(QMainWindow):
             list_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
             list_widget.setIconSize(standard_icon_size)
             list_widget.setStyleSheet("""
-                QListWidget::item {
+                QListView::item {
                     padding-top: 5px;
                     padding-bottom: 5px;
                 }
@@ -810,6 +989,10 @@ class IPTVPlayerApp(QMainWindow):
         self.vods_enabled_checkbox.setToolTip("Load the Movies/Series tabs for the IPTV account")
         self.vods_enabled_checkbox.stateChanged.connect(self.toggleVODs)
 
+        self.parallel_fetch_checkbox = QCheckBox("Parallel data fetching")
+        self.parallel_fetch_checkbox.setToolTip("Request all IPTV data at the same time at login to reduce loading time")
+        self.parallel_fetch_checkbox.stateChanged.connect(self.toggleParallelFetch)
+
         self.keep_on_top_checkbox = QCheckBox("Keep on top")
         self.keep_on_top_checkbox.setToolTip("Keep the application on top of all windows")
         self.keep_on_top_checkbox.stateChanged.connect(self.toggleKeepOnTop)
@@ -818,9 +1001,25 @@ class IPTVPlayerApp(QMainWindow):
         self.default_sorting_order_box.addItems(["A-Z", "Z-A", "Sorting disabled"])
         self.default_sorting_order_box.currentTextChanged.connect(lambda e: self.setDefaultSortingOrder(e, self.default_sorting_order_box))
 
-        # self.cache_on_startup_checkbox = QCheckBox("Startup with cached data")
-        # self.cache_on_startup_checkbox.setToolTip("Loads the cached IPTV data on startup to reduce startup time.\nNote that the cached data only changes if you manually reload it once in a while.")
-        # self.cache_on_startup_checkbox.stateChanged.connect(self.toggle_cache_on_startup)
+        self.cache_on_startup_checkbox = QCheckBox("Startup with cached data")
+        self.cache_on_startup_checkbox.setToolTip("Shows the cached IPTV data at startup to reduce startup time.\nThe data is refreshed from the IPTV provider in the background.")
+        self.cache_on_startup_checkbox.stateChanged.connect(self.toggle_cache_on_startup)
+
+        self.catalog_store_checkbox = QCheckBox("Indexed catalog store")
+        self.catalog_store_checkbox.setToolTip("Keep the IPTV data in an indexed database to speed up\nloading categories, searching and sorting large lists")
+        self.catalog_store_checkbox.stateChanged.connect(self.toggleCatalogStore)
+
+        self.bulk_epg_checkbox = QCheckBox("Download full EPG guide")
+        self.bulk_epg_checkbox.setToolTip("Regularly download the EPG data of all channels and keep it in an indexed database.\nShowing the EPG of a channel then doesn't need a request to the IPTV provider.")
+        self.bulk_epg_checkbox.stateChanged.connect(self.toggleBulkEPG)
+
+        self.short_epg_checkbox = QCheckBox("Short EPG")
+        self.short_epg_checkbox.setToolTip("Only request the next programmes of a channel instead of all its programmes.\nThe full EPG is requested if the IPTV provider doesn't support this.")
+        self.short_epg_checkbox.stateChanged.connect(self.toggleShortEPG)
+
+        self.poster_grid_checkbox = QCheckBox("Poster grid")
+        self.poster_grid_checkbox.setToolTip("Show movies and series as a grid of posters instead of a list.\nOnly the posters that are in view are downloaded.")
+        self.poster_grid_checkbox.stateChanged.connect(self.togglePosterGrid)
 
         # self.reload_data_btn = QPushButton("Reload data")
         # self.reload_data_btn.setIcon(self.style().standardIcon(QtWidgets.QStyle.SP_BrowserReload))
@@ -855,25 +1054,82 @@ class IPTVPlayerApp(QMainWindow):
         self.set_live_status_timeout.setValidator(timeout_validator)
         self.set_live_status_timeout.returnPressed.connect(lambda: self.setTimeout(self.set_live_status_timeout))
 
+        #Set max parallel requests integer validator
+        fetch_workers_validator = QIntValidator(1, 16)
+
+        self.set_fetch_workers = QLineEdit()
+        self.set_fetch_workers.setFixedWidth(100)
+        self.set_fetch_workers.setValidator(fetch_workers_validator)
+        self.set_fetch_workers.returnPressed.connect(lambda: self.setFetchWorkers(self.set_fetch_workers))
+
+        #Set connection pool size integer validator
+        pool_size_validator = QIntValidator(1, 100)
+
+        self.set_pool_size = QLineEdit()
+        self.set_pool_size.setFixedWidth(100)
+        self.set_pool_size.setValidator(pool_size_validator)
+        self.set_pool_size.returnPressed.connect(lambda: self.setPoolSize(self.set_pool_size))
+
+        #Set cache size integer validator
+        cache_size_validator = QIntValidator(10, 100000)
+
+        self.set_cache_size = QLineEdit()
+        self.set_cache_size.setFixedWidth(100)
+        self.set_cache_size.setValidator(cache_size_validator)
+        self.set_cache_size.returnPressed.connect(lambda: self.setCacheSize(self.set_cache_size))
+
+        #Set EPG refresh interval integer validator
+        epg_refresh_validator = QIntValidator(1, 168)
+
+        self.set_epg_refresh = QLineEdit()
+        self.set_epg_refresh.setFixedWidth(100)
+        self.set_epg_refresh.setValidator(epg_refresh_validator)
+        self.set_epg_refresh.returnPressed.connect(lambda: self.setEPGRefreshInterval(self.set_epg_refresh))
+
+        #Set short EPG limit integer validator
+        short_epg_validator = QIntValidator(1, 500)
+
+        self.set_short_epg_limit = QLineEdit()
+        self.set_short_epg_limit.setFixedWidth(100)
+        self.set_short_epg_limit.setValidator(short_epg_validator)
+        self.set_short_epg_limit.returnPressed.connect(lambda: self.setShortEPGLimit(self.set_short_epg_limit))
+
         #Add widgets to settings tab layout
         self.settings_layout.addWidget(self.address_book_button,                            0, 0)
         self.settings_layout.addWidget(self.choose_player_button,                           0, 1)
         self.settings_layout.addWidget(self.vods_enabled_checkbox,                          1, 0)
+        self.settings_layout.addWidget(self.parallel_fetch_checkbox,                        1, 1)
         self.settings_layout.addWidget(self.keep_on_top_checkbox,                           2, 0)
+        self.settings_layout.addWidget(self.cache_on_startup_checkbox,                      2, 1)
         self.settings_layout.addWidget(QLabel("Default sorting order: "),                   3, 0)
         self.settings_layout.addWidget(self.default_sorting_order_box,                      3, 1)
         self.settings_layout.addWidget(self.update_checker,                                 4, 0)
         self.settings_layout.addWidget(self.auto_update_checkbox,                           4, 1)
 
+        self.settings_layout.addWidget(self.catalog_store_checkbox,                         5, 0)
+        self.settings_layout.addWidget(self.bulk_epg_checkbox,                              5, 1)
+        self.settings_layout.addWidget(self.short_epg_checkbox,                             6, 0)
+        self.settings_layout.addWidget(self.poster_grid_checkbox,                           6, 1)
+
         #Advanced options
-        self.settings_layout.addWidget(QLabel("Select User-Agent (Advanced option): "),         5, 0)
-        self.settings_layout.addWidget(self.select_user_agent_box,                              5, 1)
-        self.settings_layout.addWidget(QLabel("Set connection timeout (Advanced option): "),    6, 0)
-        self.settings_layout.addWidget(self.set_connection_timeout,                             6, 1)
-        self.settings_layout.addWidget(QLabel("Set read timeout (Advanced option): "),          7, 0)
-        self.settings_layout.addWidget(self.set_read_timeout,                                   7, 1)
-        self.settings_layout.addWidget(QLabel("Set live status timeout (Advanced option): "),   8, 0)
-        self.settings_layout.addWidget(self.set_live_status_timeout,                            8, 1)
+        self.settings_layout.addWidget(QLabel("Select User-Agent (Advanced option): "),         7, 0)
+        self.settings_layout.addWidget(self.select_user_agent_box,                              7, 1)
+        self.settings_layout.addWidget(QLabel("Set connection timeout (Advanced option): "),    8, 0)
+        self.settings_layout.addWidget(self.set_connection_timeout,                             8, 1)
+        self.settings_layout.addWidget(QLabel("Set read timeout (Advanced option): "),          9, 0)
+        self.settings_layout.addWidget(self.set_read_timeout,                                   9, 1)
+        self.settings_layout.addWidget(QLabel("Set live status timeout (Advanced option): "),   10, 0)
+        self.settings_layout.addWidget(self.set_live_status_timeout,                            10, 1)
+        self.settings_layout.addWidget(QLabel("Set max parallel requests (Advanced option): "), 11, 0)
+        self.settings_layout.addWidget(self.set_fetch_workers,                                 11, 1)
+        self.settings_layout.addWidget(QLabel("Set connection pool size (Advanced option): "), 12, 0)
+        self.settings_layout.addWidget(self.set_pool_size,                                     12, 1)
+        self.settings_layout.addWidget(QLabel("Set cache size limit in MB (Advanced option): "), 13, 0)
+        self.settings_layout.addWidget(self.set_cache_size,                                    13, 1)
+        self.settings_layout.addWidget(QLabel("Set EPG guide refresh interval in hours (Advanced option): "), 14, 0)
+        self.settings_layout.addWidget(self.set_epg_refresh,                                   14, 1)
+        self.settings_layout.addWidget(QLabel("Set short EPG programmes limit (Advanced option): "), 15, 0)
+        self.settings_layout.addWidget(self.set_short_epg_limit,                               15, 1)
 
         # self.settings_layout.addWidget(self.cache_on_startup_checkbox,  2, 0)
         # self.settings_layout.addWidget(self.reload_data_btn,            3, 0)
@@ -884,6 +1140,7 @@ class IPTVPlayerApp(QMainWindow):
 
         #Set current user agent
         self.current_user_agent = user_agent
+        Threadpools.HTTP_CLIENT.user_agent = user_agent
 
         #Save selected user agent to userdata
         config = configparser.ConfigParser()
@@ -905,6 +1162,9 @@ class IPTVPlayerApp(QMainWindow):
         else:
             self.current_user_agent = Threadpools.DEFAULT_USER_AGENT_HEADER
 
+        #Use user agent for all requests of the shared HTTP client
+        Threadpools.HTTP_CLIENT.user_agent = self.current_user_agent
+
         #Update combobox to selection
         self.select_user_agent_box.setCurrentText(self.current_user_agent)
 
@@ -929,6 +1189,160 @@ class IPTVPlayerApp(QMainWindow):
         else:
             self.vods_enabled_checkbox.setCheckState(Qt.Unchecked)
 
+    def loadDefaultParallelFetch(self):
+        #Read userdata config file
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
+
+        #Check if defined in config. Otherwise set to default
+        if 'Fetch' in config:
+            self.parallel_fetch_enabled = (config['Fetch'].get('parallel', 'True') == 'True')
+
+            if config.has_option('Fetch', 'max_workers'):
+                Threadpools.MAX_FETCH_WORKERS = int(config['Fetch']['max_workers'])
+        else:
+            self.parallel_fetch_enabled = True
+
+        #Update checkbox and lineedit to match config
+        self.parallel_fetch_checkbox.setChecked(self.parallel_fetch_enabled)
+        self.set_fetch_workers.setText(str(Threadpools.MAX_FETCH_WORKERS))
+
+    def toggleParallelFetch(self, state):
+        checked = bool(state)
+
+        self.parallel_fetch_enabled = checked
+
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
+
+        if 'Fetch' not in config:
+            config['Fetch'] = {}
+
+        config['Fetch']['parallel'] = str(checked)
+
+        with open(self.user_data_file, 'w') as config_file:
+            config.write(config_file)
+
+    def setFetchWorkers(self, lineedit):
+        try:
+            #Get max parallel requests from lineedit
+            value = lineedit.text()
+
+            #If value is invalid
+            if not value or int(value) < 1:
+                raise Exception(f"Value entered is not valid: {value}!")
+
+            Threadpools.MAX_FETCH_WORKERS = int(value)
+
+            #Save max parallel requests to userdata
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            if 'Fetch' not in config:
+                config['Fetch'] = {}
+
+            config['Fetch']['max_workers'] = value
+
+            with open(self.user_data_file, 'w') as config_file:
+                config.write(config_file)
+
+            self.animate_progress(0, 100, f"Succesfully adjusted setting")
+
+        except Exception as e:
+            self.animate_progress(0, 100, f"Failed setting max parallel requests: {e}")
+
+    def setPoolSize(self, lineedit):
+        try:
+            #Get connection pool size from lineedit
+            value = lineedit.text()
+
+            #If value is invalid
+            if not value or int(value) < 1:
+                raise Exception(f"Value entered is not valid: {value}!")
+
+            #Recreate connection pools of the shared HTTP client
+            Threadpools.HTTP_CLIENT.setPoolSize(int(value))
+
+            #Save connection pool size to userdata
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            if 'Connection' not in config:
+                config['Connection'] = {}
+
+            config['Connection']['pool_size'] = value
+
+            with open(self.user_data_file, 'w') as config_file:
+                config.write(config_file)
+
+            self.animate_progress(0, 100, f"Succesfully adjusted setting")
+
+        except Exception as e:
+            self.animate_progress(0, 100, f"Failed setting connection pool size: {e}")
+
+    def loadDefaultPoolSize(self):
+        try:
+            #Read userdata config file
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            #Check if defined in config
+            if config.has_option('Connection', 'pool_size'):
+                Threadpools.HTTP_CLIENT.setPoolSize(int(config['Connection']['pool_size']))
+
+            #Set value in LineEdit widget
+            self.set_pool_size.setText(str(Threadpools.HTTP_CLIENT.pool_size))
+
+        except Exception as e:
+            print(f"Failed loading default connection pool size: {e}")
+
+    def setCacheSize(self, lineedit):
+        try:
+            #Get cache size limit from lineedit
+            value = lineedit.text()
+
+            #If value is invalid
+            if not value or int(value) < 1:
+                raise Exception(f"Value entered is not valid: {value}!")
+
+            self.cache_max_size_mb = int(value)
+
+            #Save cache size limit to userdata
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            if 'Cache' not in config:
+                config['Cache'] = {}
+
+            config['Cache']['max_size_mb'] = value
+
+            with open(self.user_data_file, 'w') as config_file:
+                config.write(config_file)
+
+            #Remove caches of other accounts that don't fit anymore
+            evict_account_caches(self.cache_dir, self.cache_max_size_mb * 1e6, self.cache_name)
+
+            self.animate_progress(0, 100, f"Succesfully adjusted setting")
+
+        except Exception as e:
+            self.animate_progress(0, 100, f"Failed setting cache size limit: {e}")
+
+    def loadDefaultCacheSize(self):
+        try:
+            #Read userdata config file
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            #Check if defined in config
+            if config.has_option('Cache', 'max_size_mb'):
+                self.cache_max_size_mb = int(config['Cache']['max_size_mb'])
+
+            #Set value in LineEdit widget
+            self.set_cache_size.setText(str(self.cache_max_size_mb))
+
+        except Exception as e:
+            print(f"Failed loading default cache size limit: {e}")
+
     def setTimeout(self, lineedit):
         try: 
             #Get timeout value from lineedit
@@ -1118,6 +1532,30 @@ class IPTVPlayerApp(QMainWindow):
         #Load if VODs enabled
         self.loadDefaultVODs()
 
+        #Load if IPTV data is fetched in parallel
+        self.loadDefaultParallelFetch()
+
+        #Load if cached data is shown at startup
+        self.loadDefaultCacheOnStartup()
+
+        #Load if the indexed catalog store is used
+        self.loadDefaultCatalogStore()
+
+        #Load if the EPG guide of all channels is downloaded
+        self.loadDefaultBulkEPG()
+
+        #Load if only the next programmes of a channel are requested
+        self.loadDefaultShortEPG()
+
+        #Load if movies and series are shown as a poster grid
+        self.loadDefaultPosterGrid()
+
+        #Load default connection pool size
+        self.loadDefaultPoolSize()
+
+        #Load default cache size limit
+        self.loadDefaultCacheSize()
+
         #Load default auto update checker
         self.loadDefaultAutoUpdate()
 
@@ -1186,86 +1624,450 @@ class IPTVPlayerApp(QMainWindow):
             config.write(config_file)
     
     def toggle_cache_on_startup(self, state):
-        if state == Qt.Checked:
-            print("checked")
-        else:
-            print("unchecked")
+        checked = bool(state)
 
-    def open_m3u_plus_dialog(self):
-        text, ok = QtWidgets.QInputDialog.getText(self, 'M3u_plus Login', 'Enter m3u_plus URL:')
-        if ok and text:
-            m3u_plus_url = text.strip()
-            self.extract_credentials_from_m3u_plus_url(m3u_plus_url)
-            self.login()
+        self.startup_with_cache = checked
 
-    def update_font_size(self, value):
-        self.default_font_size = value
-        for tab_name, list_widget in self.streaming_list_widgets.items():
-            for i in range(list_widget.count()):
-                item = list_widget.item(i)
-                font = item.font()
-                font.setPointSize(value)
-                item.setFont(font)
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
 
-        font = QFont()
-        font.setPointSize(value)
-        self.iptv_info_text.setFont(font)
+        if 'Cache' not in config:
+            config['Cache'] = {}
 
-    def extract_credentials_from_m3u_plus_url(self, url):
-        try:
-            pattern = r'(http[s]?://[^/]+)/get\.php\?username=([^&]*)&password=([^&]*)&type=(m3u_plus|m3u|&output=m3u8)'
-            match = re.match(pattern, url)
-            if match:
-                self.server     = match.group(1)
-                self.username   = match.group(2)
-                self.password   = match.group(3)
+        config['Cache']['startup_with_cache'] = str(checked)
 
-                return True
-            else:
-                self.animate_progress(0, 100, "Invalid m3u_plus or m3u URL")
+        with open(self.user_data_file, 'w') as config_file:
+            config.write(config_file)
 
-                dlg = QMessageBox(self)
-                dlg.setWindowTitle("Error!")
-                dlg.setText("M3U plus URL is invalid!\nPlease enter valid URL")
-                dlg.exec()
+    def loadDefaultCacheOnStartup(self):
+        #Read userdata config file
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
 
-                return False
-        except Exception as e:
-            print(f"Error extracting credentials: {e}")
-            self.animate_progress(0, 100, "Error extracting credentials")
+        #Check if defined in config. Otherwise set to default
+        if config.has_option('Cache', 'startup_with_cache'):
+            self.startup_with_cache = (config['Cache']['startup_with_cache'] == 'True')
+        else:
+            self.startup_with_cache = True
 
-            return False
+        #Update checkbox to match config
+        self.cache_on_startup_checkbox.setChecked(self.startup_with_cache)
 
-    def set_progress_text(self, text):
-        self.progress_bar.setFormat(text)
-        QtWidgets.qApp.processEvents()
-        # QtWidgets.qApp.sendPostedEvents()
+    def toggleCatalogStore(self, state):
+        checked = bool(state)
 
-    def set_progress_bar(self, val, text):
-        self.progress_bar.setFormat(text)
-        self.progress_bar.setValue(val)
-        QtWidgets.qApp.processEvents()
+        self.catalog_store_enabled = checked
+        self.openCatalogStore()
 
-    def animate_progress(self, start, end, text):
-        self.playlist_progress_animation.stop()
-        self.playlist_progress_animation.setStartValue(start)
-        self.playlist_progress_animation.setEndValue(end)
-        self.set_progress_text(text)
-        self.playlist_progress_animation.start()
-        QtWidgets.qApp.processEvents()
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
 
-    def login(self):
-        # When logging into another server, reset the progress bar
-        self.set_progress_bar(0, "Logging in...")
+        if 'Cache' not in config:
+            config['Cache'] = {}
 
-        #Clear lists
-        for tab_name, list_widget in self.streaming_list_widgets.items():
-            list_widget.clear()
+        config['Cache']['catalog_store'] = str(checked)
 
-        for tab_name, list_widget in self.category_list_widgets.items():
-            list_widget.clear()
+        with open(self.user_data_file, 'w') as config_file:
+            config.write(config_file)
 
-        #Check if login credentials are not empty
+    def loadDefaultCatalogStore(self):
+        #Read userdata config file
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
+
+        #Check if defined in config. Otherwise set to default
+        if config.has_option('Cache', 'catalog_store'):
+            self.catalog_store_enabled = (config['Cache']['catalog_store'] == 'True')
+        else:
+            self.catalog_store_enabled = False
+
+        self.openCatalogStore()
+
+        #Update checkbox to match config
+        self.catalog_store_checkbox.setChecked(self.catalog_store_enabled)
+
+    def openCatalogStore(self):
+        #Each account has its own store, which is known after login
+        store_file      = self.catalog_store_file if self.catalog_store_enabled else ""
+        current_file    = self.catalog_store.file_path if self.catalog_store else ""
+
+        if store_file == current_file:
+            return
+
+        #The store is filled by the fetch worker, so it is only used after the next fetch
+        for stream_type in self.catalog_store_valid.keys():
+            self.catalog_store_valid[stream_type] = False
+
+        self.catalog_store = None
+
+        if not store_file:
+            return
+
+        try:
+            self.catalog_store = CatalogStore(store_file)
+        except Exception as e:
+            self.catalog_store = None
+            print(f"Failed opening catalog store: {e}")
+
+    def toggleBulkEPG(self, state):
+        checked = bool(state)
+
+        self.bulk_epg_enabled = checked
+        self.openEPGStore()
+
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
+
+        if 'EPG' not in config:
+            config['EPG'] = {}
+
+        config['EPG']['bulk'] = str(checked)
+
+        with open(self.user_data_file, 'w') as config_file:
+            config.write(config_file)
+
+    def setEPGRefreshInterval(self, lineedit):
+        try:
+            #Get EPG refresh interval from lineedit
+            value = lineedit.text()
+
+            #If value is invalid
+            if not value or int(value) < 1:
+                raise Exception(f"Value entered is not valid: {value}!")
+
+            self.epg_refresh_hours = int(value)
+
+            #Save EPG refresh interval to userdata
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            if 'EPG' not in config:
+                config['EPG'] = {}
+
+            config['EPG']['refresh_hours'] = value
+
+            with open(self.user_data_file, 'w') as config_file:
+                config.write(config_file)
+
+            self.animate_progress(0, 100, f"Succesfully adjusted setting")
+
+        except Exception as e:
+            self.animate_progress(0, 100, f"Failed setting EPG refresh interval: {e}")
+
+    def loadDefaultBulkEPG(self):
+        try:
+            #Read userdata config file
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            #Check if defined in config. Otherwise set to default
+            if 'EPG' in config:
+                self.bulk_epg_enabled = (config['EPG'].get('bulk', 'False') == 'True')
+
+                if config.has_option('EPG', 'refresh_hours'):
+                    self.epg_refresh_hours = int(config['EPG']['refresh_hours'])
+            else:
+                self.bulk_epg_enabled = False
+
+        except Exception as e:
+            print(f"Failed loading default EPG settings: {e}")
+
+        self.openEPGStore()
+
+        #Update checkbox and lineedit to match config
+        self.bulk_epg_checkbox.setChecked(self.bulk_epg_enabled)
+        self.set_epg_refresh.setText(str(self.epg_refresh_hours))
+
+    def toggleShortEPG(self, state):
+        checked = bool(state)
+
+        self.short_epg_enabled = checked
+
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
+
+        if 'EPG' not in config:
+            config['EPG'] = {}
+
+        config['EPG']['short'] = str(checked)
+
+        with open(self.user_data_file, 'w') as config_file:
+            config.write(config_file)
+
+    def setShortEPGLimit(self, lineedit):
+        try:
+            #Get short EPG limit from lineedit
+            value = lineedit.text()
+
+            #If value is invalid
+            if not value or int(value) < 1:
+                raise Exception(f"Value entered is not valid: {value}!")
+
+            self.short_epg_limit = int(value)
+
+            #Save short EPG limit to userdata
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            if 'EPG' not in config:
+                config['EPG'] = {}
+
+            config['EPG']['short_limit'] = value
+
+            with open(self.user_data_file, 'w') as config_file:
+                config.write(config_file)
+
+            self.animate_progress(0, 100, f"Succesfully adjusted setting")
+
+        except Exception as e:
+            self.animate_progress(0, 100, f"Failed setting short EPG limit: {e}")
+
+    def togglePosterGrid(self, state):
+        checked = bool(state)
+
+        self.poster_grid_enabled = checked
+
+        self.update_poster_grid('Movies')
+        self.update_poster_grid('Series')
+
+        config = configparser.ConfigParser()
+        config.read(self.user_data_file)
+
+        if 'View' not in config:
+            config['View'] = {}
+
+        config['View']['poster_grid'] = str(checked)
+
+        with open(self.user_data_file, 'w') as config_file:
+            config.write(config_file)
+
+    def loadDefaultPosterGrid(self):
+        try:
+            #Read userdata config file
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            #Check if defined in config. Otherwise set to default
+            if 'View' in config:
+                self.poster_grid_enabled = (config['View'].get('poster_grid', 'False') == 'True')
+            else:
+                self.poster_grid_enabled = False
+
+        except Exception as e:
+            print(f"Failed loading default poster grid setting: {e}")
+
+        #Update checkbox to match config
+        self.poster_grid_checkbox.setChecked(self.poster_grid_enabled)
+
+        self.update_poster_grid('Movies')
+        self.update_poster_grid('Series')
+
+    def loadDefaultShortEPG(self):
+        try:
+            #Read userdata config file
+            config = configparser.ConfigParser()
+            config.read(self.user_data_file)
+
+            #Check if defined in config. Otherwise set to default
+            if 'EPG' in config:
+                self.short_epg_enabled = (config['EPG'].get('short', 'True') == 'True')
+
+                if config.has_option('EPG', 'short_limit'):
+                    self.short_epg_limit = int(config['EPG']['short_limit'])
+            else:
+                self.short_epg_enabled = True
+
+        except Exception as e:
+            print(f"Failed loading default short EPG settings: {e}")
+
+        #Update checkbox and lineedit to match config
+        self.short_epg_checkbox.setChecked(self.short_epg_enabled)
+        self.set_short_epg_limit.setText(str(self.short_epg_limit))
+
+    def openEPGStore(self):
+        #Each account has its own EPG store, which is known after login
+        store_file      = self.epg_store_file if self.bulk_epg_enabled else ""
+        current_file    = self.epg_store.file_path if self.epg_store else ""
+
+        if store_file != current_file:
+            self.epg_store = None
+
+            #Remove now and next programmes of the previous store
+            self.now_next_index = None
+            self.refresh_now_next()
+
+            if store_file:
+                try:
+                    self.epg_store = EPGStore(store_file)
+                except Exception as e:
+                    self.epg_store = None
+                    print(f"Failed opening EPG store: {e}")
+
+        #Download guide if the store is new or outdated
+        self.check_epg_guide()
+
+    def check_epg_guide(self):
+        if not self.epg_store or self.epg_guide_loading or not self.server:
+            return
+
+        try:
+            #Guide must be of the current account and not older than the refresh interval
+            if (self.epg_store.getAccount() == f"{self.server}|{self.username}" and
+                    time.time() - self.epg_store.getUpdated() < self.epg_refresh_hours * 3600):
+                #Show now and next programmes of the guide downloaded before
+                if self.now_next_index is None:
+                    self.build_now_next_index()
+                return
+
+        except Exception as e:
+            print(f"Failed checking EPG store: {e}")
+
+        self.epg_guide_loading = True
+
+        epg_guide_worker = EPGGuideWorker(self.server, self.username, self.password, self.epg_store, self)
+        epg_guide_worker.signals.finished.connect(self.process_epg_guide)
+        epg_guide_worker.signals.error.connect(self.on_epg_guide_error)
+        self.epg_threadpool.start(epg_guide_worker)
+
+    def process_epg_guide(self, num_of_programmes):
+        self.epg_guide_loading = False
+
+        #Index now and next programmes of the new guide
+        self.build_now_next_index()
+
+        #Check again in case the account has changed while downloading
+        self.check_epg_guide()
+
+    def on_epg_guide_error(self, error_msg):
+        #Try again at the next check
+        self.epg_guide_loading = False
+
+    def build_now_next_index(self):
+        if not self.epg_store or self.now_next_loading:
+            return
+
+        self.now_next_loading = True
+
+        now_next_worker = NowNextWorker(self.epg_store, f"{self.server}|{self.username}", self)
+        now_next_worker.signals.finished.connect(self.process_now_next_index)
+        now_next_worker.signals.error.connect(self.on_now_next_error)
+        self.epg_threadpool.start(now_next_worker)
+
+    def process_now_next_index(self, account_key, now_next_index):
+        self.now_next_loading = False
+
+        #Drop index if the account or EPG store has changed while it was built
+        if not self.epg_store or account_key != f"{self.server}|{self.username}":
+            return
+
+        self.now_next_index = now_next_index
+        self.refresh_now_next()
+
+    def on_now_next_error(self, error_msg):
+        self.now_next_loading = False
+
+    def refresh_now_next(self):
+        live_model = self.streaming_list_widgets['LIVE'].model()
+
+        if not self.now_next_index:
+            self.now_next_timer.stop()
+            live_model.setDetailFunc(None)
+            return
+
+        current_time = int(time.time())
+
+        #Index the next programmes before the indexed programmes run out
+        if current_time >= self.now_next_index.valid_until - NOW_NEXT_REBUILD_MARGIN:
+            self.build_now_next_index()
+
+        #Look up the programmes of all channels at once, the list only shows the texts
+        now_next_texts = {}
+        for channel, (now_title, next_title) in self.now_next_index.getAllNowNext(current_time).items():
+            if now_title or next_title:
+                now_next_texts[channel] = f"{now_title or '-'}  |  Next: {next_title or '-'}"
+
+        live_model.setDetailFunc(lambda entry: now_next_texts.get(entry.get('epg_channel_id')))
+
+        #Refresh again when the next programme starts or stops
+        next_change = self.now_next_index.getNextChange(current_time)
+        if next_change is None:
+            next_change = self.now_next_index.valid_until
+
+        self.now_next_timer.start(max(1, next_change - current_time) * 1000)
+
+    def open_m3u_plus_dialog(self):
+        text, ok = QtWidgets.QInputDialog.getText(self, 'M3u_plus Login', 'Enter m3u_plus URL:')
+        if ok and text:
+            m3u_plus_url = text.strip()
+            self.extract_credentials_from_m3u_plus_url(m3u_plus_url)
+            self.login()
+
+    def update_font_size(self, value):
+        self.default_font_size = value
+        for tab_name, list_widget in self.streaming_list_widgets.items():
+            font = list_widget.font()
+            font.setPointSize(value)
+            list_widget.setFont(font)
+
+        font = QFont()
+        font.setPointSize(value)
+        self.iptv_info_text.setFont(font)
+
+    def extract_credentials_from_m3u_plus_url(self, url):
+        try:
+            pattern = r'(http[s]?://[^/]+)/get\.php\?username=([^&]*)&password=([^&]*)&type=(m3u_plus|m3u|&output=m3u8)'
+            match = re.match(pattern, url)
+            if match:
+                self.server     = match.group(1)
+                self.username   = match.group(2)
+                self.password   = match.group(3)
+
+                return True
+            else:
+                self.animate_progress(0, 100, "Invalid m3u_plus or m3u URL")
+
+                dlg = QMessageBox(self)
+                dlg.setWindowTitle("Error!")
+                dlg.setText("M3U plus URL is invalid!\nPlease enter valid URL")
+                dlg.exec()
+
+                return False
+        except Exception as e:
+            print(f"Error extracting credentials: {e}")
+            self.animate_progress(0, 100, "Error extracting credentials")
+
+            return False
+
+    def set_progress_text(self, text):
+        self.progress_bar.setFormat(text)
+        QtWidgets.qApp.processEvents()
+        # QtWidgets.qApp.sendPostedEvents()
+
+    def set_progress_bar(self, val, text):
+        self.progress_bar.setFormat(text)
+        self.progress_bar.setValue(val)
+        QtWidgets.qApp.processEvents()
+
+    def animate_progress(self, start, end, text):
+        self.playlist_progress_animation.stop()
+        self.playlist_progress_animation.setStartValue(start)
+        self.playlist_progress_animation.setEndValue(end)
+        self.set_progress_text(text)
+        self.playlist_progress_animation.start()
+        QtWidgets.qApp.processEvents()
+
+    def login(self):
+        # When logging into another server, reset the progress bar
+        self.set_progress_bar(0, "Logging in...")
+
+        #Clear lists
+        for tab_name, list_widget in self.streaming_list_widgets.items():
+            list_widget.clear()
+
+        for tab_name, list_widget in self.category_list_widgets.items():
+            list_widget.clear()
+
+        #Check if login credentials are not empty
         if not self.server or not self.username or not self.password:
             dlg = QMessageBox(self)
             dlg.setWindowTitle("Error!")
@@ -1274,28 +2076,384 @@ class IPTVPlayerApp(QMainWindow):
 
             return
 
-        #Start IPTV data fetch thread
-        self.fetch_data_thread()
+        #Use the cache files of this account
+        self.setAccountCacheFiles()
+
+        #Start IPTV data fetch thread
+        self.fetch_data_thread()
+
+        self.set_progress_bar(0, "Going to fetch data...")
+
+    def setAccountCacheFiles(self):
+        self.cache_name         = get_account_cache_name(self.server, self.username)
+        self.cache_file         = path.join(self.cache_dir, f"{self.cache_name}.cache")
+        self.catalog_store_file = path.join(self.cache_dir, f"{self.cache_name}.db")
+        self.epg_store_file     = path.join(self.cache_dir, f"{self.cache_name}.epg.db")
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            #Mark cache of this account as recently used, so it is evicted last
+            touch_account_cache(self.cache_dir, self.cache_name)
+        except Exception as e:
+            print(f"Failed preparing cache folder: {e}")
+
+        #Switch catalog and EPG store to the stores of this account
+        self.openCatalogStore()
+        self.openEPGStore()
+
+        #EPG data cached for this account
+        try:
+            self.epg_cache = EPGCache(path.join(self.cache_dir, f"{self.cache_name}.epgcache.db"))
+        except Exception as e:
+            self.epg_cache = EPGCache()
+            print(f"Failed opening EPG cache: {e}")
+
+        #Movie and series info cached for this account
+        try:
+            self.info_cache = InfoCache(path.join(self.cache_dir, f"{self.cache_name}.infocache.db"))
+        except Exception as e:
+            self.info_cache = InfoCache()
+            print(f"Failed opening info cache: {e}")
+
+        self.info_requests = {}
+
+    def fetch_data_thread(self):
+        dataWorker = FetchDataWorker(self.server, self.username, self.password, self.live_url_format, self.movie_url_format, self.series_url_format, self, self.vods_enabled, self.parallel_fetch_enabled, self.startup_with_cache)
+        dataWorker.signals.cache_loaded.connect(self.process_cached_data)
+        dataWorker.signals.finished.connect(self.process_fetched_data)
+        dataWorker.signals.error.connect(self.on_fetch_data_error)
+        dataWorker.signals.progress_bar.connect(self.animate_progress)
+        dataWorker.signals.ingest_progress.connect(self.process_ingest_progress)
+        dataWorker.signals.show_error_msg.connect(self.show_error_msg)
+        dataWorker.signals.show_info_msg.connect(self.show_info_msg)
+
+        #Remember current worker, so data of a previous login is ignored
+        self.data_worker_signals = dataWorker.signals
+        self.showing_cached_data = False
+
+        self.background_threadpool.start(dataWorker)
+
+    def process_ingest_progress(self, section_name, num_of_entries):
+        #Ignore progress of a previous login
+        if self.sender() is not self.data_worker_signals:
+            return
+
+        self.set_progress_text(f"Receiving {section_name}: {num_of_entries} items")
+
+    def process_cached_data(self, iptv_info, categories_per_stream_type, entries_per_stream_type):
+        #Ignore data from a previous login
+        if self.sender() is not self.data_worker_signals:
+            return
+
+        self.showing_cached_data = True
+
+        self.process_data(iptv_info, categories_per_stream_type, entries_per_stream_type)
+
+    def process_fetched_data(self, iptv_info, categories_per_stream_type, entries_per_stream_type, changes):
+        #Ignore data from a previous login
+        if self.sender() is not self.data_worker_signals:
+            return
+
+        #If cached data is shown, only update what has changed
+        if self.showing_cached_data:
+            self.apply_refreshed_data(iptv_info, categories_per_stream_type, entries_per_stream_type, changes)
+        else:
+            self.process_data(iptv_info, categories_per_stream_type, entries_per_stream_type)
+
+    def process_data(self, iptv_info, categories_per_stream_type, entries_per_stream_type):
+        print("Going to process IPTV data now")
+
+        self.categories_per_stream_type = categories_per_stream_type
+        self.entries_per_stream_type    = entries_per_stream_type
+
+        self.set_progress_bar(0, "Processing received data...")
+
+        #Process IPTV info
+        self.process_iptv_info(iptv_info)
+
+        #Process categories and entries
+        for stream_type in self.entries_per_stream_type.keys():
+            #Clear category and streaming list
+            self.category_list_widgets[stream_type].clear()
+            self.streaming_list_widgets[stream_type].clear()
+            self.prev_clicked_category_item[stream_type] = 0
+
+            #Index entries per category
+            self.catalog_indexes[stream_type] = CatalogIndex(stream_type, self.entries_per_stream_type[stream_type])
+
+            #Skip VODs if option enabled
+            if self.vods_enabled is False and (stream_type == 'Movies' or stream_type == 'Series'):
+                continue
+
+            #Check if the catalog store can be used for this data
+            self.catalog_store_valid[stream_type] = self.check_catalog_store(stream_type)
+
+            #Fill currently loaded streams with all streams
+            self.currently_loaded_streams[stream_type] = list(range(len(self.entries_per_stream_type[stream_type])))
+            self.currently_loaded_filters[stream_type] = {}
+
+            #Add categories and streams in the lists
+            self.load_category_list(stream_type)
+            self.load_streaming_list(stream_type)
+
+            self.build_list_indexes(stream_type)
+
+        self.set_progress_bar(100, f"Finished loading")
+        QtWidgets.qApp.processEvents()
+
+        http_stats = Threadpools.HTTP_CLIENT.getStats()
+        print(f"HTTP connections: {http_stats['new_connections']} new, {http_stats['reused_connections']} reused for {http_stats['requests']} requests")
+
+    def apply_refreshed_data(self, iptv_info, categories_per_stream_type, entries_per_stream_type, changes):
+        print("Going to apply refreshed IPTV data now")
+
+        self.showing_cached_data = False
+
+        #Only replace IPTV info if the IPTV provider responded
+        if iptv_info:
+            self.process_iptv_info(iptv_info)
+
+        for stream_type in entries_per_stream_type.keys():
+            #Skip VODs if option enabled
+            if self.vods_enabled is False and (stream_type == 'Movies' or stream_type == 'Series'):
+                continue
+
+            #Use the changes found by the fetch worker, or compare the data if they are unknown
+            change = changes.get(stream_type)
+            if change:
+                unchanged = not change['categories_changed'] and not change['entries_changed']
+            else:
+                unchanged = (categories_per_stream_type[stream_type] == self.categories_per_stream_type.get(stream_type) and
+                    entries_per_stream_type[stream_type] == self.entries_per_stream_type.get(stream_type))
+
+            #Skip stream types that haven't changed
+            if unchanged:
+                #The catalog store contains the same data
+                self.catalog_store_valid[stream_type] = self.check_catalog_store(stream_type)
+                continue
+
+            self.categories_per_stream_type[stream_type]    = categories_per_stream_type[stream_type]
+            self.entries_per_stream_type[stream_type]       = entries_per_stream_type[stream_type]
+            self.catalog_indexes[stream_type]               = CatalogIndex(stream_type, entries_per_stream_type[stream_type])
+
+            self.catalog_store_valid[stream_type] = self.check_catalog_store(stream_type)
+
+            print(f"Refreshing {stream_type} lists")
+
+            #Keep the category list as it is if only the streams have changed
+            self.refresh_lists(stream_type, reload_categories=not (change and not change['categories_changed']))
+
+            self.build_list_indexes(stream_type)
+
+        self.animate_progress(0, 100, "Refreshed IPTV data")
+
+    def refresh_lists(self, stream_type, reload_categories=True):
+        category_list   = self.category_list_widgets[stream_type]
+        streaming_list  = self.streaming_list_widgets[stream_type]
+
+        #Remember what the user is currently looking at
+        selected_category       = category_list.currentItem()
+        selected_category_text  = selected_category.text() if selected_category else None
+        selected_stream         = streaming_list.currentItem()
+        selected_stream_data    = selected_stream.data(Qt.UserRole) if selected_stream else None
+        category_scroll_pos     = category_list.verticalScrollBar().value()
+        streaming_scroll_pos    = streaming_list.verticalScrollBar().value()
+
+        if reload_categories:
+            #Reload category list and select the previously selected category again
+            self.load_category_list(stream_type)
+            self.prev_clicked_category_item[stream_type] = 0
+
+            selected_category = None
+            if selected_category_text:
+                matches = category_list.findItems(selected_category_text, Qt.MatchExactly)
+                if matches:
+                    selected_category = matches[0]
+                    category_list.setCurrentItem(selected_category)
+                    self.prev_clicked_category_item[stream_type] = selected_category
+
+            category_list.verticalScrollBar().setValue(category_scroll_pos)
+
+        #Get the streams of the selected category, or all streams if it doesn't exist anymore
+        if selected_category and isinstance(selected_category.data(Qt.UserRole), dict):
+            self.currently_loaded_streams[stream_type] = self.get_category_positions(stream_type, selected_category.text(), selected_category.data(Qt.UserRole))
+        else:
+            self.currently_loaded_streams[stream_type] = list(range(len(self.entries_per_stream_type[stream_type])))
+            self.currently_loaded_filters[stream_type] = {}
+
+        #Don't touch seasons or episodes list. The refreshed series are shown when going back.
+        if stream_type == 'Series' and self.series_navigation_level != 0:
+            return
+
+        #Reload streaming list and apply search again
+        search_text = self.currently_applied_search['streaming'][stream_type]
+        if search_text:
+            self.search_in_list('streaming', stream_type, search_text)
+        else:
+            self.load_streaming_list(stream_type)
 
-        self.set_progress_bar(0, "Going to fetch data...")
+        #Select the previously selected stream again
+        if isinstance(selected_stream_data, dict):
+            id_key  = 'series_id' if stream_type == 'Series' else 'stream_id'
+            row     = streaming_list.model().findRow(lambda entry: isinstance(entry, dict) and entry.get(id_key) == selected_stream_data.get(id_key))
 
-    def fetch_data_thread(self):
-        dataWorker = FetchDataWorker(self.server, self.username, self.password, self.live_url_format, self.movie_url_format, self.series_url_format, self, self.vods_enabled)
-        dataWorker.signals.finished.connect(self.process_data)
-        dataWorker.signals.error.connect(self.on_fetch_data_error)
-        dataWorker.signals.progress_bar.connect(self.animate_progress)
-        dataWorker.signals.show_error_msg.connect(self.show_error_msg)
-        dataWorker.signals.show_info_msg.connect(self.show_info_msg)
-        self.threadpool.start(dataWorker)
+            if row >= 0:
+                streaming_list.setCurrentRow(row)
 
-    def process_data(self, iptv_info, categories_per_stream_type, entries_per_stream_type):
-        print("Going to process IPTV data now")
+                #Prevent reloading the item info
+                if self.prev_clicked_streaming_item == selected_stream:
+                    self.prev_clicked_streaming_item = streaming_list.item(row)
 
-        self.categories_per_stream_type = categories_per_stream_type
-        self.entries_per_stream_type    = entries_per_stream_type
+        streaming_list.verticalScrollBar().setValue(streaming_scroll_pos)
 
-        self.set_progress_bar(0, "Processing received data...")
+    def load_category_list(self, stream_type):
+        self.currently_applied_search['category'][stream_type] = ''
+
+        #Get category positions already sorted from the sort index or the catalog store
+        sorted_positions = None
+        if self.sorting_enabled:
+            sort_index = self.get_sort_index(stream_type, 'category')
+            if sort_index is not None:
+                sorted_positions = sort_index.sortPositions(range(len(sort_index)), self.sorting_order)
+            else:
+                sorted_positions = self.query_catalog_store(stream_type, 'category', sort_order=self.sorting_order)
+
+        #The list only creates the visible rows, so all categories are set at once
+        category_model = self.category_list_widgets[stream_type].model()
+        category_model.setRows(self.categories_per_stream_type[stream_type], sorted_positions, get_category_name, header_rows=self.getSpecialCategoryRows(),
+            count_func=lambda category: self.get_category_count(stream_type, category))
+
+        if sorted_positions is None:
+            #Sort category list
+            self.sortList(self.category_search_bars[stream_type], 'category', stream_type, self.category_list_widgets, self.sorting_enabled, self.sorting_order)
+
+    def load_streaming_list(self, stream_type):
+        self.currently_applied_search['streaming'][stream_type] = ''
+
+        #Get stream positions already sorted from the sort index or the catalog store
+        sorted_positions = None
+        if self.sorting_enabled:
+            sort_index = self.get_sort_index(stream_type, 'streaming')
+            if sort_index is not None:
+                sorted_positions = sort_index.sortPositions(self.currently_loaded_streams[stream_type], self.sorting_order)
+            else:
+                sorted_positions = self.query_catalog_store(stream_type, 'streaming', sort_order=self.sorting_order, **self.currently_loaded_filters[stream_type])
+
+        positions = sorted_positions if sorted_positions is not None else self.currently_loaded_streams[stream_type]
+
+        self.update_poster_grid(stream_type)
+
+        #The list only creates the visible rows, so all streams are set at once
+        streaming_model = self.streaming_list_widgets[stream_type].model()
+        streaming_model.setRows(self.entries_per_stream_type[stream_type], positions, placeholder="No items in list...")
+
+        if sorted_positions is None and positions:
+            #Sort streaming list
+            self.sortList(self.streaming_search_bars[stream_type], 'streaming', stream_type, self.streaming_list_widgets, self.sorting_enabled, self.sorting_order)
+
+    def get_category_positions(self, stream_type, category_text, category_data):
+        catalog_index = self.catalog_indexes[stream_type]
+
+        #Remember the category filter, so searching and sorting can query the catalog store with it
+        if category_text == self.all_categories_text:
+            self.currently_loaded_filters[stream_type] = {}
+            return catalog_index.getAllPositions()
+
+        elif category_text == self.fav_categories_text:
+            self.currently_loaded_filters[stream_type] = {'favorites': True}
+            return catalog_index.getFavoritePositions()
+
+        else:
+            self.currently_loaded_filters[stream_type] = {'category_id': category_data['category_id']}
+            return catalog_index.getCategoryPositions(category_data['category_id'])
+
+    def get_category_count(self, stream_type, category_data):
+        #Number of streams of a category shown behind the category name
+        catalog_index = self.catalog_indexes.get(stream_type)
+        if not catalog_index or not isinstance(category_data, dict):
+            return None
+
+        category_name = category_data.get('category_name')
+        if category_name == self.all_categories_text:
+            return catalog_index.countAll()
+
+        elif category_name == self.fav_categories_text:
+            return catalog_index.countFavorites()
+
+        return catalog_index.countCategory(category_data.get('category_id'))
+
+    def build_list_indexes(self, stream_type):
+        #Search and sort without indexes until the indexes of the new data are built
+        self.search_indexes.pop(stream_type, None)
+        self.sort_indexes.pop(stream_type, None)
+        self.field_columns.pop(stream_type, None)
+
+        list_index_worker = ListIndexWorker(stream_type, self.categories_per_stream_type[stream_type], self.entries_per_stream_type[stream_type])
+        list_index_worker.signals.finished.connect(self.process_list_indexes)
+        self.index_threadpool.start(list_index_worker)
+
+    def process_list_indexes(self, stream_type, categories, entries, search_index, sort_index, field_columns):
+        #Drop indexes if the data has been replaced while they were built
+        if categories is not self.categories_per_stream_type.get(stream_type) or entries is not self.entries_per_stream_type.get(stream_type):
+            return
+
+        self.search_indexes[stream_type]    = search_index
+        self.sort_indexes[stream_type]      = sort_index
+        self.field_columns[stream_type]     = field_columns
+
+    def get_sort_index(self, stream_type, list_content_type):
+        sort_index = self.sort_indexes.get(stream_type)
+        return sort_index[list_content_type] if sort_index else None
+
+    def check_catalog_store(self, stream_type):
+        if not self.catalog_store:
+            return False
+
+        try:
+            #Store must be filled with the data of the current account
+            if self.catalog_store.getAccount() != f"{self.server}|{self.username}":
+                return False
+
+            return (self.catalog_store.countCategories(stream_type) == len(self.categories_per_stream_type.get(stream_type, [])) and
+                    self.catalog_store.countStreams(stream_type) == len(self.entries_per_stream_type.get(stream_type, [])))
+
+        except Exception as e:
+            print(f"Failed checking catalog store: {e}")
+            return False
+
+    def query_catalog_store(self, stream_type, list_content_type, **filters):
+        #Returns the positions of the matching categories or streams, or None if the catalog store can't be used
+        if not self.catalog_store or not self.catalog_store_valid.get(stream_type, False):
+            return None
+
+        try:
+            if list_content_type == 'category':
+                rows    = self.catalog_store.queryCategories(stream_type, **filters)
+                source  = self.categories_per_stream_type[stream_type]
+                id_key  = 'category_id'
+            else:
+                rows    = self.catalog_store.queryStreams(stream_type, **filters)
+                source  = self.entries_per_stream_type[stream_type]
+                id_key  = 'series_id' if stream_type == 'Series' else 'stream_id'
+
+            positions = []
+            for position, item_id in rows:
+                #Check if the store still matches the loaded data
+                if position >= len(source) or source[position].get(id_key) != item_id:
+                    print("Catalog store doesn't match loaded data")
+                    self.catalog_store_valid[stream_type] = False
+                    return None
+
+                positions.append(position)
+
+            return positions
+
+        except Exception as e:
+            print(f"Catalog store query failed: {e}")
+            return None
 
+    def process_iptv_info(self, iptv_info):
         #Process IPTV info
         user_info   = iptv_info.get("user_info", {})
         server_info = iptv_info.get("server_info", {})
@@ -1353,83 +2511,83 @@ class IPTVPlayerApp(QMainWindow):
         self.iptv_info_text.setText(formatted_data)
         QtWidgets.qApp.processEvents()
 
-        #Process categories and entries
-        for stream_type in self.entries_per_stream_type.keys():
-            #Clear category and streaming list
-            self.category_list_widgets[stream_type].clear()
-            self.streaming_list_widgets[stream_type].clear()
+    def on_fetch_data_error(self, error_msg):
+        print(f"Error occurred while fetching data: {error_msg}")
+        self.set_progress_bar(100, "Failed fetching data")
 
-            #Skip VODs if option enabled
-            if self.vods_enabled is False and (stream_type == 'Movies' or stream_type == 'Series'):
-                continue
+    def show_error_msg(self, title, msg):
+        QMessageBox.warning(self, title, msg)
 
-            #Fill currently loaded streams with current stream data
-            for entry in self.entries_per_stream_type[stream_type]:
-                self.currently_loaded_streams[stream_type].append(entry)
+    def show_info_msg(self, title, msg):
+        QMessageBox.information(self, title, msg)
 
-            #Fill currently loaded categories with current category data
-            for entry in self.categories_per_stream_type[stream_type]:
-                self.currently_loaded_categories[stream_type].append(entry)
+    def start_detail_request(self, worker, generation):
+        #Newer selections get a higher priority, so the selected item is loaded before all other queued work
+        self.threadpool.start(worker, generation)
 
-            #Add categories in category list
-            num_of_categories = len(self.categories_per_stream_type[stream_type])
-            prev_perc = 0
-            for idx, category_item in enumerate(self.categories_per_stream_type[stream_type]):
-                item = QListWidgetItem(category_item['category_name'])
-                item.setData(Qt.UserRole, category_item)
-                # item.setIcon(channel_icon)
+    def fetch_vod_info(self, vod_id):
+        self.request_info('vod', vod_id, ('Movies', self.detail_requests.getGeneration('Movies')))
 
-                #Add item to list
-                self.category_list_widgets[stream_type].addItem(item)
+    def request_info(self, info_type, item_id, request):
+        #Info shown before is not requested again until it is too old
+        info_data = self.info_cache.get(info_type, item_id)
+        if info_data is not None:
+            self.show_info_data(info_type, info_data, [request])
+            return
 
-                perc = (idx * 100) / num_of_categories
-                if (perc - prev_perc) > 10:
-                    prev_perc = perc
-                    self.set_progress_bar(int(perc), f"Loading {stream_type} categories: {idx} of {num_of_categories}")
-                    QtWidgets.qApp.processEvents()
+        #Single click, double click and going back share the request that is already running
+        requests = self.info_requests.get((info_type, str(item_id)))
+        if requests is not None:
+            requests.append(request)
+            return
 
-            #Sort category list
-            self.sortList(self.category_search_bars[stream_type], 'category', stream_type, self.category_list_widgets, self.sorting_enabled, self.sorting_order)
+        requests = [request]
+        self.info_requests[(info_type, str(item_id))] = requests
 
-            #Add streams in streaming list
-            num_of_entries = len(self.entries_per_stream_type[stream_type])
-            prev_perc = 0
-            for idx, entry in enumerate(self.entries_per_stream_type[stream_type]):
-                item = QListWidgetItem(entry['name'])
-                item.setData(Qt.UserRole, entry)
-                # item.setIcon(channel_icon)
+        if info_type == 'vod':
+            info_fetcher = MovieInfoFetcher(self.server, self.username, self.password, item_id, self, requests)
+        else:
+            info_fetcher = SeriesInfoFetcher(self.server, self.username, self.password, item_id, self, requests)
 
-                self.streaming_list_widgets[stream_type].addItem(item)
+        info_fetcher.signals.finished.connect(self.process_fetched_info)
+        info_fetcher.signals.dropped.connect(self.on_info_request_dropped)
+        info_fetcher.signals.error.connect(self.on_info_request_error)
+        self.start_detail_request(info_fetcher, request[1])
 
-                perc = (idx * 100) / num_of_entries
-                if (perc - prev_perc) > 10:
-                    prev_perc = perc
-                    self.set_progress_bar(int(perc), f"Loading {stream_type} streams: {idx} of {num_of_entries}")
-                    QtWidgets.qApp.processEvents()
+    def process_fetched_info(self, info_type, item_id, info_data):
+        requests = self.info_requests.pop((info_type, str(item_id)), [])
 
-            #Sort streaming list
-            self.sortList(self.streaming_search_bars[stream_type], 'streaming', stream_type, self.streaming_list_widgets, self.sorting_enabled, self.sorting_order)
+        #Empty info is requested again next time
+        if info_data.get('info'):
+            self.info_cache.put(info_type, item_id, info_data)
 
-        self.set_progress_bar(100, f"Finished loading")
-        QtWidgets.qApp.processEvents()
+        self.show_info_data(info_type, info_data, requests)
 
-    def on_fetch_data_error(self, error_msg):
-        print(f"Error occurred while fetching data: {error_msg}")
-        self.set_progress_bar(100, "Failed fetching data")
+    def on_info_request_dropped(self, info_type, item_id):
+        requests = self.info_requests.pop((info_type, str(item_id)), [])
 
-    def show_error_msg(self, title, msg):
-        QMessageBox.warning(self, title, msg)
+        #Requests may have been added just after the fetcher decided to drop them
+        for request in requests:
+            if self.detail_requests.isCurrent(*request):
+                self.request_info(info_type, item_id, request)
 
-    def show_info_msg(self, title, msg):
-        QMessageBox.information(self, title, msg)
+    def on_info_request_error(self, info_type, item_id, error_msg):
+        self.info_requests.pop((info_type, str(item_id)), None)
+        self.on_fetch_data_error(error_msg)
 
-    def fetch_vod_info(self, vod_id):
-        movie_info_fetcher = MovieInfoFetcher(self.server, self.username, self.password, vod_id, self)
-        movie_info_fetcher.signals.finished.connect(self.process_vod_info)
-        movie_info_fetcher.signals.error.connect(self.on_fetch_data_error)
-        self.threadpool.start(movie_info_fetcher)
+    def show_info_data(self, info_type, info_data, requests):
+        #Requests are (request type, generation), requests of items that are no longer selected are ignored
+        for request_type, generation in requests:
+            if info_type == 'vod':
+                self.process_vod_info(info_data.get('info', {}), info_data.get('movie_data', {}), generation)
+            else:
+                self.process_series_info(info_data, request_type == 'Seasons', generation)
+
+    def process_vod_info(self, vod_info, vod_data, generation):
+        #Ignore info of a movie that is no longer selected
+        if not self.detail_requests.isCurrent('Movies', generation):
+            return
 
-    def process_vod_info(self, vod_info, vod_data):
         #Get movie image url
         movie_img_url = vod_info.get('movie_image', 0)
 
@@ -1497,12 +2655,15 @@ class IPTVPlayerApp(QMainWindow):
             self.set_progress_bar(100, "Loaded Movie info")
 
     def fetch_series_info(self, series_id, is_show_request):
-        series_info_fetcher = SeriesInfoFetcher(self.server, self.username, self.password, series_id, is_show_request, self)
-        series_info_fetcher.signals.finished.connect(self.process_series_info)
-        series_info_fetcher.signals.error.connect(self.on_fetch_data_error)
-        self.threadpool.start(series_info_fetcher)
+        #Showing the seasons is not replaced by selecting another series
+        request_type = 'Seasons' if is_show_request else 'Series'
+        self.request_info('series', series_id, (request_type, self.detail_requests.getGeneration(request_type)))
+
+    def process_series_info(self, series_info_data, is_show_request, generation):
+        #Ignore info of a series that is no longer selected, or seasons after going back
+        if not self.detail_requests.isCurrent('Seasons' if is_show_request else 'Series', generation):
+            return
 
-    def process_series_info(self, series_info_data, is_show_request):
         #If no series info data available
         if not series_info_data:
             self.animate_progress(0, 100, "Failed fetching series info")
@@ -1510,33 +2671,17 @@ class IPTVPlayerApp(QMainWindow):
 
         #Check if fetch request came from show_seasons()
         if is_show_request:
-            #Clear series list
-            self.streaming_list_widgets['Series'].clear()
-
-            #Reset scrollbar position to top
-            self.streaming_list_widgets['Series'].scrollToTop()
-
-            #Add go back item
-            go_back_item = QListWidgetItem(self.go_back_text)
-            go_back_item.setIcon(self.go_back_icon)
-            self.streaming_list_widgets['Series'].addItem(go_back_item)
-
-            #Save currently loaded series data for search funcitonality
-            self.currently_loaded_streams['Seasons'] = series_info_data['episodes']
-
-            #Go through each season in the series info data.
+            #Save currently loaded series data for search funcitonality.
             #Note that 'episodes' is called, as this is the name given in the data. 
             #When you look at the data you can see these are actually seasons.
-            for season in series_info_data['episodes'].keys():
-                #Create season item
-                item = QListWidgetItem(f"Season {season}")
+            self.currently_loaded_streams['Seasons'] = series_info_data['episodes']
+            self.search_indexes['Seasons'] = SearchIndex([f"Season {season}" for season in series_info_data['episodes'].keys()])
 
-                #Set season data to item
-                item.setData(Qt.UserRole, series_info_data['episodes'][season])
-                # item.setIcon(channel_icon)
+            #Show seasons with go back item in series list
+            self.load_seasons_list()
 
-                #Add season item to series list
-                self.streaming_list_widgets['Series'].addItem(item)
+            #Reset scrollbar position to top
+            self.streaming_list_widgets['Series'].scrollToTop()
 
             self.animate_progress(0, 100, "Loading finished")
 
@@ -1615,26 +2760,108 @@ class IPTVPlayerApp(QMainWindow):
             else:
                 self.set_progress_bar(100, "Loaded Series info")
 
+    def get_cover_label(self, stream_type):
+        #Returns the cover label of the info box and the width the image is scaled to
+        if stream_type == 'Series':
+            return self.series_info_box.cover, self.series_info_box.maxCoverWidth
+        elif stream_type == 'Movies':
+            return self.movies_info_box.cover, self.movies_info_box.maxCoverWidth
+        elif stream_type == 'Live':
+            return self.live_info_box.cover, self.live_info_box.maxCoverHeight
+
+        return None, 0
+
     def fetch_image(self, img_url, stream_type):
-        image_fetcher = ImageFetcher(img_url, stream_type, self)
+        cover, width = self.get_cover_label(stream_type)
+
+        #Show image right away when it was shown before
+        image = self.image_cache.getImage(img_url, width)
+        if image is None:
+            placeholder = self.image_cache.getNegative(img_url)
+            if placeholder:
+                image = self.get_placeholder_image(placeholder, width)
+
+        if image is not None:
+            if cover:
+                cover.setPixmap(image)
+            self.print_image_cache_stats()
+            return
+
+        generation = self.detail_requests.getGeneration(stream_type)
+
+        image_fetcher = ImageFetcher(img_url, stream_type, width, self, self.image_cache, generation)
         image_fetcher.signals.finished.connect(self.process_image_data)
         image_fetcher.signals.error.connect(self.on_fetch_data_error)
-        self.threadpool.start(image_fetcher)
+        self.start_detail_request(image_fetcher, generation)
 
-    def process_image_data(self, image, stream_type):
+    def process_image_data(self, image, stream_type, img_url, is_placeholder, generation):
         try:
-            if stream_type == 'Series':
-                #Set series image
-                self.series_info_box.cover.setPixmap(image.scaledToWidth(self.series_info_box.maxCoverWidth))
-            elif stream_type == 'Movies':
-                #Set movie image
-                self.movies_info_box.cover.setPixmap(image.scaledToWidth(self.movies_info_box.maxCoverWidth))
-            elif stream_type == 'Live':
-                #Set live tv image
-                self.live_info_box.cover.setPixmap(image.scaledToWidth(self.live_info_box.maxCoverHeight))
+            cover, width = self.get_cover_label(stream_type)
+            if not cover:
+                return
+
+            #Image is already scaled by the image fetcher
+            image = QPixmap.fromImage(image)
+
+            #Keep the scaled image, placeholders are cached by the image fetcher
+            if not is_placeholder:
+                self.image_cache.putImage(img_url, width, image, image.width() * image.height() * image.depth() // 8)
+
+            #Only show the image of the selected item
+            if not self.detail_requests.isCurrent(stream_type, generation):
+                return
+
+            cover.setPixmap(image)
+            self.print_image_cache_stats()
         except Exception as e:
             print(f"Failed processing image: {e}")
 
+    def get_placeholder_image(self, img_path, width):
+        image = self.placeholder_images.get((img_path, width))
+        if image is None:
+            image = QPixmap(img_path).scaledToWidth(width, Qt.SmoothTransformation)
+            self.placeholder_images[(img_path, width)] = image
+
+        return image
+
+    def get_poster_url(self, entry):
+        #Poster of a movie or series, seasons and episodes have none
+        if not isinstance(entry, dict):
+            return None
+
+        return entry.get('stream_icon') or entry.get('cover')
+
+    def get_poster_thumbnail(self, entry):
+        return self.thumbnail_loader.getThumbnail(self.get_poster_url(entry))
+
+    def update_poster_grid(self, stream_type):
+        if stream_type not in ('Movies', 'Series'):
+            return
+
+        #Seasons and episodes are always shown as a list
+        enabled = self.poster_grid_enabled and not (stream_type == 'Series' and self.series_navigation_level > 0)
+
+        streaming_list = self.streaming_list_widgets[stream_type]
+        if streaming_list.poster_mode == enabled:
+            return
+
+        streaming_list.setPosterMode(enabled)
+        streaming_list.model().setDecorationFunc(self.get_poster_thumbnail if enabled else None)
+
+    def load_visible_thumbnails(self, stream_type, first_row, last_row):
+        streaming_list = self.streaming_list_widgets[stream_type]
+        if streaming_list.poster_mode:
+            self.thumbnail_loader.loadRows(streaming_list, first_row, last_row, self.get_poster_url)
+
+    def print_image_cache_stats(self):
+        image_stats = self.image_cache.getStats()
+        if not image_stats['lookups'] or image_stats['lookups'] % IMAGE_CACHE_STATS_INTERVAL:
+            return
+
+        print(f"Image cache: {image_stats['hit_rate']:.0%} hits of {image_stats['lookups']} images "
+            f"({image_stats['memory']} memory, {image_stats['disk']} disk, {image_stats['negative']} not found, {image_stats['miss']} downloaded), "
+            f"{image_stats['memory_used'] / 1e6:.1f} MB in memory, {image_stats['disk_used'] / 1e6:.1f} MB on disk")
+
     def favButtonPressed(self, stream_type, info_box):
         try:
             #Get current selected item and stream id
@@ -1663,18 +2890,23 @@ class IPTVPlayerApp(QMainWindow):
 
             is_fav = False
 
-            #loop through all streaming entries
-            for idx, entry in enumerate(self.entries_per_stream_type[stream_type]):
-                #Match to current data streaming id
-                if entry['stream_id' if not (stream_type == "Series") else 'series_id'] == stream_id:
-                    #Check if item is favorite
-                    is_fav = self.entries_per_stream_type[stream_type][idx].get('favorite', False)
+            #Find entries with this streaming id with the catalog index
+            entries = self.entries_per_stream_type[stream_type]
+            matching_positions = self.catalog_indexes[stream_type].getItemPositions(stream_id)
 
-                    #toggle favorite
-                    is_fav = not is_fav
+            for entry in (entries[idx] for idx in matching_positions):
+                #toggle favorite
+                is_fav = not entry.get('favorite', False)
 
-                    #Set favorite parameter
-                    self.entries_per_stream_type[stream_type][idx]['favorite'] = is_fav
+                #Set favorite parameter
+                entry['favorite'] = is_fav
+
+            #Update favorite in catalog index and store
+            self.catalog_indexes[stream_type].setFavorite(stream_id, is_fav)
+            self.category_list_widgets[stream_type].model().refreshCounts()
+
+            if self.catalog_store_valid[stream_type]:
+                self.catalog_store.setFavorite(stream_type, stream_id, is_fav)
 
             #Change fav button colour
             info_box.setFavorite(is_fav)
@@ -1685,18 +2917,10 @@ class IPTVPlayerApp(QMainWindow):
             #Set data to currently selected item
             current_sel_item.setData(Qt.UserRole, data)
 
-            fav_data = {}
-
-            #Read favorites data file
+            #Read favorites data file, or the last good snapshot if it is damaged
             # fav_file_path = path.join(path.dirname(path.abspath(__file__)), self.favorites_file)
             # fav_file_path = path.join(path.dirname(path.abspath(__file__)), "favorites.json")
-
-            #Check if cache file exists
-            if path.isfile(self.favorites_file):
-                print("favorite file found")
-                # with open(self.favorites_file, 'r') as fav_file:
-                with open(self.favorites_file, 'r') as fav_file:
-                    fav_data = json.load(fav_file)
+            fav_data = load_json_file(self.favorites_file, {})
 
             if is_fav:
                 #Check if stream ids exists in file
@@ -1710,9 +2934,8 @@ class IPTVPlayerApp(QMainWindow):
                 if fav_data.get('stream_ids' if not (stream_type == "Series") else 'series_ids', 0):
                     fav_data['stream_ids' if not (stream_type == "Series") else 'series_ids'].remove(stream_id)
 
-            # with open(self.favorites_file, 'w') as fav_file:
-            with open(self.favorites_file, 'w') as fav_file:
-                json.dump(fav_data, fav_file, indent=4)
+            #Write favorites to a temporary file first, so a crash can't leave a half written file
+            write_json_file(self.favorites_file, fav_data)
 
         except Exception as e:
             self.animate_progress(0, 100, "Failed adding to favorites")
@@ -1745,57 +2968,20 @@ class IPTVPlayerApp(QMainWindow):
             selected_item_text = selected_item.text()
             selected_item_data = selected_item.data(Qt.UserRole)
 
-            #Check if All and Favorites category are not selected
-            if (selected_item_text != self.all_categories_text and selected_item_text != self.fav_categories_text):
-                category_id = selected_item_data['category_id']
-
             self.set_progress_bar(0, "Loading items")
 
             if stream_type == 'Series':
                 #Reset navigation level
                 self.series_navigation_level = 0
 
-            #Clear items in list
-            self.streaming_list_widgets[stream_type].clear()
-            self.currently_loaded_streams[stream_type].clear()
+            #Get streams in selected category
+            self.currently_loaded_streams[stream_type] = self.get_category_positions(stream_type, selected_item_text, selected_item_data)
 
             #Reset scrollbar position to top
             self.streaming_list_widgets[stream_type].scrollToTop()
 
-            for entry in self.entries_per_stream_type[stream_type]:
-                # print(entry)
-                if selected_item_text == self.all_categories_text:
-                    item = QListWidgetItem(entry['name'])
-                    item.setData(Qt.UserRole, entry)
-
-                    self.currently_loaded_streams[stream_type].append(entry)
-                    self.streaming_list_widgets[stream_type].addItem(item)
-
-                elif selected_item_text == self.fav_categories_text:
-                    #Check if item is favorite
-                    if entry['favorite'] == True:
-                        item = QListWidgetItem(entry['name'])
-                        item.setData(Qt.UserRole, entry)
-
-                        self.currently_loaded_streams[stream_type].append(entry)
-                        self.streaming_list_widgets[stream_type].addItem(item)
-
-                elif entry['category_id'] == category_id:
-                    item = QListWidgetItem(entry['name'])
-                    item.setData(Qt.UserRole, entry)
-
-                    self.currently_loaded_streams[stream_type].append(entry)
-                    self.streaming_list_widgets[stream_type].addItem(item)
-
-            #Check if list is empty after process
-            if self.streaming_list_widgets[stream_type].count() == 0:
-                #Add list is empty text
-                item = QListWidgetItem("No items in list...")
-
-                self.streaming_list_widgets[stream_type].addItem(item)
-            else:
-                #Sort list
-                self.sortList(self.streaming_search_bars[stream_type], 'streaming', stream_type, self.streaming_list_widgets, self.sorting_enabled, self.sorting_order)
+            #Add streams in streaming list
+            self.load_streaming_list(stream_type)
 
             self.animate_progress(0, 100, "Loading finished")
 
@@ -1804,10 +2990,12 @@ class IPTVPlayerApp(QMainWindow):
 
     def startOnlineWorker(self, stream_id, url):
         #Create Stream Status thread worker that will determine if stream looks online or not
-        online_worker = OnlineWorker(stream_id, url, self)
+        generation = self.detail_requests.getGeneration('Live')
+
+        online_worker = OnlineWorker(stream_id, url, self, generation)
         online_worker.signals.finished.connect(self.ProcessStreamStatus)
         online_worker.signals.error.connect(self.onProcessStreamStatusError)
-        self.threadpool.start(online_worker)
+        self.start_detail_request(online_worker, generation)
 
     def onProcessStreamStatusError(self, error_msg):
         print(f"Failed processing streaming status: {error_msg}")
@@ -1831,19 +3019,65 @@ class IPTVPlayerApp(QMainWindow):
         except Exception as e:
             print(f"Failed processing streaming status: {e}")
 
-    def startEPGWorker(self, stream_id):
+    def get_local_epg(self, epg_channel_id):
+        #Returns the EPG data of a channel from the downloaded guide, or None if it is not in the guide
+        if not self.epg_store or not epg_channel_id:
+            return None
+
+        try:
+            if self.epg_store.getAccount() != f"{self.server}|{self.username}":
+                return None
+
+            return self.epg_store.getChannelEPG(epg_channel_id) or None
+
+        except Exception as e:
+            print(f"Failed reading EPG store: {e}")
+            return None
+
+    def startEPGWorker(self, stream_id, epg_channel_id=None):
+        #Remember the channel, so EPG data of previously clicked channels is only cached and not shown
+        self.epg_stream_id = stream_id
+
+        #Show EPG of the downloaded guide without requesting it
+        epg_data = self.get_local_epg(epg_channel_id)
+        if epg_data is not None:
+            self.ProcessEPGData(epg_data)
+            return
+
+        #Show cached EPG data right away. It is only requested again when the programme that was on has ended.
+        cached = self.epg_cache.get(stream_id)
+        if cached is not None:
+            programmes, up_to_date = cached
+            self.ProcessEPGData(make_epg_entries(programmes))
+
+            if up_to_date:
+                return
+
         #Create EPG thread worker that will fetch EPG data
-        epg_worker = EPGWorker(self.server, self.username, self.password, stream_id, self)
+        generation = self.detail_requests.getGeneration('Live')
+        epg_worker = EPGWorker(self.server, self.username, self.password, stream_id, self, self.short_epg_limit if self.short_epg_enabled else None, generation)
 
         #Connect functions to signals
-        epg_worker.signals.finished.connect(self.ProcessEPGData)
+        epg_worker.signals.finished.connect(self.process_fetched_epg)
         epg_worker.signals.error.connect(self.onEPGFetchError)
 
         #Start EPG thread
-        self.threadpool.start(epg_worker)
+        self.start_detail_request(epg_worker, generation)
 
-    def onEPGFetchError(self, error_msg):
+    def process_fetched_epg(self, stream_id, programmes):
+        self.epg_cache.put(stream_id, programmes)
+
+        #Only show EPG data of the channel that is selected
+        if stream_id == self.epg_stream_id:
+            self.ProcessEPGData(make_epg_entries(programmes))
+
+    def onEPGFetchError(self, stream_id, error_msg):
         print(f"Failed fetching EPG data: {error_msg}")
+
+        #Keep showing the cached EPG data, or the EPG data of the selected channel
+        if stream_id != self.epg_stream_id or self.epg_cache.get(stream_id) is not None:
+            return
+
         self.set_progress_bar(100, "Failed loading EPG data")
 
         #Set list view
@@ -1867,13 +3101,13 @@ class IPTVPlayerApp(QMainWindow):
                 self.set_progress_bar(100, "No EPG data")
                 return
 
-            #Get current time
-            current_timestamp = time.mktime(datetime.now().timetuple())
+            #Programmes are sorted by time, so the first programme that hasn't ended is found with a binary search
+            first_idx = bisect.bisect_left(epg_data, datetime.now(), key=lambda epg_entry: epg_entry['stop_time'])
 
             items = []
 
-            #Loop through EPG data
-            for epg_entry in epg_data:
+            #Loop through EPG data of the programmes that haven't ended
+            for epg_entry in epg_data[first_idx:]:
                 #Get EPG data
                 start_timestamp = epg_entry['start_time']
                 stop_timestamp  = epg_entry['stop_time']
@@ -1885,25 +3119,18 @@ class IPTVPlayerApp(QMainWindow):
                 start_time = start_timestamp.strftime("%H:%M")
                 stop_time = stop_timestamp.strftime("%H:%M")
 
-                #Convert stop time to unix timebase so it can be used for calculating
-                unix_stop_time = time.mktime(stop_timestamp.timetuple())
-
-                #Compute time difference
-                time_diff = unix_stop_time - current_timestamp
+                #Create EPG item
+                item    = QTreeWidgetItem([date, start_time, stop_time, program_name])
+                label   = QLabel(description)
+                label.setWordWrap(True)
+                desc    = QTreeWidgetItem()
+                item.addChild(desc)
 
-                if time_diff >= 0:
-                    #Create EPG item
-                    item    = QTreeWidgetItem([date, start_time, stop_time, program_name])
-                    label   = QLabel(description)
-                    label.setWordWrap(True)
-                    desc    = QTreeWidgetItem()
-                    item.addChild(desc)
+                #Add label widget to description. This way it is word wrapped correctly
+                self.live_info_box.live_EPG_info.setItemWidget(desc, 3, label)
 
-                    #Add label widget to description. This way it is word wrapped correctly
-                    self.live_info_box.live_EPG_info.setItemWidget(desc, 3, label)
-
-                    #Append item to list
-                    items.append(item)
+                #Append item to list
+                items.append(item)
 
             #Add all items to EPG treeview
             self.live_info_box.live_EPG_info.addTopLevelItems(items)
@@ -1954,6 +3181,9 @@ class IPTVPlayerApp(QMainWindow):
             if 'live' in stream_type:
                 self.set_progress_bar(0, "Loading EPG data")
 
+                #Drop requests of the previously selected channel
+                self.detail_requests.newGeneration('Live')
+
                 #Set favorite button according to favorite value
                 self.live_info_box.setFavorite(is_fav)
 
@@ -1975,17 +3205,20 @@ class IPTVPlayerApp(QMainWindow):
                 self.startOnlineWorker(clicked_item_data['stream_id'], clicked_item_data['url'])
 
                 #Fetch EPG data
-                self.startEPGWorker(clicked_item_data['stream_id'])
+                self.startEPGWorker(clicked_item_data['stream_id'], clicked_item_data.get('epg_channel_id'))
 
             #Show movie info if movie clicked
             elif 'movie' in stream_type:
                 self.set_progress_bar(0, "Loading Movie info")
 
+                #Drop requests of the previously selected movie
+                self.detail_requests.newGeneration('Movies')
+
                 #Set favorite button according to favorite value
                 self.movies_info_box.setFavorite(is_fav)
 
                 #Set loading image
-                self.movies_info_box.cover.setPixmap(QPixmap(self.path_to_loading_img).scaledToWidth(self.series_info_box.maxCoverWidth))
+                self.movies_info_box.cover.setPixmap(self.get_placeholder_image(self.path_to_loading_img, self.movies_info_box.maxCoverWidth))
 
                 #Set movie info box texts
                 self.movies_info_box.name.setText(f"{clicked_item_data['name']}")
@@ -2017,11 +3250,14 @@ class IPTVPlayerApp(QMainWindow):
 
                 self.set_progress_bar(0, "Loading Series info")
 
+                #Drop requests of the previously selected series
+                self.detail_requests.newGeneration('Series')
+
                 #Set favorite button according to favorite value
                 self.series_info_box.setFavorite(is_fav)
 
                 #Set loading image
-                self.series_info_box.cover.setPixmap(QPixmap(self.path_to_loading_img).scaledToWidth(self.series_info_box.maxCoverWidth))
+                self.series_info_box.cover.setPixmap(self.get_placeholder_image(self.path_to_loading_img, self.series_info_box.maxCoverWidth))
 
                 #Set series info box texts
                 self.series_info_box.name.setText(f"{clicked_item_data['name']}")
@@ -2116,61 +3352,36 @@ class IPTVPlayerApp(QMainWindow):
     def go_back_to_level(self, series_navigation_level):
         self.set_progress_bar(0, "Loading items")
 
-        #Clear series list widget
-        self.streaming_list_widgets['Series'].clear()
-
-        #Reset scrollbar position to top
-        self.streaming_list_widgets['Series'].scrollToTop()
+        #Seasons still loading are not shown after going back
+        self.detail_requests.newGeneration('Seasons')
 
         if series_navigation_level == 0:    #From seasons back to series list
-            for entry in self.currently_loaded_streams['Series']:
-                item = QListWidgetItem(entry['name'])
-                item.setData(Qt.UserRole, entry)
-
-                self.streaming_list_widgets['Series'].addItem(item)
+            self.load_streaming_list('Series')
 
         elif series_navigation_level == 1:  #From episodes back to seasons list
-            #Add go back item
-            go_back_item = QListWidgetItem(self.go_back_text)
-            go_back_item.setIcon(self.go_back_icon)
-            self.streaming_list_widgets['Series'].addItem(go_back_item)
+            self.load_seasons_list()
 
-            for season in self.currently_loaded_streams['Seasons'].keys():
-                item = QListWidgetItem(f"Season {season}")
-                item.setData(Qt.UserRole, self.currently_loaded_streams['Seasons'][season])
-
-                self.streaming_list_widgets['Series'].addItem(item)
+        #Reset scrollbar position to top
+        self.streaming_list_widgets['Series'].scrollToTop()
 
         self.animate_progress(0, 100, "Loading finished")
 
     def show_seasons(self, seasons_data):
         self.set_progress_bar(0, "Loading items")
 
+        #Drop seasons of a series that was opened before
+        self.detail_requests.newGeneration('Seasons')
+
         #Fetch series info data
         self.fetch_series_info(seasons_data['series_id'], True)
 
     def show_episodes(self, episodes_data):
         self.set_progress_bar(0, "Loading items")
 
-        #Clear series list
-        self.streaming_list_widgets['Series'].clear()
-
-        #Reset scrollbar position to top
-        self.streaming_list_widgets['Series'].scrollToTop()
-
-        #Add go back item
-        go_back_item = QListWidgetItem(self.go_back_text)
-        go_back_item.setIcon(self.go_back_icon)
-        self.streaming_list_widgets['Series'].addItem(go_back_item)
-
         #Clear episodes list so it can be filled again
-        self.currently_loaded_streams['Episodes'].clear()
+        self.currently_loaded_streams['Episodes'] = []
 
-        #Show episodes in list
         for episode in episodes_data:
-            #Create episode item
-            item = QListWidgetItem(f"{episode['title']}")
-
             #Make playable url
             container_extension = episode['container_extension']
             episode_id          = episode['id']
@@ -2195,17 +3406,38 @@ class IPTVPlayerApp(QMainWindow):
             #Add new 'url' key to episode data
             episode['url'] = playable_url
 
-            #Set data to the episode item
-            item.setData(Qt.UserRole, episode)
-
             #Append episode data to the currently loaded list for search functionality
             self.currently_loaded_streams['Episodes'].append(episode)
 
-            #Add episode item to series list
-            self.streaming_list_widgets['Series'].addItem(item)
+        self.search_indexes['Episodes'] = SearchIndex([episode['title'] for episode in self.currently_loaded_streams['Episodes']])
+
+        #Show episodes with go back item in series list
+        self.load_episodes_list()
+
+        #Reset scrollbar position to top
+        self.streaming_list_widgets['Series'].scrollToTop()
 
         self.animate_progress(0, 100, "Loading finished")
 
+    def load_seasons_list(self, text=''):
+        self.update_poster_grid('Series')
+
+        #Seasons are shown as (text, episodes of season) rows
+        season_rows = [(f"Season {season}", episodes) for season, episodes in self.currently_loaded_streams['Seasons'].items()]
+        positions   = self.search_indexes['Seasons'].searchWithFallback(text)[0]
+
+        self.streaming_list_widgets['Series'].model().setRows(season_rows, positions, lambda season_row: season_row[0], lambda season_row: season_row[1],
+            header_rows=[self.getGoBackRow()], placeholder="No search results found..." if text else None)
+
+    def load_episodes_list(self, text=''):
+        self.update_poster_grid('Series')
+
+        episodes    = self.currently_loaded_streams['Episodes']
+        positions   = self.search_indexes['Episodes'].searchWithFallback(text)[0]
+
+        self.streaming_list_widgets['Series'].model().setRows(episodes, positions, lambda episode: f"{episode['title']}",
+            header_rows=[self.getGoBackRow()], placeholder="No search results found..." if text else None)
+
     def play_item(self, url):
         if not url:
             self.animate_progress(0, 100, "Stream URL not found")
@@ -2306,7 +3538,10 @@ class IPTVPlayerApp(QMainWindow):
         match e.key():
             case Qt.Key_Return:
                 # list_widgets[stream_type].clear()
-                
+
+                #Search right away instead of waiting for the search timer
+                self.search_timers[(list_content_type, stream_type)].stop()
+
                 history_list_idx[0] = 0
 
                 if text:
@@ -2366,102 +3601,153 @@ class IPTVPlayerApp(QMainWindow):
                 search_bar.insert(e.text())
                 # e.accept()
 
-    def search_in_list(self, list_content_type, stream_type, text):
-        try:
-            self.set_progress_bar(0, f"Loading search results...")
+    def start_search(self, list_content_type, stream_type, text):
+        search_key = (list_content_type, stream_type)
 
-            #If searching in category list
-            if list_content_type == 'category':
-                #Check if list is empty
-                if not self.currently_loaded_categories[stream_type]:
-                    return
+        #Cancel searches that are still running for this list
+        generation = self.search_generations.get(search_key, 0) + 1
+        self.search_generations[search_key] = generation
+
+        #Seasons, episodes and lists without search index are searched right away
+        search_index = self.search_indexes.get(stream_type)
+        if not search_index or (list_content_type == 'streaming' and stream_type == 'Series' and self.series_navigation_level != 0):
+            self.search_in_list(list_content_type, stream_type, text)
+            return
+
+        base_positions = self.currently_loaded_streams[stream_type] if list_content_type == 'streaming' else None
 
-                #Enable or disable sorting
-                self.category_list_widgets[stream_type].setSortingEnabled(self.sorting_enabled)
+        #Check if list is empty
+        if list_content_type == 'streaming' and not base_positions:
+            return
+
+        #If the new search text extends the previous one, only the previous results have to be searched
+        previous_results = None
+        last_search = self.last_search_results.get(search_key)
+        if (last_search and last_search['search_index'] is search_index[list_content_type] and last_search['base_positions'] is base_positions and
+                not last_search['ranked'] and query_extends(last_search['text'], text)):
+            previous_results = last_search['results']
 
-                #When sorting is enabled, set sort order, 0: A-Z, 1: Z-A
-                if self.sorting_enabled:
-                    self.category_list_widgets[stream_type].sortItems(self.sorting_order)
+        search_worker = SearchWorker(generation, self.search_generations, list_content_type, stream_type, search_index[list_content_type], base_positions, text, previous_results)
+        search_worker.signals.finished.connect(self.process_search_results)
 
-                self.category_list_widgets[stream_type].clear()
+        #Superseded searches of this list stop as soon as they run, searches of other lists in the queue are kept
+        self.search_threadpool.start(search_worker)
 
-                for entry in self.currently_loaded_categories[stream_type]:
-                    if text.lower() in entry.get('category_name', '').lower():
-                        item = QListWidgetItem(entry['category_name'])
-                        item.setData(Qt.UserRole, entry)
+    def process_search_results(self, generation, list_content_type, stream_type, text, search_index, base_positions, results, ranked):
+        search_key = (list_content_type, stream_type)
 
-                        self.category_list_widgets[stream_type].addItem(item)
+        #Drop results of older searches, or of data that has changed since the search started
+        if generation != self.search_generations.get(search_key):
+            return
 
-                #Disable sorting
-                self.category_list_widgets[stream_type].setSortingEnabled(False)
+        if search_index is not self.search_indexes.get(stream_type, {}).get(list_content_type):
+            return
 
-                #if search bar is empty
-                if not text:
-                    # Add 'All' and 'Favorites' categories to top
-                    itemAll = QListWidgetItem(self.all_categories_text)
-                    itemAll.setData(Qt.UserRole, {'category_name': self.all_categories_text})
-                    self.category_list_widgets[stream_type].insertItem(0, itemAll)
+        if list_content_type == 'streaming' and (base_positions is not self.currently_loaded_streams[stream_type] or
+                (stream_type == 'Series' and self.series_navigation_level != 0)):
+            return
 
-                    itemFav = QListWidgetItem(self.fav_categories_text)
-                    itemFav.setData(Qt.UserRole, {'category_name': self.fav_categories_text})
-                    self.category_list_widgets[stream_type].insertItem(1, itemFav)
+        self.last_search_results[search_key] = {
+            'text': text,
+            'search_index': search_index,
+            'base_positions': base_positions,
+            'results': results,
+            'ranked': ranked
+        }
 
-                #Check if no search results found
-                num_of_items = self.category_list_widgets[stream_type].count()
-                if not num_of_items:
-                    self.category_list_widgets[stream_type].addItem("No search results found...")
+        self.currently_applied_search[list_content_type][stream_type] = text
+
+        #Keep best matches on top for similar name results
+        self.show_search_results(list_content_type, stream_type, text, results, self.sorting_enabled and not ranked)
+
+    def search_in_list(self, list_content_type, stream_type, text):
+        try:
+            self.set_progress_bar(0, f"Loading search results...")
+
+            #Cancel searches that are still running for this list
+            search_key = (list_content_type, stream_type)
+            self.search_generations[search_key] = self.search_generations.get(search_key, 0) + 1
+
+            if stream_type in self.currently_applied_search[list_content_type]:
+                self.currently_applied_search[list_content_type][stream_type] = text
+
+            #Results of the catalog store are already sorted, other results are sorted when sorting is enabled
+            sort_order = self.sorting_order if self.sorting_enabled else None
+
+            #If searching in category list
+            if list_content_type == 'category':
+                categories = self.categories_per_stream_type.get(stream_type, [])
 
-            #If searching in streaming content list
-            elif list_content_type == 'streaming':
                 #Check if list is empty
-                if not self.currently_loaded_streams[stream_type]:
+                if not categories:
                     return
 
-                #Enable or disable sorting
-                self.streaming_list_widgets[stream_type].setSortingEnabled(self.sorting_enabled)
+                #Search with search index, or with catalog store index while the search index is built
+                #Similar names are searched if no name contains the text, these results are ranked and not sorted.
+                search_index = self.search_indexes.get(stream_type)
+                ranked = False
+                if search_index:
+                    positions, ranked = search_index['category'].searchWithFallback(text)
+                else:
+                    positions = self.query_catalog_store(stream_type, 'category', text=text, sort_order=sort_order)
+
+                sort_results = self.sorting_enabled and not ranked and (search_index is not None or positions is None)
 
-                #When sorting is enabled, set sort order, 0: A-Z, 1: Z-A
-                if self.sorting_enabled:
-                    self.streaming_list_widgets[stream_type].sortItems(self.sorting_order)
+                if positions is None:
+                    positions = [idx for idx, entry in enumerate(categories) if text.lower() in entry.get('category_name', '').lower()]
 
-                self.streaming_list_widgets[stream_type].clear()
+                self.show_search_results(list_content_type, stream_type, text, positions, sort_results)
 
-                match self.series_navigation_level:
+            #If searching in streaming content list
+            elif list_content_type == 'streaming':
+                match self.series_navigation_level if stream_type == 'Series' else 0:
                     case 0: #LIVE/VOD/Series
-                        for entry in self.currently_loaded_streams[stream_type]:
-                            if text.lower() in entry['name'].lower():
-                                item = QListWidgetItem(entry['name'])
-                                item.setData(Qt.UserRole, entry)
+                        #Check if list is empty
+                        if not self.currently_loaded_streams[stream_type]:
+                            return
 
-                                self.streaming_list_widgets[stream_type].addItem(item)
-                    case 1: #Seasons
-                        self.streaming_list_widgets[stream_type].addItem(self.go_back_text)
+                        #Search with search index, or with catalog store index while the search index is built
+                        #Similar names are searched if no name contains the text, these results are ranked and not sorted.
+                        search_index = self.search_indexes.get(stream_type)
+                        ranked = False
+                        if search_index:
+                            positions, ranked = search_index['streaming'].searchWithFallback(text, self.currently_loaded_streams[stream_type])
+                        else:
+                            positions = self.query_catalog_store(stream_type, 'streaming', text=text, sort_order=sort_order, **self.currently_loaded_filters[stream_type])
 
-                        for season in self.currently_loaded_streams['Seasons'].keys():
-                            if text.lower() in f"season {season}":
-                                item = QListWidgetItem(f"Season {season}")
-                                item.setData(Qt.UserRole, self.currently_loaded_streams['Seasons'][season])
+                        sort_results = self.sorting_enabled and not ranked and (search_index is not None or positions is None)
 
-                                self.streaming_list_widgets[stream_type].addItem(item)
-                    case 2: #Episodes
-                        self.streaming_list_widgets[stream_type].addItem(self.go_back_text)
+                        if positions is None:
+                            entries     = self.entries_per_stream_type[stream_type]
+                            positions   = [idx for idx in self.currently_loaded_streams[stream_type] if text.lower() in entries[idx]['name'].lower()]
 
-                        for episode in self.currently_loaded_streams['Episodes']:
-                            if text.lower() in episode['title'].lower():
-                                item = QListWidgetItem(episode['title'])
-                                item.setData(Qt.UserRole, episode)
+                        self.show_search_results(list_content_type, stream_type, text, positions, sort_results)
 
-                                self.streaming_list_widgets[stream_type].addItem(item)
+                    case 1: #Seasons
+                        self.load_seasons_list(text)
 
-                #Check if no search results found
-                num_of_items = self.streaming_list_widgets[stream_type].count()
-                if not (num_of_items - (self.series_navigation_level > 0)):
-                    self.streaming_list_widgets[stream_type].addItem("No search results found...")
+                    case 2: #Episodes
+                        self.load_episodes_list(text)
 
             self.set_progress_bar(100, f"Loaded search results")
         except Exception as e:
             print(f"search in list failed: {e}")
 
+    def show_search_results(self, list_content_type, stream_type, text, positions, sort_results):
+        if list_content_type == 'category':
+            #Only show 'All' and 'Favorites' categories if search bar is empty
+            list_model = self.category_list_widgets[stream_type].model()
+            list_model.setRows(self.categories_per_stream_type[stream_type], positions, get_category_name,
+                header_rows=[] if text else self.getSpecialCategoryRows(), placeholder="No search results found...",
+                count_func=lambda category: self.get_category_count(stream_type, category))
+        else:
+            list_model = self.streaming_list_widgets[stream_type].model()
+            list_model.setRows(self.entries_per_stream_type[stream_type], positions, placeholder="No search results found...")
+
+        if sort_results:
+            #Sort with the precomputed sort order, or by name while the sort index is built
+            list_model.sortRows(self.sorting_order, self.get_sort_index(stream_type, list_content_type))
+
     def load_external_player_command(self):
         external_player_command = ""
 
@@ -2488,6 +3774,12 @@ class IPTVPlayerApp(QMainWindow):
         dialog.exec_()
 
 def main():
+    try:
+        #Sort names in the order of the user's language
+        locale.setlocale(locale.LC_COLLATE, '')
+    except locale.Error as e:
+        print(f"Failed setting locale: {e}")
+
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     player = IPTVPlayerApp()
@@ -0,0 +1,228 @@
+import os
+import time
+import hashlib
+import threading
+from os import path
+from collections import OrderedDict
+
+#Budgets of the decoded images in memory and of the downloaded images on disk
+MEMORY_CACHE_SIZE_MB    = 64
+DISK_CACHE_SIZE_MB      = 300
+
+#Images that are not found or can't be loaded are not requested again for this long
+NEGATIVE_CACHE_SECONDS  = 3600
+
+#Images of which the request failed, e.g. by a timeout, are requested again sooner as the connection may work again
+FAILED_CACHE_SECONDS    = 120
+
+IMAGE_CACHE_DIR         = "images"
+
+def get_image_key(img_url, size=None):
+    #Scaled image data, e.g. of thumbnails, is kept next to the downloaded image under its own key
+    key_text = str(img_url) if size is None else f"{img_url}|{size[0]}x{size[1]}"
+    return hashlib.sha1(key_text.encode('utf-8')).hexdigest()
+
+class ImageCache:
+    def __init__(self, cache_dir, memory_size=MEMORY_CACHE_SIZE_MB * 1e6, disk_size=DISK_CACHE_SIZE_MB * 1e6):
+        self.cache_dir      = path.join(cache_dir, IMAGE_CACHE_DIR)
+        self.disk_size      = disk_size
+
+        #Decoded images per (url, size) with their size in bytes, least recently used first.
+        #Sizes can get their own budget, e.g. the thumbnails of the poster grid, so they don't evict the covers.
+        self.memory         = {None: OrderedDict()}
+        self.memory_used    = {None: 0}
+        self.memory_sizes   = {None: memory_size}
+
+        #Size and last use of the downloaded images per url hash, loaded when the disk is used the first time
+        self.disk_files     = None
+        self.disk_used      = 0
+
+        #Urls that returned no image, with the time until they are requested again and the placeholder shown
+        self.negative       = {}
+
+        #Lookups served from memory, disk, the negative cache or requested from the IPTV provider
+        self.stats          = {'memory': 0, 'disk': 0, 'negative': 0, 'miss': 0}
+
+        self.lock           = threading.Lock()
+
+    def addMemoryBudget(self, size, memory_size):
+        #Images of this size are kept in memory apart from the other images
+        with self.lock:
+            self.memory.setdefault(size, OrderedDict())
+            self.memory_used.setdefault(size, 0)
+            self.memory_sizes[size] = memory_size
+
+    def getMemory(self, size):
+        #Must be called with the lock held
+        return size if size in self.memory_sizes else None
+
+    def getImage(self, img_url, size, count_lookup=True):
+        #Returns the decoded image of url scaled to size, or None. Repaints don't count as lookups.
+        key = (img_url, size)
+
+        with self.lock:
+            memory = self.memory[self.getMemory(size)]
+
+            cached = memory.get(key)
+            if cached is None:
+                return None
+
+            memory.move_to_end(key)
+            if count_lookup:
+                self.stats['memory'] += 1
+
+            return cached[0]
+
+    def putImage(self, img_url, size, image, num_of_bytes):
+        key = (img_url, size)
+
+        with self.lock:
+            memory_key  = self.getMemory(size)
+            memory      = self.memory[memory_key]
+
+            if key in memory:
+                self.memory_used[memory_key] -= memory.pop(key)[1]
+
+            memory[key] = (image, num_of_bytes)
+            self.memory_used[memory_key] += num_of_bytes
+
+            #Remove least recently used images until the images fit in the budget
+            while self.memory_used[memory_key] > self.memory_sizes[memory_key] and len(memory) > 1:
+                _, (_, removed_bytes) = memory.popitem(last=False)
+                self.memory_used[memory_key] -= removed_bytes
+
+    def getNegative(self, img_url, count_lookup=True):
+        #Returns the placeholder shown for url if it recently returned no image, otherwise None
+        with self.lock:
+            negative = self.negative.get(img_url)
+            if negative is None:
+                return None
+
+            expires, placeholder = negative
+            if time.time() >= expires:
+                del self.negative[img_url]
+                return None
+
+            if count_lookup:
+                self.stats['negative'] += 1
+            return placeholder
+
+    def putNegative(self, img_url, placeholder, seconds=NEGATIVE_CACHE_SECONDS):
+        with self.lock:
+            self.negative[img_url] = (time.time() + seconds, placeholder)
+
+    def loadDiskFiles(self):
+        #Must be called with the lock held
+        if self.disk_files is not None:
+            return
+
+        self.disk_files = {}
+        self.disk_used  = 0
+
+        if not path.isdir(self.cache_dir):
+            return
+
+        for file_name in os.listdir(self.cache_dir):
+            try:
+                file_stat = os.stat(path.join(self.cache_dir, file_name))
+            except OSError:
+                continue
+
+            self.disk_files[file_name] = (file_stat.st_size, file_stat.st_mtime)
+            self.disk_used += file_stat.st_size
+
+    def readData(self, img_url, size=None, count_miss=True):
+        #Returns the downloaded image data of url from disk, or the scaled image data of size, or None
+        key = get_image_key(img_url, size)
+
+        with self.lock:
+            self.loadDiskFiles()
+
+            if key not in self.disk_files:
+                if count_miss:
+                    self.stats['miss'] += 1
+                return None
+
+        file_path = path.join(self.cache_dir, key)
+
+        try:
+            with open(file_path, 'rb') as image_file:
+                data = image_file.read()
+
+            #Mark as recently used, so it is evicted last
+            os.utime(file_path)
+
+        except OSError:
+            with self.lock:
+                self.forgetFile(key)
+                self.stats['miss'] += 1
+            return None
+
+        with self.lock:
+            self.disk_files[key] = (len(data), time.time())
+            self.stats['disk'] += 1
+
+        return data
+
+    def writeData(self, img_url, data, size=None):
+        key         = get_image_key(img_url, size)
+        file_path   = path.join(self.cache_dir, key)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            #Write to temporary file first, so a half written image is never read
+            temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as image_file:
+                image_file.write(data)
+            os.replace(temp_path, file_path)
+
+        except OSError as e:
+            print(f"Failed writing image cache: {e}")
+            return
+
+        with self.lock:
+            self.loadDiskFiles()
+            self.forgetFile(key)
+
+            self.disk_files[key] = (len(data), time.time())
+            self.disk_used += len(data)
+
+            self.evictDiskFiles(key)
+
+    def forgetFile(self, key):
+        #Must be called with the lock held
+        removed = self.disk_files.pop(key, None)
+        if removed:
+            self.disk_used -= removed[0]
+
+    def evictDiskFiles(self, keep_key):
+        #Remove least recently used images until the images fit in the disk budget. Must be called with the lock held.
+        if self.disk_used <= self.disk_size:
+            return
+
+        for key, _ in sorted(self.disk_files.items(), key=lambda item: item[1][1]):
+            if self.disk_used <= self.disk_size:
+                break
+
+            if key == keep_key:
+                continue
+
+            try:
+                os.remove(path.join(self.cache_dir, key))
+            except OSError as e:
+                print(f"Failed removing cached image: {e}")
+
+            self.forgetFile(key)
+
+    def getStats(self):
+        with self.lock:
+            lookups = sum(self.stats.values())
+            hits    = lookups - self.stats['miss']
+
+            return dict(self.stats,
+                lookups=lookups,
+                hit_rate=(hits / lookups) if lookups else 0.0,
+                memory_used=sum(self.memory_used.values()),
+                disk_used=self.disk_used
+            )
@@ -0,0 +1,134 @@
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+#Movie and series info is requested again after this time, e.g. for newly added episodes
+INFO_MAX_AGE_SECONDS    = 24 * 3600
+
+#Number of movies and series kept in memory and on disk
+MEMORY_CACHE_SIZE       = 64
+DISK_CACHE_SIZE         = 2000
+
+#Time to wait for the database when another thread is writing to it
+DB_BUSY_TIMEOUT         = 10
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS info (
+        info_type       TEXT,
+        item_id         TEXT,
+        fetched         REAL,
+        last_used       REAL,
+        data            TEXT,
+        PRIMARY KEY (info_type, item_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS info_used ON info (last_used)"
+]
+
+class InfoCache:
+    def __init__(self, file_path=None, max_age=INFO_MAX_AGE_SECONDS):
+        self.file_path      = file_path
+        self.max_age        = max_age
+
+        #Info per (info type, item id) with the time it was fetched
+        self.memory         = OrderedDict()
+        self.lock           = threading.Lock()
+
+        #SQLite connections can only be used in the thread they are created in
+        self.thread_data    = threading.local()
+
+        if self.file_path:
+            connection = self.getConnection()
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+
+    def getConnection(self):
+        connection = getattr(self.thread_data, 'connection', None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.file_path, timeout=DB_BUSY_TIMEOUT)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            self.thread_data.connection = connection
+
+        return connection
+
+    def get(self, info_type, item_id):
+        #Returns the cached info, or None if it is not cached or too old
+        key = (info_type, str(item_id))
+
+        with self.lock:
+            cached = self.memory.get(key)
+            if cached:
+                self.memory.move_to_end(key)
+
+        if not cached:
+            cached = self.loadFromDisk(key)
+            if not cached:
+                return None
+
+            self.putInMemory(key, cached)
+
+        fetched, info_data = cached
+        if time.time() - fetched >= self.max_age:
+            return None
+
+        return info_data
+
+    def put(self, info_type, item_id, info_data):
+        key     = (info_type, str(item_id))
+        cached  = (time.time(), info_data)
+
+        self.putInMemory(key, cached)
+        self.saveToDisk(key, cached)
+
+    def putInMemory(self, key, cached):
+        with self.lock:
+            self.memory[key] = cached
+            self.memory.move_to_end(key)
+
+            #Remove least recently used info
+            while len(self.memory) > MEMORY_CACHE_SIZE:
+                self.memory.popitem(last=False)
+
+    def loadFromDisk(self, key):
+        if not self.file_path:
+            return None
+
+        try:
+            connection = self.getConnection()
+            row = connection.execute("SELECT fetched, data FROM info WHERE info_type = ? AND item_id = ?", key).fetchone()
+            if not row:
+                return None
+
+            with connection:
+                connection.execute("UPDATE info SET last_used = ? WHERE info_type = ? AND item_id = ?", (time.time(),) + key)
+
+            return row[0], json.loads(row[1])
+
+        except Exception as e:
+            print(f"Failed reading info cache: {e}")
+            return None
+
+    def saveToDisk(self, key, cached):
+        if not self.file_path:
+            return
+
+        try:
+            connection = self.getConnection()
+            fetched, info_data = cached
+
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO info VALUES (?, ?, ?, ?, ?)", key + (fetched, time.time(), json.dumps(info_data)))
+
+                #Remove least recently used info
+                connection.execute(
+                    "DELETE FROM info WHERE (info_type, item_id) NOT IN (SELECT info_type, item_id FROM info ORDER BY last_used DESC LIMIT ?)",
+                    (DISK_CACHE_SIZE,)
+                )
+
+        except Exception as e:
+            print(f"Failed writing info cache: {e}")
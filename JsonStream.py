@@ -0,0 +1,74 @@
+import re
+import json
+import codecs
+
+WHITESPACE      = re.compile(r'\s*')
+
+#Characters that can follow a complete value inside a JSON array
+VALUE_END_CHARS = ', \t\r\n]'
+
+#Fields of the LIVE, VOD and series entries used by the player. Other fields are dropped while parsing.
+STREAM_ENTRY_FIELDS = (
+    'num', 'name', 'stream_type', 'stream_id', 'series_id', 'stream_icon', 'cover', 'epg_channel_id',
+    'added', 'last_modified', 'rating', 'rating_5based', 'releaseDate', 'release_date', 'year',
+    'category_id', 'container_extension'
+)
+
+def project_entry(entry, fields=STREAM_ENTRY_FIELDS):
+    if not isinstance(entry, dict):
+        return entry
+
+    return {key: entry[key] for key in fields if key in entry}
+
+def iter_json_array(chunks):
+    #Parse a JSON array entry by entry while the data comes in, so the whole response is never kept in memory
+    decoder         = json.JSONDecoder()
+    text_decoder    = codecs.getincrementaldecoder('utf-8')()
+    buffer          = ''
+    pos             = 0
+    started         = False
+    finished        = False
+
+    for chunk in chunks:
+        #Only keep the part of the buffer that is not parsed yet
+        buffer  = buffer[pos:] + text_decoder.decode(chunk)
+        pos     = 0
+
+        while not finished:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+
+            char = buffer[pos]
+
+            if not started:
+                if char != '[':
+                    raise ValueError("Response is not a JSON array")
+
+                started = True
+                pos += 1
+
+            elif char == ',':
+                pos += 1
+
+            elif char == ']':
+                finished = True
+
+            else:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    #Entry is not complete yet, wait for more data
+                    break
+
+                #A value at the end of the buffer, or a number followed by more digits, could still continue in the next chunk
+                if end >= len(buffer) or buffer[end] not in VALUE_END_CHARS:
+                    break
+
+                pos = end
+                yield value
+
+        if finished:
+            return
+
+    raise ValueError("JSON array is incomplete")
@@ -0,0 +1,178 @@
+import re
+import bisect
+import difflib
+import unicodedata
+from array import array
+
+#All names are joined to one text, so a substring search is a single fast search through one string
+#instead of lowercasing and checking every name on every search.
+NAME_SEPARATOR      = '\n'
+
+#Search only the given positions instead of the whole text if they are less than 1/8 of all names
+SUBSET_SCAN_RATIO   = 8
+
+#Country and language prefixes and tags in brackets at the start of provider names,
+#e.g. 'PT| ', '|SE| ', 'SE - ', 'SE-4K - ', 'UK: ' and 'SWE| [Radio][SE] '
+PREFIX_PATTERN      = re.compile(r'^(?:\s*\|?[a-z]{2,3}(?:-[a-z0-9]{2,3})?\s*(?:\||:|\s-\s)\s*|\s*\[[^\]]*\])+')
+
+WORD_PATTERN        = re.compile(r'[^\W_]+')
+
+#Quality and codec markers that are not part of the name, e.g. 'HD', 'FHD', '4K', 'HEVC'
+QUALITY_WORDS       = {'sd', 'hd', 'fhd', 'uhd', 'hq', '4k', '8k', 'hevc', 'h264', 'h265', '720p', '1080p', '2160p', '50fps', '60fps', 'raw'}
+
+#Fuzzy search, used when no name contains the search text
+FUZZY_CUTOFF        = 0.75
+FUZZY_PREFIX_SCORE  = 0.9
+FUZZY_WORD_MATCHES  = 5
+FUZZY_MAX_RESULTS   = 500
+
+def fold_text(text):
+    #Case insensitive and without diacritics, e.g. 'Führer' -> 'fuhrer'
+    text = str(text or '').casefold()
+
+    if not text.isascii():
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+
+    return text.replace(NAME_SEPARATOR, ' ')
+
+def normalize_folded_text(text):
+    words = WORD_PATTERN.findall(PREFIX_PATTERN.sub('', text, count=1))
+    return ' '.join(word for word in words if word not in QUALITY_WORDS)
+
+def normalize_text(text):
+    #Search key of a name: folded, without country prefixes, tags and quality markers, as words separated by a space
+    return normalize_folded_text(fold_text(text))
+
+def query_extends(prev_text, text):
+    #Whether all results of text are also results of prev_text, so only the previous results have to be searched
+    prev_key, key = normalize_text(prev_text), normalize_text(text)
+    return fold_text(prev_text) in fold_text(text) and prev_key in key and (bool(prev_key) or not key)
+
+class JoinedText:
+    def __init__(self, texts):
+        #Offset of every text in the joined text
+        self.offsets = array('L')
+
+        offset = 0
+        for text in texts:
+            self.offsets.append(offset)
+            offset += len(text) + len(NAME_SEPARATOR)
+
+        self.text = NAME_SEPARATOR.join(texts)
+
+    def findAll(self, query):
+        #Returns positions of all texts containing the query, in order
+        positions   = []
+        text_len    = len(self.text)
+
+        idx = self.text.find(query)
+        while idx != -1:
+            position = bisect.bisect_right(self.offsets, idx) - 1
+            positions.append(position)
+
+            #Continue at the next text, every text is only returned once
+            next_offset = self.offsets[position + 1] if position + 1 < len(self.offsets) else text_len
+            idx = self.text.find(query, next_offset)
+
+        return positions
+
+class SearchIndex:
+    def __init__(self, names):
+        #Names are normalized once when the index is built, not on every search
+        self.names          = [fold_text(name) for name in names]
+        self.keys           = [normalize_folded_text(name) for name in self.names]
+
+        self.names_text     = JoinedText(self.names)
+        self.keys_text      = JoinedText(self.keys)
+
+        #Positions of the names per word, and the words per first character, used for fuzzy search
+        self.word_positions = {}
+        for position, key in enumerate(self.keys):
+            for word in set(key.split()):
+                self.word_positions.setdefault(word, []).append(position)
+
+        self.words_per_char = {}
+        for word in self.word_positions:
+            self.words_per_char.setdefault(word[0], []).append(word)
+
+    def __len__(self):
+        return len(self.names)
+
+    def findAll(self, query, query_key):
+        #Names containing the search text as typed, or with prefixes and quality markers left out
+        positions = self.names_text.findAll(query)
+
+        #A single word that is its own key is always found in the names as well
+        if query_key and not (query_key == query and ' ' not in query):
+            positions = sorted(set(positions).union(self.keys_text.findAll(query_key)))
+
+        return positions
+
+    def search(self, text, positions=None):
+        #Returns positions of the names containing text. If positions are given, only these are searched and their order is kept.
+        query       = fold_text(text)
+        query_key   = normalize_folded_text(query)
+
+        if not query.strip():
+            return list(range(len(self.names))) if positions is None else list(positions)
+
+        if positions is None:
+            return self.findAll(query, query_key)
+
+        #Checking a few names is faster than searching the whole text
+        if len(positions) * SUBSET_SCAN_RATIO < len(self.names):
+            return [position for position in positions if query in self.names[position] or (query_key and query_key in self.keys[position])]
+
+        matches = set(self.findAll(query, query_key))
+        return [position for position in positions if position in matches]
+
+    def findSimilarWords(self, word):
+        #Words that start with the word, e.g. while still typing, and words with a small typo
+        candidates  = self.words_per_char.get(word[0], [])
+        similar     = [(candidate, 1.0 if candidate == word else FUZZY_PREFIX_SCORE) for candidate in candidates if candidate.startswith(word)]
+
+        for candidate in difflib.get_close_matches(word, candidates, n=FUZZY_WORD_MATCHES, cutoff=FUZZY_CUTOFF):
+            if not candidate.startswith(word):
+                similar.append((candidate, difflib.SequenceMatcher(None, word, candidate).ratio()))
+
+        return similar
+
+    def fuzzySearch(self, text, positions=None):
+        #Returns positions of the names that have a similar word for every word of text, best matches first
+        words = normalize_text(text).split()
+        if not words:
+            return []
+
+        scores = None
+        for word in words:
+            word_scores = {}
+            for similar_word, similarity in self.findSimilarWords(word):
+                for position in self.word_positions[similar_word]:
+                    if similarity > word_scores.get(position, 0):
+                        word_scores[position] = similarity
+
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {position: score + word_scores[position] for position, score in scores.items() if position in word_scores}
+
+            if not scores:
+                return []
+
+        if positions is not None:
+            allowed = set(positions)
+            scores  = {position: score for position, score in scores.items() if position in allowed}
+
+        #Best score first, then the shortest name, as it has the least other words
+        results = sorted(scores, key=lambda position: (-scores[position], len(self.keys[position]), position))
+
+        return results[:FUZZY_MAX_RESULTS]
+
+    def searchWithFallback(self, text, positions=None):
+        #Substring search, or ranked fuzzy search if no name contains the text. Returns the positions and whether they are ranked.
+        results = self.search(text, positions)
+
+        if results or not fold_text(text).strip():
+            return results, False
+
+        return self.fuzzySearch(text, positions), True
@@ -0,0 +1,115 @@
+import re
+import locale
+from array import array
+from datetime import datetime
+
+from SearchIndex import fold_text
+
+#Sort orders, same as used by the list widgets. 0: A-Z, 1: Z-A
+SORT_A_Z        = 0
+SORT_Z_A        = 1
+
+#Sort orders by a field of the streams, highest value first
+SORT_ADDED      = 2
+SORT_RATING     = 3
+SORT_RELEASE    = 4
+
+FIELD_SORT_ORDERS = (SORT_ADDED, SORT_RATING, SORT_RELEASE)
+
+#Streams selected right away when sorting by a field, e.g. the 200 most recently added movies.
+#The other streams are sorted when the list is scrolled to them.
+FIELD_SORT_TOP_ITEMS = 200
+
+NUMBER_PATTERN  = re.compile(r'\d+')
+
+#Release year in the name, e.g. 'EN - Movie (2023)'
+YEAR_PATTERN    = re.compile(r'\((\d{4})\)')
+
+def pad_number(match):
+    #Numbers are compared by value: first by their number of digits, then by the digits
+    digits = match.group().lstrip('0') or '0'
+    return f"{len(digits):02d}{digits}"
+
+def collation_key(name):
+    #Sort key of a name, e.g. 'Episode 2' comes before 'Episode 10'.
+    #The key is a string, so the catalog store can sort on it in the same order.
+    text = NUMBER_PATTERN.sub(pad_number, fold_text(name))
+
+    try:
+        #Order of the user's language
+        return locale.strxfrm(text)
+    except (ValueError, locale.Error):
+        return text
+
+def to_number(value):
+    #Fields can be strings, numbers, empty strings or missing
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def get_release_date(entry):
+    #Release date as a number, e.g. 20230105. Only the year is known for some streams, e.g. 20230000.
+    release_date = entry.get('releaseDate') or entry.get('release_date')
+    if release_date:
+        try:
+            date = datetime.strptime(str(release_date)[:10], '%Y-%m-%d')
+            return date.year * 10000 + date.month * 100 + date.day
+        except ValueError:
+            pass
+
+    year = to_number(entry.get('year'))
+    if not year:
+        match = YEAR_PATTERN.search(str(entry.get('name') or ''))
+        year = float(match.group(1)) if match else 0
+
+    return int(year) * 10000
+
+def get_field_value(entry, sort_order):
+    #Value a stream is sorted by, streams without the field get 0 and come last
+    if sort_order == SORT_ADDED:
+        return int(to_number(entry.get('added', entry.get('last_modified'))))
+
+    elif sort_order == SORT_RATING:
+        #Ratings out of 5 are more common, 'rating' is out of 10
+        rating = to_number(entry.get('rating_5based'))
+        return rating if rating else to_number(entry.get('rating')) / 2
+
+    elif sort_order == SORT_RELEASE:
+        return get_release_date(entry)
+
+    return 0
+
+class FieldColumns:
+    def __init__(self, entries):
+        #Sort fields of all streams as typed arrays, parsed once instead of on every sort
+        self.columns = {
+            SORT_ADDED:     array('q', (get_field_value(entry, SORT_ADDED) for entry in entries)),
+            SORT_RATING:    array('d', (get_field_value(entry, SORT_RATING) for entry in entries)),
+            SORT_RELEASE:   array('l', (get_field_value(entry, SORT_RELEASE) for entry in entries))
+        }
+
+    def keyFunc(self, sort_order):
+        return self.columns[sort_order].__getitem__
+
+class SortIndex:
+    def __init__(self, names):
+        keys = [collation_key(name) for name in names]
+
+        #Positions in A-Z order, ties keep the order of the IPTV provider
+        self.order = array('L', sorted(range(len(keys)), key=keys.__getitem__))
+
+        #Place of every position in the A-Z order, so any selection of positions can be sorted by comparing numbers
+        self.ranks = array('L', bytes(array('L').itemsize * len(keys)))
+        for rank, position in enumerate(self.order):
+            self.ranks[position] = rank
+
+    def __len__(self):
+        return len(self.order)
+
+    def sortPositions(self, positions, sort_order):
+        #All positions are in the precomputed order
+        if len(positions) == len(self.order):
+            return list(self.order) if sort_order == SORT_A_Z else list(reversed(self.order))
+
+        return sorted(positions, key=self.ranks.__getitem__, reverse=(sort_order == SORT_Z_A))
@@ -10,12 +10,14 @@ import json
 import html
 from lxml import etree, html
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dateutil import parser, tz
 import xml.etree.ElementTree as ET
-from PyQt5.QtGui import QIcon, QFont, QImage, QPixmap, QColor
+from PyQt5.QtGui import QIcon, QFont, QImage, QImageReader, QPixmap, QColor
 from PyQt5.QtCore import (
     Qt, QTimer, QPropertyAnimation, QEasingCurve, QSize, QObject, pyqtSignal, 
-    QRunnable, pyqtSlot, QThreadPool, QModelIndex, QAbstractItemModel, QVariant
+    QRunnable, pyqtSlot, QThreadPool, QModelIndex, QAbstractItemModel, QVariant,
+    QBuffer, QByteArray, QIODevice
 )
 from PyQt5 import QtWidgets
 from PyQt5.QtWidgets import (
@@ -28,6 +30,16 @@ from PyQt5.QtWidgets import (
 
 import base64
 
+from JsonStream import iter_json_array, project_entry
+from SearchIndex import SearchIndex, fold_text
+from SortIndex import SortIndex, FieldColumns
+from EPGStore import iter_xmltv_programmes, NowNextIndex, NOW_NEXT_WINDOW_SECONDS
+from CatalogCache import open_catalog_cache, write_catalog_cache, convert_json_cache, evict_account_caches, load_json_file
+import threading
+import hashlib
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
 CONNECTION_HEADER           = "Keep-Alive"
 CONTENT_HEADER              = "gzip, deflate"
 DEFAULT_USER_AGENT_HEADER   = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
@@ -37,15 +49,205 @@ CONNECTION_TIMEOUT  = 3
 READ_TIMEOUT        = 30
 LIVE_STATUS_TIMEOUT = 7
 
+#Number of connections the shared HTTP client keeps alive per host
+HTTP_POOL_SIZE      = 10
+
+#Number of hosts the shared HTTP client keeps a connection pool for, e.g. the IPTV server and its EPG host
+HTTP_POOL_HOSTS     = 4
+
+#Images come from many hosts, e.g. CDNs of poster databases. They have their own connection pools,
+#so requesting them doesn't close the connections to the IPTV server.
+IMAGE_POOL_HOSTS    = 16
+
+#Maximum number of simultaneous requests when fetching the IPTV data in parallel
+MAX_FETCH_WORKERS   = 4
+
+#IPTV data sections that are fetched at login, with their progress bar range when fetched one after another
+#Large stream lists are parsed entry by entry while they are downloaded
+FETCH_SECTIONS = [
+    {'action': 'get_live_categories',   'cache_key': 'LIVE categories',     'stream_type': 'LIVE',      'is_category': True,    'streamed': False,  'name': "LIVE Categories",          'progress': (5, 10)},
+    {'action': 'get_vod_categories',    'cache_key': 'Movies categories',   'stream_type': 'Movies',    'is_category': True,    'streamed': False,  'name': "VOD Categories",           'progress': (10, 20)},
+    {'action': 'get_series_categories', 'cache_key': 'Series categories',   'stream_type': 'Series',    'is_category': True,    'streamed': False,  'name': "Series Categories",        'progress': (20, 30)},
+    {'action': 'get_live_streams',      'cache_key': 'LIVE',                'stream_type': 'LIVE',      'is_category': False,   'streamed': True,   'name': "LIVE Streaming data",      'progress': (30, 40)},
+    {'action': 'get_vod_streams',       'cache_key': 'Movies',              'stream_type': 'Movies',    'is_category': False,   'streamed': True,   'name': "VOD Streaming data",       'progress': (40, 60)},
+    {'action': 'get_series',            'cache_key': 'Series',              'stream_type': 'Series',    'is_category': False,   'streamed': True,   'name': "Series Streaming data",    'progress': (60, 80)},
+]
+
+#Size of the downloaded chunks and number of entries between progress updates when parsing stream lists
+STREAM_CHUNK_SIZE       = 64 * 1024
+STREAM_PROGRESS_BATCH   = 5000
+
+#Quality of the scaled images kept on disk, e.g. the thumbnails of the poster grid
+SCALED_IMAGE_QUALITY    = 85
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _get_conn(self, timeout=None):
+        #Count whether the shared HTTP client opens a new TCP connection or reuses an open one
+        conn = super()._get_conn(timeout)
+        HTTP_CLIENT.countConnection(conn)
+        return conn
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _get_conn(self, timeout=None):
+        #Count whether the shared HTTP client opens a new TCP/TLS connection or reuses an open one
+        conn = super()._get_conn(timeout)
+        HTTP_CLIENT.countConnection(conn)
+        return conn
+
+class PooledHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+
+        #Use the connection pools that count new connections
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+class HttpClient:
+    def __init__(self, pool_size=HTTP_POOL_SIZE):
+        self.user_agent = DEFAULT_USER_AGENT_HEADER
+
+        #Each thread gets its own session, but all sessions share the same connection pools
+        self.thread_data    = threading.local()
+        self.lock           = threading.Lock()
+        self.adapter        = None
+        self.image_adapter  = None
+        self.adapter_gen    = 0
+
+        #Connection counters
+        self.num_requests           = 0
+        self.num_new_connections    = 0
+        self.num_reused_connections = 0
+
+        self.setPoolSize(pool_size)
+
+    def setPoolSize(self, pool_size):
+        #Create adapter with a connection pool of pool_size connections per host.
+        #The previous adapter is not closed, as other threads may still be requesting with it. Its connections
+        #are closed when the sessions of those threads are replaced and the adapter is garbage collected.
+        with self.lock:
+            self.pool_size      = pool_size
+            self.adapter        = PooledHTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=pool_size)
+            self.image_adapter  = PooledHTTPAdapter(pool_connections=IMAGE_POOL_HOSTS, pool_maxsize=pool_size)
+            self.adapter_gen    += 1
+
+    def getSession(self, for_images=False):
+        #Create sessions for this thread or update them when the pool size has changed
+        if getattr(self.thread_data, 'adapter_gen', None) != self.adapter_gen:
+            self.thread_data.sessions       = {}
+            self.thread_data.adapter_gen    = self.adapter_gen
+
+        session = self.thread_data.sessions.get(for_images)
+
+        if session is None:
+            adapter = self.image_adapter if for_images else self.adapter
+
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+            self.thread_data.sessions[for_images] = session
+
+        return session
+
+    def get(self, url, params=None, headers=None, timeout=None, for_images=False, **kwargs):
+        #Create header
+        request_headers = {
+            "Connection": CONNECTION_HEADER,
+            "Accept-Encoding": CONTENT_HEADER,
+            "User-Agent": self.user_agent
+        }
+
+        if headers:
+            request_headers.update(headers)
+
+        #Use the current default timeouts if not given
+        if timeout is None:
+            timeout = (CONNECTION_TIMEOUT, READ_TIMEOUT)
+
+        with self.lock:
+            self.num_requests += 1
+
+        return self.getSession(for_images).get(url, params=params, headers=request_headers, timeout=timeout, **kwargs)
+
+    def countConnection(self, conn):
+        #Connections without socket connect when the request is sent, including pooled connections that were dropped
+        is_new = getattr(conn, 'sock', None) is None
+
+        with self.lock:
+            if is_new:
+                self.num_new_connections += 1
+            else:
+                self.num_reused_connections += 1
+
+    def getStats(self):
+        with self.lock:
+            return {
+                'pool_size': self.pool_size,
+                'requests': self.num_requests,
+                'new_connections': self.num_new_connections,
+                'reused_connections': self.num_reused_connections
+            }
+
+#Shared HTTP client used by all workers
+HTTP_CLIENT = HttpClient()
+
+class DetailRequests:
+    def __init__(self):
+        #Every selected item gets a new generation, so requests of previously selected items are recognized
+        self.lock           = threading.Lock()
+        self.generation     = 0
+        self.generations    = {}
+
+        #Requests dropped because another item was selected
+        self.num_dropped    = 0
+
+    def newGeneration(self, stream_type):
+        with self.lock:
+            self.generation += 1
+            self.generations[stream_type] = self.generation
+            return self.generation
+
+    def getGeneration(self, stream_type):
+        with self.lock:
+            return self.generations.get(stream_type, 0)
+
+    def isCurrent(self, stream_type, generation):
+        #Requests without generation are always current
+        if generation is None:
+            return True
+
+        with self.lock:
+            return self.generations.get(stream_type, 0) == generation
+
+    def dropStale(self, stream_type, generation):
+        #Returns True when the request is no longer current and should be dropped
+        return self.dropStaleRequests([(stream_type, generation)])
+
+    def dropStaleRequests(self, requests):
+        #Requests shared by several items are only dropped when none of them is current. Requests are (stream type, generation).
+        if any(self.isCurrent(stream_type, generation) for stream_type, generation in list(requests)):
+            return False
+
+        with self.lock:
+            self.num_dropped += 1
+        return True
+
+#Generations of the requests for the info of the selected items
+DETAIL_REQUESTS = DetailRequests()
+
 class FetchDataWorkerSignals(QObject):
-    finished        = pyqtSignal(dict, dict, dict)
+    cache_loaded    = pyqtSignal(dict, dict, dict)
+    finished        = pyqtSignal(dict, dict, dict, dict)
+    ingest_progress = pyqtSignal(str, int)
     error           = pyqtSignal(str)
     progress_bar    = pyqtSignal(int, int, str)
     show_error_msg  = pyqtSignal(str, str)
     show_info_msg   = pyqtSignal(str, str)
 
 class FetchDataWorker(QRunnable):
-    def __init__(self, server, username, password, live_url_format, movie_url_format, series_url_format, parent=None, fetch_vods=True):
+    def __init__(self, server, username, password, live_url_format, movie_url_format, series_url_format, parent=None, fetch_vods=True, parallel_fetch=True, startup_with_cache=False):
         super().__init__()
         self.server            = server
         self.username          = username
@@ -54,9 +256,19 @@ class FetchDataWorker(QRunnable):
         self.movie_url_format  = movie_url_format
         self.series_url_format = series_url_format
         self.fetch_vods        = fetch_vods
+        self.parallel_fetch    = parallel_fetch
+        self.startup_with_cache = startup_with_cache
         self.parent            = parent
         self.signals           = FetchDataWorkerSignals()
 
+        #Validators (ETag, Last-Modified, length and hash) of the cached and fetched sections
+        self.cached_validators  = {}
+        self.section_validators = {}
+
+        #Sections that are the same as the cached sections of this account
+        self.cache_matches_account  = False
+        self.unchanged_sections     = set()
+
     @pyqtSlot()
     def run(self):
         try:
@@ -71,312 +283,111 @@ class FetchDataWorker(QRunnable):
                 'Series': []
             }
 
-            #Create header
-            headers = {
-                "Connection": CONNECTION_HEADER,
-                "Accept-Encoding": CONTENT_HEADER,
-                "User-Agent": self.parent.current_user_agent
-            }
-
-            params = {
-                'username': self.username,
-                'password': self.password,
-                'action': ''
-            }
-
-            host_url = f"{self.server}/player_api.php"
+            self.host_url = f"{self.server}/player_api.php"
 
             print("Going to fetch IPTV data")
 
-            #Get IPTV info
-            self.signals.progress_bar.emit(0, 5, "Fetching IPTV info")
-            try:
-                iptv_info_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-                iptv_info_resp.raise_for_status()
-
-                iptv_info_data = iptv_info_resp.json()
-            except Exception as e:
-                iptv_info_data = {}
-
-                print(f"failed fetching IPTV data: {e}")
+            #Convert cache file of older versions to the binary cache format of this account
+            if not path.isfile(self.parent.cache_file) and path.isfile(self.parent.legacy_cache_file):
+                try:
+                    print("Converting old cache file")
+                    convert_json_cache(self.parent.legacy_cache_file, self.parent.cache_file, self.getAccountKey())
+                    os.remove(self.parent.legacy_cache_file)
+                except Exception as e:
+                    print(f"Failed converting old cache file: {e}")
 
-            #Load cached data
-            cached_data = {}
+            #Load cached data. Only the directory is read, sections are loaded when needed.
+            #If the cache file is damaged, the last good snapshot is loaded.
+            print("Loading cached data")
+            cached_data = open_catalog_cache(self.parent.cache_file)
 
-            #Check if cache file exists
-            if path.isfile(self.parent.cache_file):
-                print("Cache file is there")
+            #Only compare with cached data of this account
+            if cached_data.get('Account', '') == self.getAccountKey():
+                self.cache_matches_account  = True
+                self.cached_validators      = cached_data.get('Validators', {})
 
+            #Show cached data right away and refresh it from the IPTV provider in the background
+            if self.startup_with_cache:
                 try:
-                    print("Loading cached data")
-                    with open(self.parent.cache_file, 'r') as cache_file:
-                        cached_data = json.load(cache_file)
+                    self.emit_cached_data(cached_data)
                 except Exception as e:
-                    cached_data = {}
-
-                    # self.signals.show_error_msg.emit('Failed loading cache file', 
-                    #         "Failed loading cache file.\n"
-                    #         "Please check if it is empty or corrupted.")
-                    print("Failed loading cache file. Please check if it is empty or corrupted.")
+                    print(f"Failed showing cached data: {e}")
 
             config = configparser.ConfigParser()
             config.read(self.parent.user_data_file)
 
             if 'Debug' in config and config['Debug']['load_with_cache'] == 'True':   #For testing purposes only
+                #Get IPTV info
+                self.signals.progress_bar.emit(0, 5, "Fetching IPTV info")
+                iptv_info_data = self.fetch_iptv_info()
+
                 categories_per_stream_type['LIVE'] = cached_data['LIVE categories']
                 categories_per_stream_type['Movies'] = cached_data['Movies categories']
                 categories_per_stream_type['Series'] = cached_data['Series categories']
                 entries_per_stream_type['LIVE'] = cached_data['LIVE']
                 entries_per_stream_type['Movies'] = cached_data['Movies']
                 entries_per_stream_type['Series'] = cached_data['Series']
-            else:
-                #Get all category data
-                print("Fetching Live TV categories")
-                self.signals.progress_bar.emit(5, 10, "Fetching LIVE Categories")
-                try:
-                    params['action'] = 'get_live_categories'
-                    live_category_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-                    live_category_resp.raise_for_status()  #Raises HTTP error is status is 4xx or 5xx
 
-                    categories_per_stream_type['LIVE'] = live_category_resp.json()
-                except Exception as e:
-                    print(f"failed fetching LIVE categories: {e}")
-
-                    if cached_data.get('LIVE categories', 0):
-                        print("Getting LIVE categories from cache")
-                        categories_per_stream_type['LIVE'] = cached_data['LIVE categories']
-
-                        #Notify user that data is fetched from cache file
-                        # self.signals.show_info_msg.emit('Getting IPTV data from cache', 
-                        #     "Couldn't get Live TV categories from IPTV provider.\n"
-                        #     "Please check your internet connection or if IPTV server is still online.\n"
-                        #     "Fortunately, Live TV categories could be loaded from cache.")
-                        print("Failed fetching Live TV categories. Got them from cache.")
+                changes = {}
+            else:
+                #Only fetch the LIVE sections if VODs are disabled
+                sections = [section for section in FETCH_SECTIONS if self.fetch_vods or section['stream_type'] == 'LIVE']
+
+                if self.parallel_fetch:
+                    iptv_info_data, fetched_data = self.fetch_sections_parallel(sections, cached_data)
+                else:
+                    iptv_info_data, fetched_data = self.fetch_sections_sequential(sections, cached_data)
+
+                #Put fetched data in the category and streaming entries
+                for section in sections:
+                    if section['is_category']:
+                        categories_per_stream_type[section['stream_type']] = fetched_data[section['cache_key']]
                     else:
-                        #Display error msg that data fetching failed
-                        # self.signals.show_error_msg.emit('Failed fetching data from IPTV provider', 
-                        #     "Couldn't get Live TV categories from IPTV provider.\n"
-                        #     "Please check your internet connection or if IPTV server is still online.")
-                        print("Failed fetching Live TV categories")
-
-                if self.fetch_vods:
-                    print("Fetching Movies categories")
-                    self.signals.progress_bar.emit(10, 20, "Fetching VOD Categories")
-                    try:
-                        params['action'] = 'get_vod_categories'
-                        movies_category_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-                        movies_category_resp.raise_for_status()  #Raises HTTP error is status is 4xx or 5xx
-
-                        categories_per_stream_type['Movies'] = movies_category_resp.json()
-                    except Exception as e:
-                        print(f"failed fetching VOD categories: {e}")
-
-                        if cached_data.get('Movies categories', 0):
-                            print("Getting Movies categories from cache")
-                            categories_per_stream_type['Movies'] = cached_data['Movies categories']
-
-                            #Notify user that data is fetched from cache file
-                            # self.signals.show_info_msg.emit('Getting IPTV data from cache', 
-                            #     "Couldn't get Movies categories from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.\n"
-                            #     "Fortunately, Movies categories could be loaded from cache.")
-                            print("Failed fetching Movies categories. Got them from cache.")
-                        else:
-                            #Display error msg that data fetching failed
-                            # self.signals.show_error_msg.emit('Failed fetching data from IPTV provider', 
-                            #     "Couldn't get Movies categories from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.")
-                            print("Failed fetching Movies categories")
-
-                if self.fetch_vods:
-                    print("Fetching Series categories")
-                    self.signals.progress_bar.emit(20, 30, "Fetching Series Categories")
-                    try:
-                        params['action'] = 'get_series_categories'
-                        series_category_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-                        series_category_resp.raise_for_status()  #Raises HTTP error is status is 4xx or 5xx
-
-                        categories_per_stream_type['Series'] = series_category_resp.json()
-                    except Exception as e:
-                        print(f"failed fetching Series categories: {e}")
-
-                        if cached_data.get('Series categories', 0):
-                            print("Getting Series categories from cache")
-                            categories_per_stream_type['Series'] = cached_data['Series categories']
-
-                            #Notify user that data is fetched from cache file
-                            # self.signals.show_info_msg.emit('Getting IPTV data from cache', 
-                            #     "Couldn't get Series categories from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.\n"
-                            #     "Fortunately, Series categories could be loaded from cache.")
-                            print("Failed fetching Series categories. Got them from cache.")
-                        else:
-                            #Display error msg that data fetching failed
-                            # self.signals.show_error_msg.emit('Failed fetching data from IPTV provider', 
-                            #     "Couldn't get Series categories from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.")
-                            print("Failed fetching Series categories")
-
-                print("Fetching Live TV streaming data")
-                #Get all streaming data
-                self.signals.progress_bar.emit(30, 40, "Fetching LIVE Streaming data")
-                try:
-                    params['action'] = 'get_live_streams'
-                    live_streams_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-                    live_streams_resp.raise_for_status()  #Raises HTTP error is status is 4xx or 5xx
+                        entries_per_stream_type[section['stream_type']] = fetched_data[section['cache_key']]
 
-                    entries_per_stream_type['LIVE'] = live_streams_resp.json()
-                except Exception as e:
-                    print(f"failed fetching LIVE streams: {e}")
-
-                    if cached_data.get('LIVE', 0):
-                        print("Getting LIVE streams from cache")
-                        entries_per_stream_type['LIVE'] = cached_data['LIVE']
-
-                        #Notify user that data is fetched from cache file
-                        # self.signals.show_info_msg.emit('Getting IPTV data from cache', 
-                        #     "Couldn't get Live TV streams from IPTV provider.\n"
-                        #     "Please check your internet connection or if IPTV server is still online.\n"
-                        #     "Fortunately, Live TV streams could be loaded from cache.")
-                        print("Failed fetching Live TV streams. Got them from cache.")
-                    else:
-                        #Display error msg that data fetching failed
-                        # self.signals.show_error_msg.emit('Failed fetching data from IPTV provider', 
-                        #     "Couldn't get Live TV streams from IPTV provider.\n"
-                        #     "Please check your internet connection or if IPTV server is still online.")
-                        print("Failed fetching Live TV streams")
-
-                if self.fetch_vods:
-                    print("Fetching Movies streaming data")
-                    self.signals.progress_bar.emit(40, 60, "Fetching VOD Streaming data")
-                    try:
-                        params['action'] = 'get_vod_streams'
-                        movies_streams_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-                        movies_streams_resp.raise_for_status()  #Raises HTTP error is status is 4xx or 5xx
-
-                        entries_per_stream_type['Movies'] = movies_streams_resp.json()
-                    except Exception as e:
-                        print(f"failed fetching VOD streams: {e}")
-
-                        if cached_data.get('Movies', 0):
-                            print("Getting Movies streams from cache")
-                            entries_per_stream_type['Movies'] = cached_data['Movies']
-
-                            #Notify user that data is fetched from cache file
-                            # self.signals.show_info_msg.emit('Getting IPTV data from cache', 
-                            #     "Couldn't get Movies streams from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.\n"
-                            #     "Fortunately, Movies streams could be loaded from cache.")
-                            print("Failed fetching Movies streams. Got them from cache.")
-                        else:
-                            #Display error msg that data fetching failed
-                            # self.signals.show_error_msg.emit('Failed fetching data from IPTV provider', 
-                            #     "Couldn't get Movies streams from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.")
-                            print("Failed fetching Live TV streams")
-
-                if self.fetch_vods:
-                    print("Fetching Series streaming data")
-                    self.signals.progress_bar.emit(60, 80, "Fetching Series Streaming data")
-                    try:
-                        params['action'] = 'get_series'
-                        series_streams_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-                        series_streams_resp.raise_for_status()  #Raises HTTP error is status is 4xx or 5xx
-
-                        entries_per_stream_type['Series'] = series_streams_resp.json()
-                    except Exception as e:
-                        print(f"failed fetching Series streams: {e}")
-
-                        if cached_data.get('Series', 0):
-                            print("Getting Series streams from cache")
-                            entries_per_stream_type['Series'] = cached_data['Series']
-
-                            #Notify user that data is fetched from cache file
-                            # self.signals.show_info_msg.emit('Getting IPTV data from cache', 
-                            #     "Couldn't get Series streams from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.\n"
-                            #     "Fortunately, Series streams could be loaded from cache.")
-                            print("Failed fetching Series streams. Got them from cache.")
-                        else:
-                            #Display error msg that data fetching failed
-                            # self.signals.show_error_msg.emit('Failed fetching data from IPTV provider', 
-                            #     "Couldn't get Series streams from IPTV provider.\n"
-                            #     "Please check your internet connection or if IPTV server is still online.")
-                            print("Failed fetching Series streams")
+                #Check what has changed compared to the cached data
+                changes = self.get_changes(sections, cached_data, categories_per_stream_type, entries_per_stream_type)
 
                 print("going to create cached data")
 
-                all_cached_data = json.dumps({
+                #Unchanged sections are copied from the old cache file without encoding them again
+                write_catalog_cache(self.parent.cache_file, {
+                        'Account': self.getAccountKey(),
+                        'IPTV info': iptv_info_data,
+                        'Validators': self.section_validators,
                         'LIVE categories': categories_per_stream_type['LIVE'],
                         'Movies categories': categories_per_stream_type['Movies'],
                         'Series categories': categories_per_stream_type['Series'],
                         'LIVE': entries_per_stream_type['LIVE'],
                         'Movies': entries_per_stream_type['Movies'],
                         'Series': entries_per_stream_type['Series']
-                    }, 
-                    indent=4)
-
-                with open(self.parent.cache_file, 'w') as cache_file:
-                    cache_file.write(all_cached_data)
+                    }, cached_data, self.unchanged_sections)
 
             # self.set_progress_bar(100, "Finished loading data")
             self.signals.progress_bar.emit(80, 100, "Finished Fetching data")
 
-            fav_data = {}
+            print("Preparing streaming data")
+            self.prepare_entries(entries_per_stream_type, self.load_favorites())
 
-            #Check if cache file exists
-            if path.isfile(self.parent.favorites_file):
-                print("Favorites file is there")
+            #Refresh indexed catalog store, unless it already contains the same data
+            catalog_changed = not changes or any(change['categories_changed'] or change['entries_changed'] for change in changes.values())
 
-                with open(self.parent.favorites_file, 'r') as fav_file:
-                    fav_data = json.load(fav_file)
+            if self.parent.catalog_store:
+                try:
+                    if catalog_changed or not self.catalog_store_matches(categories_per_stream_type, entries_per_stream_type):
+                        print("Refreshing catalog store")
+                        self.parent.catalog_store.replaceCatalog(self.getAccountKey(), categories_per_stream_type, entries_per_stream_type)
+                except Exception as e:
+                    print(f"Failed refreshing catalog store: {e}")
 
-            print("Preparing streaming data")
-            #Make streaming URL in each entry except for the series
-            for tab_name in entries_per_stream_type.keys():
-                for idx, entry in enumerate(entries_per_stream_type[tab_name]):
-                    #Get stream type. If no stream_type is found it is series
-                    stream_type         = entry.get('stream_type', 'series')
-                    stream_id           = entry.get("stream_id", -1)
-                    series_id           = entry.get("series_id", -1)
-                    container_extension = entry.get("container_extension", "m3u8")
-
-                    #Correct for any vague other stream types. Series stream type is already fixed by code above.
-                    if "live" in stream_type:
-                        stream_type = "live"
-
-                    if "movie" in stream_type:
-                        stream_type = "movie"
-
-                    #Check if stream_id is valid
-                    if stream_id:
-                        entries_per_stream_type[tab_name][idx]["url"] = self.generate_url(stream_type, stream_id, container_extension)
-
-                        #Check if stream id is in favorites list in userdata.ini
-                        if stream_id in fav_data.get('stream_ids', []):
-                            #Add "favorite" parameter to entries_per_stream_type and set to True or False depending if inside userdata.ini
-                            entries_per_stream_type[tab_name][idx]['favorite'] = True
-                        else:
-                            entries_per_stream_type[tab_name][idx]['favorite'] = False
-                    else:
-                        entries_per_stream_type[tab_name][idx]["url"] = None
-
-                    #Check if stream type is series
-                    if stream_type == 'series':
-                        #Create stream type key for series data
-                        entries_per_stream_type[tab_name][idx]["stream_type"] = stream_type
-
-                        #Check if series_id is valid
-                        if series_id:
-                            #Check if series id is in favorites list in userdata.ini
-                            if series_id in fav_data.get('series_ids', []):
-                                #Add "favorite" parameter to entries_per_stream_type and set to True or False depending if inside userdata.ini
-                                entries_per_stream_type[tab_name][idx]['favorite'] = True
-                            else:
-                                entries_per_stream_type[tab_name][idx]['favorite'] = False
+            #Keep the caches of all accounts within the disk budget
+            try:
+                evict_account_caches(self.parent.cache_dir, self.parent.cache_max_size_mb * 1e6, self.parent.cache_name)
+            except Exception as e:
+                print(f"Failed evicting account caches: {e}")
 
             #Send received data to processing function
-            self.signals.finished.emit(iptv_info_data, categories_per_stream_type, entries_per_stream_type)
+            self.signals.finished.emit(iptv_info_data, categories_per_stream_type, entries_per_stream_type, changes)
 
             print("Finished downloading IPTV data")
 
@@ -384,6 +395,327 @@ class FetchDataWorker(QRunnable):
             print(f"Exception! {e}")
             self.signals.error.emit(str(e))
 
+    def getAccountKey(self):
+        #Cached data is only valid for the account it was fetched with
+        return f"{self.server}|{self.username}"
+
+    def emit_cached_data(self, cached_data):
+        #Check if the cache belongs to this account
+        if cached_data.get('Account', '') != self.getAccountKey():
+            print("No cached data available for this account")
+            return
+
+        #Only LIVE sections are needed if VODs are disabled
+        sections = [section for section in FETCH_SECTIONS if self.fetch_vods or section['stream_type'] == 'LIVE']
+
+        #Check if cache contains all sections
+        if not all(section['cache_key'] in cached_data for section in sections):
+            print("Cached data is incomplete")
+            return
+
+        categories_per_stream_type = {
+            'LIVE': [],
+            'Movies': [],
+            'Series': []
+        }
+        entries_per_stream_type = {
+            'LIVE': [],
+            'Movies': [],
+            'Series': []
+        }
+
+        for section in sections:
+            if section['is_category']:
+                categories_per_stream_type[section['stream_type']] = cached_data[section['cache_key']]
+            else:
+                #Copy entries, so the cached entries stay unchanged for comparing with the fetched entries
+                entries_per_stream_type[section['stream_type']] = [dict(entry) for entry in cached_data[section['cache_key']]]
+
+        self.prepare_entries(entries_per_stream_type, self.load_favorites())
+
+        print("Showing cached data while refreshing")
+        self.signals.cache_loaded.emit(cached_data.get('IPTV info', {}), categories_per_stream_type, entries_per_stream_type)
+
+    def load_favorites(self):
+        #Load favorites file, or the last good snapshot if it is damaged
+        return load_json_file(self.parent.favorites_file, {})
+
+    def prepare_entries(self, entries_per_stream_type, fav_data):
+        #Make streaming URL in each entry except for the series
+        for tab_name in entries_per_stream_type.keys():
+            for idx, entry in enumerate(entries_per_stream_type[tab_name]):
+                #Get stream type. If no stream_type is found it is series
+                stream_type         = entry.get('stream_type', 'series')
+                stream_id           = entry.get("stream_id", -1)
+                series_id           = entry.get("series_id", -1)
+                container_extension = entry.get("container_extension", "m3u8")
+
+                #Correct for any vague other stream types. Series stream type is already fixed by code above.
+                if "live" in stream_type:
+                    stream_type = "live"
+
+                if "movie" in stream_type:
+                    stream_type = "movie"
+
+                #Check if stream_id is valid
+                if stream_id:
+                    entries_per_stream_type[tab_name][idx]["url"] = self.generate_url(stream_type, stream_id, container_extension)
+
+                    #Check if stream id is in favorites list in userdata.ini
+                    if stream_id in fav_data.get('stream_ids', []):
+                        #Add "favorite" parameter to entries_per_stream_type and set to True or False depending if inside userdata.ini
+                        entries_per_stream_type[tab_name][idx]['favorite'] = True
+                    else:
+                        entries_per_stream_type[tab_name][idx]['favorite'] = False
+                else:
+                    entries_per_stream_type[tab_name][idx]["url"] = None
+
+                #Check if stream type is series
+                if stream_type == 'series':
+                    #Create stream type key for series data
+                    entries_per_stream_type[tab_name][idx]["stream_type"] = stream_type
+
+                    #Check if series_id is valid
+                    if series_id:
+                        #Check if series id is in favorites list in userdata.ini
+                        if series_id in fav_data.get('series_ids', []):
+                            #Add "favorite" parameter to entries_per_stream_type and set to True or False depending if inside userdata.ini
+                            entries_per_stream_type[tab_name][idx]['favorite'] = True
+                        else:
+                            entries_per_stream_type[tab_name][idx]['favorite'] = False
+
+    def fetch_iptv_info(self):
+        params = {
+            'username': self.username,
+            'password': self.password,
+            'action': ''
+        }
+
+        try:
+            iptv_info_resp = HTTP_CLIENT.get(self.host_url, params=params)
+            iptv_info_resp.raise_for_status()
+
+            iptv_info_data = iptv_info_resp.json()
+        except Exception as e:
+            iptv_info_data = {}
+
+            print(f"failed fetching IPTV data: {e}")
+
+        return iptv_info_data
+
+    def fetch_section(self, section, cached_data):
+        cache_key = section['cache_key']
+
+        params = {
+            'username': self.username,
+            'password': self.password,
+            'action': section['action']
+        }
+
+        #Ask the IPTV provider to only send the section if it has changed since it was cached
+        cached_section  = cached_data.get(cache_key) if cache_key in self.cached_validators else None
+        validators      = self.cached_validators[cache_key] if cached_section is not None else {}
+
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        print(f"Fetching {section['name']}")
+        try:
+            section_resp = HTTP_CLIENT.get(self.host_url, params=params, headers=headers, stream=section['streamed'])
+
+            with section_resp:
+                #Section has not been modified
+                if section_resp.status_code == 304 and validators:
+                    print(f"{section['name']} not modified. Got them from cache.")
+                    return self.use_cached_section(cache_key, cached_section, validators)
+
+                section_resp.raise_for_status()  #Raises HTTP error is status is 4xx or 5xx
+
+                if section['streamed']:
+                    section_data, content_length, content_hash = self.parse_section_stream(section, section_resp, validators)
+                else:
+                    content         = section_resp.content
+                    content_length  = len(content)
+                    content_hash    = hashlib.sha1(content).hexdigest()
+                    section_data    = None
+
+            new_validators = {
+                'etag': section_resp.headers.get('ETag'),
+                'last_modified': section_resp.headers.get('Last-Modified'),
+                'length': content_length,
+                'sha1': content_hash
+            }
+
+            #Use cached section if the content is the same, so it doesn't have to be parsed or updated
+            if validators and new_validators['length'] == validators.get('length') and new_validators['sha1'] == validators.get('sha1'):
+                print(f"{section['name']} unchanged. Got them from cache.")
+                return self.use_cached_section(cache_key, cached_section, new_validators)
+
+            self.section_validators[cache_key] = new_validators
+
+            if section_data is None:
+                section_data = json.loads(content)
+
+            return section_data
+        except Exception as e:
+            print(f"failed fetching {section['name']}: {e}")
+
+            #Fall back to the cached data of only this section, never to the data of another account
+            if self.cache_matches_account and cached_data.get(cache_key, 0):
+                print(f"Failed fetching {section['name']}. Got them from cache.")
+                return self.use_cached_section(cache_key, cached_data[cache_key], self.cached_validators.get(cache_key, {}))
+            else:
+                print(f"Failed fetching {section['name']}")
+                self.signals.error.emit(f"Failed fetching {section['name']}: {e}")
+                return []
+
+    def parse_section_stream(self, section, section_resp, validators=None):
+        #Returns the parsed entries, or None if the content is the same as the cached section
+        content_hash    = hashlib.sha1()
+        content_length  = 0
+
+        def read_chunks():
+            nonlocal content_length
+
+            for chunk in section_resp.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                content_hash.update(chunk)
+                content_length += len(chunk)
+                yield chunk
+
+        chunks = read_chunks()
+
+        #With a cached section, the response is read and hashed before parsing, so an unchanged section is never parsed
+        if validators and validators.get('sha1'):
+            chunks = list(chunks)
+
+            if content_length == validators.get('length') and content_hash.hexdigest() == validators['sha1']:
+                return None, content_length, content_hash.hexdigest()
+
+            chunks = iter(chunks)
+
+        entries = []
+
+        #Only keep the used fields of each entry
+        for entry in iter_json_array(chunks):
+            entries.append(project_entry(entry))
+
+            if len(entries) % STREAM_PROGRESS_BATCH == 0:
+                self.signals.ingest_progress.emit(section['name'], len(entries))
+
+        #Read the rest of the response, so the hash is complete and the connection can be reused
+        for chunk in chunks:
+            pass
+
+        return entries, content_length, content_hash.hexdigest()
+
+    def use_cached_section(self, cache_key, cached_section, validators):
+        self.section_validators[cache_key] = validators
+        self.unchanged_sections.add(cache_key)
+
+        return cached_section
+
+    def get_changes(self, sections, cached_data, categories_per_stream_type, entries_per_stream_type):
+        changes = {}
+
+        for stream_type in entries_per_stream_type.keys():
+            stream_type_sections = [section for section in sections if section['stream_type'] == stream_type]
+            if not stream_type_sections:
+                continue
+
+            categories_changed  = any(section['cache_key'] not in self.unchanged_sections for section in stream_type_sections if section['is_category'])
+            entries_changed     = any(section['cache_key'] not in self.unchanged_sections for section in stream_type_sections if not section['is_category'])
+
+            #Get added, removed and modified entries compared to the cached entries
+            diff = None
+            if entries_changed and self.cache_matches_account:
+                id_key = 'series_id' if stream_type == 'Series' else 'stream_id'
+                diff = self.diff_entries(cached_data.get(stream_type), entries_per_stream_type[stream_type], id_key)
+
+            changes[stream_type] = {
+                'categories_changed': categories_changed,
+                'entries_changed': entries_changed,
+                'diff': diff
+            }
+
+            if diff:
+                print(f"{stream_type} changes: {len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['modified'])} modified")
+
+        return changes
+
+    def diff_entries(self, old_entries, new_entries, id_key):
+        if old_entries is None:
+            return None
+
+        old_entries_by_id = {entry.get(id_key): entry for entry in old_entries}
+        new_entries_by_id = {entry.get(id_key): entry for entry in new_entries}
+
+        #Entries can only be matched if ids are unique
+        if len(old_entries_by_id) != len(old_entries) or len(new_entries_by_id) != len(new_entries):
+            return None
+
+        return {
+            'added': [item_id for item_id in new_entries_by_id if item_id not in old_entries_by_id],
+            'removed': [item_id for item_id in old_entries_by_id if item_id not in new_entries_by_id],
+            'modified': [item_id for item_id, entry in new_entries_by_id.items() if item_id in old_entries_by_id and old_entries_by_id[item_id] != entry]
+        }
+
+    def catalog_store_matches(self, categories_per_stream_type, entries_per_stream_type):
+        catalog_store = self.parent.catalog_store
+
+        if catalog_store.getAccount() != self.getAccountKey():
+            return False
+
+        return all(catalog_store.countCategories(stream_type) == len(categories_per_stream_type[stream_type]) and
+                catalog_store.countStreams(stream_type) == len(entries_per_stream_type[stream_type])
+                for stream_type in entries_per_stream_type.keys())
+
+    def fetch_sections_sequential(self, sections, cached_data):
+        fetched_data = {}
+
+        #Get IPTV info
+        self.signals.progress_bar.emit(0, 5, "Fetching IPTV info")
+        iptv_info_data = self.fetch_iptv_info()
+
+        #Fetch each section one after another
+        for section in sections:
+            self.signals.progress_bar.emit(section['progress'][0], section['progress'][1], f"Fetching {section['name']}")
+            fetched_data[section['cache_key']] = self.fetch_section(section, cached_data)
+
+        return iptv_info_data, fetched_data
+
+    def fetch_sections_parallel(self, sections, cached_data):
+        fetched_data    = {}
+        num_of_requests = len(sections) + 1     #Sections plus IPTV info
+        num_finished    = 0
+
+        self.signals.progress_bar.emit(0, 5, f"Fetching IPTV data ({num_of_requests} requests)")
+
+        #Run all requests at the same time with a bounded number of workers
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_FETCH_WORKERS, num_of_requests))) as executor:
+            iptv_info_future = executor.submit(self.fetch_iptv_info)
+            futures = {executor.submit(self.fetch_section, section, cached_data): section for section in sections}
+            futures[iptv_info_future] = None
+
+            #Report progress of each section as soon as it finishes
+            for future in as_completed(futures):
+                section = futures[future]
+                num_finished += 1
+
+                if section:
+                    fetched_data[section['cache_key']] = future.result()
+                    finished_text = f"Fetched {section['name']}"
+                else:
+                    finished_text = "Fetched IPTV info"
+
+                prev_perc = 5 + ((num_finished - 1) * 75) // num_of_requests
+                perc      = 5 + (num_finished * 75) // num_of_requests
+                self.signals.progress_bar.emit(prev_perc, perc, f"{finished_text} ({num_finished} of {num_of_requests})")
+
+        return iptv_info_future.result(), fetched_data
+
     def generate_url(self, stream_type, stream_id, container_extension):
         # Select the appropriate format string
         if stream_type == 'live':
@@ -408,31 +740,33 @@ class FetchDataWorker(QRunnable):
             container_extension=container_extension
         )
 
-class MovieInfoFetcherSignals(QObject):
-    finished    = pyqtSignal(dict, dict)
-    error       = pyqtSignal(str)
+class InfoFetcherSignals(QObject):
+    #Info type, item id and info data
+    finished    = pyqtSignal(str, object, dict)
+    dropped     = pyqtSignal(str, object)
+    error       = pyqtSignal(str, object, str)
 
 class MovieInfoFetcher(QRunnable):
-    def __init__(self, server, username, password, vod_id, parent=None):
+    def __init__(self, server, username, password, vod_id, parent=None, requests=None):
         super().__init__()
         self.server     = server
         self.username   = username
         self.password   = password
         self.vod_id     = vod_id
         self.parent     = parent
-        self.signals    = MovieInfoFetcherSignals()
+
+        #Requests waiting for this info, more can be added until it is started
+        self.requests   = requests or []
+        self.signals    = InfoFetcherSignals()
 
     @pyqtSlot()
     def run(self):
         try:
-            #Set request parameters
-            # headers = {'User-Agent': CUSTOM_USER_AGENT}
-            #Create header
-            headers = {
-                "Connection": CONNECTION_HEADER,
-                "Accept-Encoding": CONTENT_HEADER,
-                "User-Agent": self.parent.current_user_agent
-            }
+            #Drop request when another movie was selected before it started
+            if self.requests and DETAIL_REQUESTS.dropStaleRequests(self.requests):
+                self.signals.dropped.emit('vod', self.vod_id)
+                return
+
             host_url = f"{self.server}/player_api.php"
             params = {
                 'username': self.username,
@@ -442,7 +776,7 @@ class MovieInfoFetcher(QRunnable):
             }
 
             #Request vod info
-            vod_info_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
+            vod_info_resp = HTTP_CLIENT.get(host_url, params=params)
 
             #Get vod info data
             vod_info_data = vod_info_resp.json()
@@ -459,37 +793,32 @@ class MovieInfoFetcher(QRunnable):
                 vod_data = {}
 
             #Return movie info data
-            self.signals.finished.emit(vod_info, vod_data)
+            self.signals.finished.emit('vod', self.vod_id, {'info': vod_info, 'movie_data': vod_data})
         except Exception as e:
             print(f"Failed fetching movie info: {e}")
-            self.signals.error.emit(str(e))
-
-class SeriesInfoFetcherSignals(QObject):
-    finished    = pyqtSignal(dict, bool)
-    error       = pyqtSignal(str)
+            self.signals.error.emit('vod', self.vod_id, str(e))
 
 class SeriesInfoFetcher(QRunnable):
-    def __init__(self, server, username, password, series_id, is_show_request, parent=None):
+    def __init__(self, server, username, password, series_id, parent=None, requests=None):
         super().__init__()
         self.server             = server
         self.username           = username
         self.password           = password
         self.series_id          = series_id
-        self.is_show_request    = is_show_request
         self.parent             = parent
-        self.signals            = SeriesInfoFetcherSignals()
+
+        #Requests waiting for this info, e.g. showing the series info and showing its seasons
+        self.requests           = requests or []
+        self.signals            = InfoFetcherSignals()
 
     @pyqtSlot()
     def run(self):
         try:
-            #Set request parameters
-            # headers = {'User-Agent': CUSTOM_USER_AGENT}
-            #Create header
-            headers = {
-                "Connection": CONNECTION_HEADER,
-                "Accept-Encoding": CONTENT_HEADER,
-                "User-Agent": self.parent.current_user_agent
-            }
+            #Drop request when another series was selected before it started
+            if self.requests and DETAIL_REQUESTS.dropStaleRequests(self.requests):
+                self.signals.dropped.emit('series', self.series_id)
+                return
+
             host_url = f"{self.server}/player_api.php"
             params = {
                 'username': self.username,
@@ -499,7 +828,7 @@ class SeriesInfoFetcher(QRunnable):
             }
 
             #Request series info
-            series_info_resp = requests.get(host_url, params=params, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
+            series_info_resp = HTTP_CLIENT.get(host_url, params=params)
 
             #Get series info data
             series_info_data = series_info_resp.json()
@@ -509,192 +838,401 @@ class SeriesInfoFetcher(QRunnable):
                 series_info_data = {}
 
             #Return series info data
-            self.signals.finished.emit(series_info_data, self.is_show_request)
+            self.signals.finished.emit('series', self.series_id, series_info_data)
         except Exception as e:
             print(f"Failed fetching series info: {e}")
-            self.signals.error.emit(str(e))
+            self.signals.error.emit('series', self.series_id, str(e))
         
 class ImageFetcherSignals(QObject):
-    finished    = pyqtSignal(QPixmap, str)
+    finished    = pyqtSignal(QImage, str, str, bool, int)
     error       = pyqtSignal(str)
 
 class ImageFetcher(QRunnable):
-    def __init__(self, img_url, stream_type, parent=None):
+    def __init__(self, img_url, stream_type, width, parent=None, image_cache=None, generation=None, height=None, data_size=None):
         super().__init__()
         self.img_url        = img_url
         self.stream_type    = stream_type
+
+        #Images are scaled to the width, or to fit in width and height when a height is given
+        self.width          = width
+        self.height         = height
+
+        #When given, the scaled image is kept on disk under this size instead of the downloaded image, e.g. thumbnails
+        self.data_size      = data_size
         self.parent         = parent
+        self.image_cache    = image_cache
+        self.generation     = generation
         self.signals        = ImageFetcherSignals()
 
-    @pyqtSlot()
-    def run(self):
-        try:
-            #Set header for request
-            # headers = {'User-Agent': CUSTOM_USER_AGENT}
-            #Create header
-            headers = {
-                "Connection": CONNECTION_HEADER,
-                "Accept-Encoding": CONTENT_HEADER,
-                "User-Agent": self.parent.current_user_agent
-            }
+    def getScaledSize(self, size):
+        scaled_size = QSize(self.width, max(1, round(size.height() * self.width / size.width())))
 
-            #Request image
-            image_resp = requests.get(self.img_url, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
+        if self.height and scaled_size.height() > self.height:
+            scaled_size = QSize(max(1, round(size.width() * self.height / size.height())), self.height)
 
-            #Check if response code is valid, otherwise set replacement image
-            resp_status = image_resp.status_code
-            if resp_status == 404:
-                #Set 404 error as image
-                image = QPixmap(self.parent.path_to_404_img)
+        return scaled_size
 
-            elif not resp_status == 200:
-                #Set no image
-                image = QPixmap(self.parent.path_to_no_img)
+    def scaleImage(self, image):
+        #Images are made ready to show here, QPixmaps can only be used in the GUI thread
+        if image.isNull() or image.width() <= 0:
+            return image
 
-            else:
-                #Create QPixmap from image data
-                image = QPixmap()
-                image.loadFromData(image_resp.content)  #Don't combine this with the previous line, then it doesn't work
+        scaled_size = self.getScaledSize(image.size())
+        if image.size() == scaled_size:
+            return image
+
+        return image.scaled(scaled_size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+    def decodeImage(self, image_data):
+        buffer = QBuffer()
+        buffer.setData(QByteArray(image_data))
+        buffer.open(QIODevice.ReadOnly)
+
+        #Decode straight to the shown size, so large posters are never decoded at full size
+        reader = QImageReader(buffer)
+        size = reader.size()
+        if size.isValid() and size.width() > 0:
+            reader.setScaledSize(self.getScaledSize(size))
 
-            #Check if Pixmap is valid
+        return self.scaleImage(reader.read())
+
+    def encodeImage(self, image):
+        #Scaled image data to keep on disk, small enough to keep many of them
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+
+        image_format = "PNG" if image.hasAlphaChannel() else "JPG"
+        if not image.save(buffer, image_format, SCALED_IMAGE_QUALITY):
+            return None
+
+        return bytes(buffer.data())
+
+    def emitPlaceholder(self, placeholder):
+        #Don't request the image again for a while
+        if self.image_cache:
+            self.image_cache.putNegative(self.img_url, placeholder)
+
+        self.signals.finished.emit(self.scaleImage(QImage(placeholder)), self.stream_type, self.img_url, True, self.generation or 0)
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            #Drop request when another item was selected before it started
+            if DETAIL_REQUESTS.dropStale(self.stream_type, self.generation):
+                return
+
+            #Use scaled image made before, it doesn't need to be scaled again
+            if self.image_cache and self.data_size:
+                scaled_data = self.image_cache.readData(self.img_url, self.data_size, count_miss=False)
+                if scaled_data is not None:
+                    image = self.decodeImage(scaled_data)
+                    if not image.isNull():
+                        self.signals.finished.emit(image, self.stream_type, self.img_url, False, self.generation or 0)
+                        return
+
+            #Use image downloaded before
+            image_data = self.image_cache.readData(self.img_url) if self.image_cache else None
+            from_cache = image_data is not None
+
+            if not from_cache:
+                #Request image
+                image_resp = HTTP_CLIENT.get(self.img_url, for_images=True)
+
+                #Check if response code is valid, otherwise set replacement image
+                resp_status = image_resp.status_code
+                if resp_status == 404:
+                    #Set 404 error as image
+                    self.emitPlaceholder(self.parent.path_to_404_img)
+                    return
+
+                elif not resp_status == 200:
+                    #Set no image
+                    self.emitPlaceholder(self.parent.path_to_no_img)
+                    return
+
+                image_data = image_resp.content
+
+            #Create scaled image from image data
+            image = self.decodeImage(image_data)
+
+            #Check if image is valid
             if image.isNull():
-                image = QPixmap(self.parent.path_to_no_img)
+                self.emitPlaceholder(self.parent.path_to_no_img)
+                return
+
+            #Keep scaled image on disk, or else the downloaded image
+            if self.image_cache and self.data_size:
+                scaled_data = self.encodeImage(image)
+                if scaled_data:
+                    self.image_cache.writeData(self.img_url, scaled_data, self.data_size)
+
+            elif self.image_cache and not from_cache:
+                self.image_cache.writeData(self.img_url, image_data)
 
             #Emit image
-            self.signals.finished.emit(image, self.stream_type)
+            self.signals.finished.emit(image, self.stream_type, self.img_url, False, self.generation or 0)
         except Exception as e:
             print(f"Failed fetching image: {e}")
 
-            #Emit no image placeholder
-            image = QPixmap(self.parent.path_to_no_img)
-            self.signals.finished.emit(image, self.stream_type)
+            #Emit no image placeholder, not cached as the connection may work again next time
+            image = self.scaleImage(QImage(self.parent.path_to_no_img))
+            self.signals.finished.emit(image, self.stream_type, self.img_url, True, self.generation or 0)
+            self.signals.error.emit(str(e))
+
+class ListIndexWorkerSignals(QObject):
+    finished    = pyqtSignal(str, object, object, object, object, object)
+    error       = pyqtSignal(str)
+
+class ListIndexWorker(QRunnable):
+    def __init__(self, stream_type, categories, entries):
+        super().__init__()
+        self.stream_type    = stream_type
+        self.categories     = categories
+        self.entries        = entries
+        self.signals        = ListIndexWorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            start_time = time.time()
+
+            category_names  = [category.get('category_name', '') for category in self.categories]
+            entry_names     = [entry.get('name', '') for entry in self.entries]
+
+            search_index = {
+                'category': SearchIndex(category_names),
+                'streaming': SearchIndex(entry_names)
+            }
+
+            sort_index = {
+                'category': SortIndex(category_names),
+                'streaming': SortIndex(entry_names)
+            }
+
+            field_columns = FieldColumns(self.entries)
+
+            print(f"Built {self.stream_type} search and sort indexes in {time.time() - start_time:.2f}s")
+
+            #Also send the indexed data, so the indexes can be dropped if the data has been replaced in the meantime
+            self.signals.finished.emit(self.stream_type, self.categories, self.entries, search_index, sort_index, field_columns)
+
+        except Exception as e:
+            print(f"Failed building list indexes: {e}")
             self.signals.error.emit(str(e))
 
 class SearchWorkerSignals(QObject):
-    list_widget = pyqtSignal(list, str)
-    error = pyqtSignal(str)
+    finished    = pyqtSignal(int, str, str, str, object, object, list, bool)
+    error       = pyqtSignal(str)
 
 class SearchWorker(QRunnable):
-    def __init__(self, stream_type, currently_loaded_entries, list_widgets, text):
+    def __init__(self, generation, search_generations, list_content_type, stream_type, search_index, base_positions, text, previous_results=None):
         super().__init__()
-        self.stream_type = stream_type
-        self.currently_loaded_entries = currently_loaded_entries[0]
-        self.list_widgets = list_widgets[0]
-        self.text = text
+        self.generation         = generation
+        self.search_generations = search_generations
+        self.list_content_type  = list_content_type
+        self.stream_type        = stream_type
+        self.search_index       = search_index
+        self.base_positions     = base_positions
+        self.text               = text
+
+        #Results of a previous search that the new search text extends, only these have to be searched again
+        self.previous_results   = previous_results
 
         self.signals = SearchWorkerSignals()
 
-        # self.setAutoDelete(True)
+    def isCancelled(self):
+        #A newer search has been started for the same list
+        return self.search_generations.get((self.list_content_type, self.stream_type)) != self.generation
 
     @pyqtSlot()
     def run(self):
         try:
-            self.list_widgets[self.stream_type].clear()
-            print("starting searching through entries")
+            if self.isCancelled():
+                return
+
+            positions = self.previous_results if self.previous_results is not None else self.base_positions
+            results = self.search_index.search(self.text, positions)
+            ranked  = False
 
-            for entry in self.currently_loaded_entries[self.stream_type]:
-                if self.text.lower() in entry['name'].lower():
-                    item = QListWidgetItem(entry['name'])
-                    item.setData(Qt.UserRole, entry)
+            #Search for similar names if no name contains the search text
+            if not results and fold_text(self.text).strip():
+                if self.isCancelled():
+                    return
 
-                    self.list_widgets[self.stream_type].addItem(item)
+                results = self.search_index.fuzzySearch(self.text, self.base_positions)
+                ranked  = True
 
-                    print(entry['name'])
+            if self.isCancelled():
+                return
+
+            #Only send the positions of the results, the lists are updated in the GUI thread
+            self.signals.finished.emit(self.generation, self.list_content_type, self.stream_type, self.text, self.search_index, self.base_positions, results, ranked)
 
-            self.signals.list_widget.emit([self.list_widgets[self.stream_type]], self.stream_type)
         except Exception as e:
             print(f"failed search worker: {e}")
+            self.signals.error.emit(str(e))
 
 class EPGWorkerSignals(QObject):
-    finished = pyqtSignal(list)
-    error = pyqtSignal(str)
+    finished = pyqtSignal(object, list)
+    error = pyqtSignal(object, str)
 
 class EPGWorker(QRunnable):
-    def __init__(self, server, username, password, stream_id, parent=None):
+    def __init__(self, server, username, password, stream_id, parent=None, short_epg_limit=None, generation=None):
         super().__init__()
-        self.server     = server
-        self.username   = username
-        self.password   = password
-        self.stream_id  = stream_id
-        self.parent     = parent
-        self.signals    = EPGWorkerSignals()
+        self.server             = server
+        self.username           = username
+        self.password           = password
+        self.stream_id          = stream_id
+        self.parent             = parent
+        self.short_epg_limit    = short_epg_limit
+        self.generation         = generation
+        self.signals            = EPGWorkerSignals()
 
     @pyqtSlot()
     def run(self):
         try:
-            #Creating url for requesting EPG data for specific stream
-            epg_url = f"{self.server}/player_api.php?username={self.username}&password={self.password}&action=get_simple_data_table&stream_id={self.stream_id}"
-            # headers = {'User-Agent': CUSTOM_USER_AGENT}
-            #Create header
-            headers = {
-                "Connection": CONNECTION_HEADER,
-                "Accept-Encoding": CONTENT_HEADER,
-                "User-Agent": self.parent.current_user_agent
-            }
+            #Drop request when another channel was selected before it started
+            if DETAIL_REQUESTS.dropStale('Live', self.generation):
+                return
+
+            programmes = []
 
-            #Requesting EPG data
-            response = requests.get(epg_url, headers=headers, timeout=(CONNECTION_TIMEOUT, READ_TIMEOUT))
-            epg_data = response.json()
+            #Request only the next programmes, which is a much smaller response than the full EPG table
+            if self.short_epg_limit:
+                try:
+                    programmes = self.fetchEPGData(f"get_short_epg&stream_id={self.stream_id}&limit={self.short_epg_limit}")
+                except Exception as e:
+                    print(f"Failed fetching short EPG, requesting full EPG: {e}")
 
-            #Decrypt EPG data with base 64
-            decrypted_epg_data = self.decryptEPGData(epg_data)
+            #Some providers don't support the short EPG, then the full EPG table is requested
+            if not programmes:
+                programmes = self.fetchEPGData(f"get_simple_data_table&stream_id={self.stream_id}")
 
-            self.signals.finished.emit(decrypted_epg_data)
+            #Also send the stream id, so the EPG data can be cached for this channel
+            self.signals.finished.emit(self.stream_id, programmes)
         except Exception as e:
-            self.signals.error.emit(str(e))
+            self.signals.error.emit(self.stream_id, str(e))
+
+    def fetchEPGData(self, action):
+        #Creating url for requesting EPG data for specific stream
+        epg_url = f"{self.server}/player_api.php?username={self.username}&password={self.password}&action={action}"
+
+        #Requesting EPG data
+        response = HTTP_CLIENT.get(epg_url)
+        epg_data = response.json()
+
+        #Decrypt EPG data with base 64
+        return self.decryptEPGData(epg_data)
 
     def decryptEPGData(self, epg_data):
         try:
-            decrypted_epg_data = []
+            programmes = []
 
             for epg_entry in epg_data['epg_listings']:
-                #Get start, stop time and date
-                start_timestamp = datetime.fromtimestamp(int(epg_entry['start_timestamp']))
-                stop_timestamp  = datetime.fromtimestamp(int(epg_entry['stop_timestamp']))
-                date            = f"{start_timestamp.day:02}-{start_timestamp.month:02}-{start_timestamp.year}"
+                #Get start and stop time
+                start_timestamp = int(epg_entry['start_timestamp'])
+                stop_timestamp  = int(epg_entry['stop_timestamp'])
 
                 #Decode program name and descryption
                 program_name        = base64.b64decode(epg_entry['title']).decode("utf-8")
                 program_description = base64.b64decode(epg_entry['description']).decode("utf-8")
 
                 #Put only necessary EPG data in list
-                decrypted_epg_data.append({
-                    'start_time': start_timestamp,
-                    'stop_time': stop_timestamp,
-                    'program_name': program_name,
-                    'description': program_description,
-                    'date': date
-                    })
+                programmes.append((start_timestamp, stop_timestamp, program_name, program_description))
+
+            #Sorted by start time, so the programmes that have ended can be skipped with a binary search
+            programmes.sort()
 
             #return decrypted EPG data
-            return decrypted_epg_data
+            return programmes
         except Exception as e:
             print(f"failed decrypting: {e}")
+            return []
+
+class EPGGuideWorkerSignals(QObject):
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+class EPGGuideWorker(QRunnable):
+    def __init__(self, server, username, password, epg_store, parent=None):
+        super().__init__()
+        self.server     = server
+        self.username   = username
+        self.password   = password
+        self.epg_store  = epg_store
+        self.parent     = parent
+        self.signals    = EPGGuideWorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            start_time = time.time()
+
+            #Creating url for requesting the EPG data of all channels
+            guide_url = f"{self.server}/xmltv.php?username={self.username}&password={self.password}"
+
+            #The guide can be very large, so it is parsed and stored while it is downloaded
+            with HTTP_CLIENT.get(guide_url, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+
+                num_of_programmes = self.epg_store.replaceGuide(f"{self.server}|{self.username}", iter_xmltv_programmes(response.raw))
+
+            print(f"Stored {num_of_programmes} EPG programmes in {time.time() - start_time:.2f}s")
+
+            self.signals.finished.emit(num_of_programmes)
+        except Exception as e:
+            print(f"Failed loading EPG guide: {e}")
+            self.signals.error.emit(str(e))
+
+class NowNextWorkerSignals(QObject):
+    finished = pyqtSignal(str, object)
+    error = pyqtSignal(str)
+
+class NowNextWorker(QRunnable):
+    def __init__(self, epg_store, account_key, parent=None):
+        super().__init__()
+        self.epg_store      = epg_store
+        self.account_key    = account_key
+        self.parent         = parent
+        self.signals        = NowNextWorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            #Index the programmes of all channels from now until the end of the window
+            from_time   = int(time.time())
+            to_time     = from_time + NOW_NEXT_WINDOW_SECONDS
+
+            now_next_index = NowNextIndex(self.epg_store.getProgrammesBetween(from_time, to_time), to_time)
+
+            self.signals.finished.emit(self.account_key, now_next_index)
+        except Exception as e:
+            print(f"Failed building now and next index: {e}")
+            self.signals.error.emit(str(e))
 
 class OnlineWorkerSignals(QObject):
     finished = pyqtSignal(int, str)
     error = pyqtSignal(str)
 
 class OnlineWorker(QRunnable):
-    def __init__(self, stream_id, url, parent=None):
+    def __init__(self, stream_id, url, parent=None, generation=None):
         super().__init__()
         self.stream_id  = int(stream_id)
         self.url        = url
         self.parent     = parent
+        self.generation = generation
         self.signals    = OnlineWorkerSignals()
 
     @pyqtSlot()
     def run(self):
         try:
-            #Create header
-            headers = {
-                "Connection": CONNECTION_HEADER,
-                "Accept-Encoding": CONTENT_HEADER,
-                "User-Agent": self.parent.current_user_agent
-            }
+            #Drop request when another channel was selected before it started
+            if DETAIL_REQUESTS.dropStale('Live', self.generation):
+                return
 
             #Requesting stream playlist data
-            response = requests.get(self.url, headers=headers, timeout=(CONNECTION_TIMEOUT, LIVE_STATUS_TIMEOUT))
+            response = HTTP_CLIENT.get(self.url, timeout=(CONNECTION_TIMEOUT, LIVE_STATUS_TIMEOUT))
             response_code = response.status_code
             url_data = response.text
 
@@ -0,0 +1,107 @@
+from collections import deque
+
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtCore import QObject, QThreadPool
+
+from Threadpools import ImageFetcher
+from CustomPyQtWidgets import POSTER_THUMBNAIL_SIZE
+from ImageCache import FAILED_CACHE_SECONDS
+
+#Thumbnails downloaded at the same time, so scrolling doesn't flood the IPTV provider with requests
+MAX_THUMBNAIL_REQUESTS  = 4
+
+#Rows before and after the visible rows of which the thumbnails are loaded too, so they are ready when scrolling
+THUMBNAIL_PREFETCH_ROWS = 24
+
+#Key of the thumbnails in the image cache, next to the covers of the info boxes
+THUMBNAIL_SIZE_KEY      = (POSTER_THUMBNAIL_SIZE.width(), POSTER_THUMBNAIL_SIZE.height())
+
+#Memory budget of the thumbnails, apart from the covers so scrolling the grid doesn't evict them
+THUMBNAIL_MEMORY_SIZE_MB = 32
+
+class ThumbnailLoader(QObject):
+    def __init__(self, image_cache, parent=None):
+        super().__init__(parent)
+        self.image_cache    = image_cache
+        self.parent         = parent
+
+        self.image_cache.addMemoryBudget(THUMBNAIL_SIZE_KEY, THUMBNAIL_MEMORY_SIZE_MB * 1e6)
+
+        #Thumbnails have their own threads, so they don't delay loading the info of the selected item
+        self.threadpool     = QThreadPool()
+        self.threadpool.setMaxThreadCount(MAX_THUMBNAIL_REQUESTS)
+
+        #Urls of the thumbnails still to load for the rows around the visible rows, visible rows first
+        self.wanted         = deque()
+        self.loading        = set()
+
+        #View of which the thumbnails are loaded, repainted when a thumbnail is ready
+        self.view           = None
+
+    def getThumbnail(self, img_url):
+        #Returns the thumbnail of url, the not found image, or the loading image while it is loaded
+        if not img_url:
+            return None
+
+        thumbnail = self.image_cache.getImage(img_url, THUMBNAIL_SIZE_KEY, count_lookup=False)
+        if thumbnail is not None:
+            return thumbnail
+
+        placeholder = self.image_cache.getNegative(img_url, count_lookup=False) or self.parent.path_to_loading_img
+        return self.parent.get_placeholder_image(placeholder, POSTER_THUMBNAIL_SIZE.width())
+
+    def isLoaded(self, img_url):
+        return (self.image_cache.getImage(img_url, THUMBNAIL_SIZE_KEY, count_lookup=False) is not None
+            or self.image_cache.getNegative(img_url, count_lookup=False) is not None)
+
+    def loadRows(self, view, first_row, last_row, url_func):
+        #Only the thumbnails of the visible rows and the rows around them are loaded. Thumbnails of rows that
+        #were scrolled past are not loaded anymore, except the ones already being downloaded.
+        self.view = view
+        model = view.model()
+
+        rows = list(range(first_row, last_row + 1))
+        for offset in range(1, THUMBNAIL_PREFETCH_ROWS + 1):
+            if last_row + offset < model.rowCount():
+                rows.append(last_row + offset)
+            if first_row - offset >= 0:
+                rows.append(first_row - offset)
+
+        self.wanted.clear()
+        for row in rows:
+            img_url = url_func(model.rowData(row))
+            if img_url and img_url not in self.loading and not self.isLoaded(img_url):
+                self.wanted.append(img_url)
+
+        self.startRequests()
+
+    def startRequests(self):
+        while self.wanted and len(self.loading) < MAX_THUMBNAIL_REQUESTS:
+            img_url = self.wanted.popleft()
+            if img_url in self.loading or self.isLoaded(img_url):
+                continue
+
+            self.loading.add(img_url)
+
+            image_fetcher = ImageFetcher(img_url, 'Thumbnail', POSTER_THUMBNAIL_SIZE.width(), self.parent, self.image_cache,
+                height=POSTER_THUMBNAIL_SIZE.height(), data_size=THUMBNAIL_SIZE_KEY)
+            image_fetcher.signals.finished.connect(self.processThumbnail)
+            self.threadpool.start(image_fetcher)
+
+    def processThumbnail(self, image, stream_type, img_url, is_placeholder, generation):
+        self.loading.discard(img_url)
+
+        #Thumbnails are made once and kept in the image cache, the image fetcher keeps them on disk too.
+        #Placeholders are cached by the image fetcher.
+        if not is_placeholder:
+            thumbnail = QPixmap.fromImage(image)
+            self.image_cache.putImage(img_url, THUMBNAIL_SIZE_KEY, thumbnail, thumbnail.width() * thumbnail.height() * thumbnail.depth() // 8)
+
+        #Failed requests, e.g. timeouts, are not cached by the image fetcher. Don't request them again on every scroll.
+        elif self.image_cache.getNegative(img_url, count_lookup=False) is None:
+            self.image_cache.putNegative(img_url, self.parent.path_to_no_img, FAILED_CACHE_SECONDS)
+
+        if self.view:
+            self.view.viewport().update()
+
+        self.startRequests()
@@ -92,6 +92,17 @@ REM Run PyInstaller directly with all necessary options and added data files
   --add-data "Threadpools.py;." ^
   --add-data "CustomPyQtWidgets.py;." ^
   --add-data "AccountManager.py;." ^
+  --add-data "CatalogCache.py;." ^
+  --add-data "CatalogStore.py;." ^
+  --add-data "JsonStream.py;." ^
+  --add-data "CatalogIndex.py;." ^
+  --add-data "SearchIndex.py;." ^
+  --add-data "SortIndex.py;." ^
+  --add-data "EPGStore.py;." ^
+  --add-data "EPGCache.py;." ^
+  --add-data "ImageCache.py;." ^
+  --add-data "ThumbnailLoader.py;." ^
+  --add-data "InfoCache.py;." ^
   %MAIN_SCRIPT%
 
 IF "%exec_choice%"=="1" GOTO end
@@ -132,6 +143,17 @@ REM Create executable with debug console
   --add-data "Threadpools.py;." ^
   --add-data "CustomPyQtWidgets.py;." ^
   --add-data "AccountManager.py;." ^
+  --add-data "CatalogCache.py;." ^
+  --add-data "CatalogStore.py;." ^
+  --add-data "JsonStream.py;." ^
+  --add-data "CatalogIndex.py;." ^
+  --add-data "SearchIndex.py;." ^
+  --add-data "SortIndex.py;." ^
+  --add-data "EPGStore.py;." ^
+  --add-data "EPGCache.py;." ^
+  --add-data "ImageCache.py;." ^
+  --add-data "ThumbnailLoader.py;." ^
+  --add-data "InfoCache.py;." ^
   %MAIN_SCRIPT%
 
 :end
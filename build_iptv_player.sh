@@ -62,6 +62,17 @@ $PYINSTALLER \
   --add-data "Threadpools.py:." \
   --add-data "CustomPyQtWidgets.py:." \
   --add-data "AccountManager.py:." \
+  --add-data "CatalogCache.py:." \
+  --add-data "CatalogStore.py:." \
+  --add-data "JsonStream.py:." \
+  --add-data "CatalogIndex.py:." \
+  --add-data "SearchIndex.py:." \
+  --add-data "SortIndex.py:." \
+  --add-data "EPGStore.py:." \
+  --add-data "EPGCache.py:." \
+  --add-data "ImageCache.py:." \
+  --add-data "ThumbnailLoader.py:." \
+  --add-data "InfoCache.py:." \
   "$MAIN_SCRIPT"
 
 echo